@@ -10,6 +10,7 @@ LinkedIn关键词分析系统的各项功能，包括爬取数据、分析和可
 
 import os
 import sys
+import copy
 import logging
 import subprocess
 import pandas as pd
@@ -22,17 +23,22 @@ from pathlib import Path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # 导入配置和模块
-from config import LINKEDIN_CONFIG, GEMINI_CONFIG, TEXT_ANALYSIS_CONFIG, GRADIO_CONFIG
+from config import LINKEDIN_CONFIG, GRADIO_CONFIG
 from config import RAW_DATA_DIR, PROCESSED_DATA_DIR, OUTPUT_DIR, EXCEL_OUTPUT_DIR, VISUALIZATION_DIR
 
 # 导入项目模块
 from src.crawler.linkedin_crawler import LinkedInCrawler
 from src.processor.excel_handler import ExcelHandler
+from src.processor.storage import get_storage, get_extension, DATA_FILE_EXTENSIONS
+from src.processor.preview import DataPreview, DEFAULT_HIDDEN_COLUMNS
 from src.analyzer.llm_extractor import GeminiExtractor
 from src.analyzer.freq_analyzer import FrequencyAnalyzer
 from src.analyzer.hybrid_analyzer import HybridAnalyzer
-from src.visualizer.heatmap import HeatmapGenerator
-from src.visualizer.wordcloud import WordCloudGenerator
+from src.visualizer.visualizer import Visualizer
+from src.utils.job_queue import JobQueue, format_job_status, STATUS_SUCCEEDED, STATUS_LABELS
+from src.utils.metrics import metrics
+from src.utils.run_catalog import (RunCatalog, format_catalog_label, STAGE_RAW, STAGE_PROCESSED,
+                                   STAGE_KEYWORDS, STAGE_VISUALIZATION)
 
 # 设置日志
 logging.basicConfig(
@@ -63,6 +69,18 @@ if GRADIO_CONFIG.get("use_frpc", False):
         True
     )
 
+# 后台任务队列：爬取、分析和可视化在有界线程池中执行，不占用Gradio请求线程
+job_queue = JobQueue(
+    db_path=GRADIO_CONFIG.get("job_db_path"),
+    max_workers=GRADIO_CONFIG.get("job_workers", 2)
+)
+
+# 运行目录：记录各阶段输出文件的元数据，供文件下拉框查询
+run_catalog = RunCatalog(GRADIO_CONFIG.get("catalog_path"))
+
+# 数据预览：缓存已解析的文件，文件修改后自动重新解析
+data_preview = DataPreview(GRADIO_CONFIG.get("preview_cache_files", 8))
+
 # 辅助函数
 def get_timestamp():
     """
@@ -70,163 +88,276 @@ def get_timestamp():
     """
     return datetime.now().strftime("%Y%m%d_%H%M%S")
 
+def get_catalog_choices(directory, stage, filter_func=None):
+    """
+    从运行目录查询指定目录中某阶段的文件，生成下拉框选项
+    
+    Returns:
+        list: (标签, 文件路径)列表，按更新时间倒序
+    """
+    choices = []
+    for entry in run_catalog.list_files(stage=stage, directory=directory):
+        if filter_func and not filter_func(os.path.basename(entry["path"])):
+            continue
+        choices.append((format_catalog_label(entry), entry["path"]))
+    return choices
+
 def get_available_excel_files(directory):
     """
-    获取指定目录中的所有Excel文件
+    获取指定目录中的所有关键词Excel文件
+    """
+    return get_catalog_choices(directory, STAGE_KEYWORDS)
+
+def get_available_data_files(directory, stage=STAGE_RAW):
+    """
+    获取指定目录中某阶段的所有中间数据文件（Parquet/JSONL/Excel）
     """
-    files = []
-    if os.path.exists(directory):
-        for file in os.listdir(directory):
-            if file.endswith(".xlsx") or file.endswith(".xls"):
-                files.append(os.path.join(directory, file))
-    return files
+    return get_catalog_choices(directory, stage, lambda file: file.endswith(DATA_FILE_EXTENSIONS))
 
 def get_available_visualization_files(directory, prefix=None, suffix=None):
     """
     获取指定目录中的可视化文件
     """
-    files = []
-    if os.path.exists(directory):
-        for file in os.listdir(directory):
-            if prefix and not file.startswith(prefix):
-                continue
-            if suffix and not file.endswith(suffix):
-                continue
-            file_path = os.path.join(directory, file)
-            if os.path.isfile(file_path):
-                files.append(file_path)
-    return files
+    return get_catalog_choices(
+        directory, STAGE_VISUALIZATION,
+        lambda file: (not prefix or file.startswith(prefix)) and (not suffix or file.endswith(suffix))
+    )
 
 # 爬虫功能
-def crawl_linkedin(keywords, locations, pages_per_search, headless, use_proxy, output_prefix):
-    """
-    爬取LinkedIn职位数据
-    """
-    try:
-        # 更新配置
-        config = LINKEDIN_CONFIG.copy()
-        config['search']['keywords'] = keywords.split(",") if isinstance(keywords, str) else keywords
-        config['search']['locations'] = locations.split(",") if isinstance(locations, str) else locations
-        config['search']['pages_per_search'] = int(pages_per_search)
-        config['crawler']['headless'] = headless
-        config['crawler']['use_proxy'] = use_proxy
-        
-        # 生成输出文件名
-        timestamp = get_timestamp()
-        prefix = output_prefix or f"linkedin_{timestamp}"
-        raw_excel_path = os.path.join(RAW_DATA_DIR, f"{prefix}_raw.xlsx")
-        
-        # 确保目录存在
-        os.makedirs(RAW_DATA_DIR, exist_ok=True)
-        
-        # 执行爬取
+def crawl_linkedin(progress, keywords, locations, pages_per_search, headless, use_proxy, output_prefix):
+    """
+    爬取LinkedIn职位数据（在后台任务中执行，progress为进度回调；出错时抛出异常，由任务队列记录为失败）
+    """
+    # 更新配置（深拷贝：并发的爬取任务不能共享search和crawler子字典）
+    config = copy.deepcopy(LINKEDIN_CONFIG)
+    config['search']['keywords'] = keywords.split(",") if isinstance(keywords, str) else keywords
+    config['search']['locations'] = locations.split(",") if isinstance(locations, str) else locations
+    config['search']['pages_per_search'] = int(pages_per_search)
+    config['crawler']['headless'] = headless
+    config['crawler']['use_proxy'] = use_proxy
+    
+    # 生成输出文件名
+    timestamp = get_timestamp()
+    prefix = output_prefix or f"linkedin_{timestamp}"
+    raw_data_path = os.path.join(RAW_DATA_DIR, f"{prefix}_raw{get_extension()}")
+    
+    # 确保目录存在
+    os.makedirs(RAW_DATA_DIR, exist_ok=True)
+    
+    # 执行爬取：列表页占5%~35%，详情页占35%~95%（详情页总数在列表页完成后才确定）
+    def report_pages(kind, done, total):
+        if kind == "listing":
+            progress(0.05 + 0.3 * done / total, f"正在抓取列表页：已完成{done}/{total}页")
+        else:
+            progress(0.35 + 0.6 * done / total, f"正在抓取职位详情：已完成{done}/{total}页")
+    
+    progress(0.05, "正在爬取职位数据")
+    with metrics.span("crawl", unit="jobs") as span:
         crawler = LinkedInCrawler(config)
-        job_data = crawler.run()
-        
-        # 保存数据
-        excel_handler = ExcelHandler()
-        excel_handler.save_to_excel(job_data, raw_excel_path)
-        
-        return f"爬取完成！共获取{len(job_data)}条职位数据，已保存到{raw_excel_path}", raw_excel_path
+        job_data = crawler.run(progress=report_pages)
+        span.add(len(job_data))
     
-    except Exception as e:
-        error_msg = f"爬取过程中发生错误: {str(e)}"
-        logger.error(error_msg, exc_info=True)
-        return error_msg, None
+    # 保存数据
+    progress(0.95, f"正在保存{len(job_data)}条职位数据")
+    if not get_storage(raw_data_path).save(job_data, raw_data_path):
+        raise RuntimeError(f"保存文件失败: {raw_data_path}")
+    run_catalog.record(
+        raw_data_path, STAGE_RAW, row_count=len(job_data),
+        keywords=config['search']['keywords'], locations=config['search']['locations'],
+        params={"pages_per_search": int(pages_per_search), "headless": headless, "use_proxy": use_proxy},
+        run_id=prefix
+    )
+    
+    return f"爬取完成！共获取{len(job_data)}条职位数据，已保存到{raw_data_path}", raw_data_path
 
 # 分析功能
-def analyze_data(input_file, llm_weight, traditional_weight, top_n, output_prefix):
+def analyze_data(progress, input_file, llm_weight, traditional_weight, top_n, output_prefix):
     """
-    分析职位数据，提取关键词
+    分析职位数据，提取关键词（在后台任务中执行，progress为进度回调；出错时抛出异常，由任务队列记录为失败）
     """
-    try:
-        # 生成输出文件名
-        timestamp = get_timestamp()
-        prefix = output_prefix or f"linkedin_{timestamp}"
-        processed_excel_path = os.path.join(PROCESSED_DATA_DIR, f"{prefix}_processed.xlsx")
-        keywords_excel_path = os.path.join(EXCEL_OUTPUT_DIR, f"{prefix}_keywords.xlsx")
-        
-        # 确保目录存在
-        for directory in [PROCESSED_DATA_DIR, EXCEL_OUTPUT_DIR]:
-            os.makedirs(directory, exist_ok=True)
-        
-        # 加载数据
-        excel_handler = ExcelHandler()
-        job_data = excel_handler.load_from_excel(input_file)
-        
-        # 更新分析配置
-        hybrid_config = TEXT_ANALYSIS_CONFIG['hybrid'].copy()
-        hybrid_config['llm_weight'] = float(llm_weight)
-        hybrid_config['traditional_weight'] = float(traditional_weight)
-        hybrid_config['top_n'] = int(top_n)
-        
-        # LLM抽取
-        gemini_extractor = GeminiExtractor(GEMINI_CONFIG)
-        job_data_with_llm = gemini_extractor.process_jobs(job_data)
-        
-        # 保存处理后的数据
-        excel_handler.save_to_excel(job_data_with_llm, processed_excel_path)
-        
-        # 传统词频分析
-        freq_analyzer = FrequencyAnalyzer(TEXT_ANALYSIS_CONFIG['traditional'])
-        traditional_keywords = freq_analyzer.analyze(job_data_with_llm)
-        
-        # 混合分析
-        hybrid_analyzer = HybridAnalyzer(hybrid_config)
-        keyword_results = hybrid_analyzer.analyze(job_data_with_llm, traditional_keywords)
-        
-        # 保存关键词结果
-        excel_handler.save_keywords_to_excel(keyword_results, keywords_excel_path)
-        
-        return f"分析完成！处理了{len(job_data)}条职位数据，提取了{len(keyword_results)}个关键词。\n结果已保存到{keywords_excel_path}", keywords_excel_path
+    # 生成输出文件名
+    timestamp = get_timestamp()
+    prefix = output_prefix or f"linkedin_{timestamp}"
+    processed_data_path = os.path.join(PROCESSED_DATA_DIR, f"{prefix}_processed{get_extension()}")
+    keywords_excel_path = os.path.join(EXCEL_OUTPUT_DIR, f"{prefix}_keywords.xlsx")
+    
+    # 确保目录存在
+    for directory in [PROCESSED_DATA_DIR, EXCEL_OUTPUT_DIR]:
+        os.makedirs(directory, exist_ok=True)
+    
+    # 加载数据
+    progress(0.02, "正在加载数据")
+    excel_handler = ExcelHandler()
+    job_data = get_storage(input_file).load(input_file)
+    
+    # LLM抽取
+    progress(0.05, f"正在使用LLM分析{len(job_data)}个职位")
+    with metrics.span("llm_extraction", items=len(job_data), unit="jobs"):
+        gemini_extractor = GeminiExtractor()
+        job_data_with_llm = gemini_extractor.batch_analyze_jobs(job_data)
+    
+    # 保存处理后的数据
+    progress(0.7, "正在保存处理后的数据")
+    if not get_storage(processed_data_path).save(job_data_with_llm, processed_data_path):
+        raise RuntimeError(f"保存文件失败: {processed_data_path}")
+    run_catalog.record(processed_data_path, STAGE_PROCESSED, row_count=len(job_data_with_llm),
+                       run_id=prefix, source_path=input_file)
+    
+    # 传统词频分析
+    progress(0.75, "正在进行词频分析")
+    with metrics.span("frequency_analysis", items=len(job_data_with_llm), unit="jobs"):
+        freq_analyzer = FrequencyAnalyzer()
+        traditional_keywords = freq_analyzer.analyze_jobs(job_data_with_llm, int(top_n))
     
-    except Exception as e:
-        error_msg = f"分析过程中发生错误: {str(e)}"
-        logger.error(error_msg, exc_info=True)
-        return error_msg, None
+    # 混合分析（融合关键词并按分组字段统计）
+    progress(0.9, "正在融合关键词")
+    with metrics.span("hybrid_merge", items=len(job_data_with_llm), unit="jobs"):
+        hybrid_analyzer = HybridAnalyzer(freq_analyzer)
+        keyword_results = hybrid_analyzer.analyze_jobs(
+            job_data_with_llm, traditional_keywords,
+            llm_weight=float(llm_weight), traditional_weight=float(traditional_weight), top_n=int(top_n)
+        )
+    hybrid_keywords = keyword_results.get('hybrid_keywords', [])
+    
+    # 保存关键词结果
+    progress(0.95, "正在保存关键词结果")
+    with metrics.span("excel_save"):
+        if not excel_handler.save_keywords_to_excel(keyword_results, keywords_excel_path):
+            raise RuntimeError(f"保存文件失败: {keywords_excel_path}")
+    run_catalog.record(
+        keywords_excel_path, STAGE_KEYWORDS, row_count=len(hybrid_keywords),
+        params={"llm_weight": float(llm_weight), "traditional_weight": float(traditional_weight),
+                "top_n": int(top_n)},
+        run_id=prefix, source_path=processed_data_path
+    )
+    
+    return f"分析完成！处理了{len(job_data)}条职位数据，提取了{len(hybrid_keywords)}个关键词。\n结果已保存到{keywords_excel_path}", keywords_excel_path
 
 # 可视化功能
-def generate_visualizations(input_file, generate_wordcloud, generate_heatmap, output_prefix):
+def generate_visualizations(progress, input_file, generate_wordcloud, generate_heatmap, output_prefix):
     """
-    生成可视化图表
+    生成可视化图表（在后台任务中执行，progress为进度回调；出错时抛出异常，由任务队列记录为失败）
     """
-    try:
-        # 生成输出文件名
-        timestamp = get_timestamp()
-        prefix = output_prefix or f"linkedin_{timestamp}"
-        
-        # 确保目录存在
-        os.makedirs(VISUALIZATION_DIR, exist_ok=True)
-        
-        # 加载关键词数据
-        excel_handler = ExcelHandler()
+    # 生成输出文件名
+    timestamp = get_timestamp()
+    prefix = output_prefix or f"linkedin_{timestamp}"
+    
+    # 确保目录存在
+    os.makedirs(VISUALIZATION_DIR, exist_ok=True)
+    
+    # 加载关键词数据
+    progress(0.05, "正在加载关键词数据")
+    excel_handler = ExcelHandler()
+    with metrics.span("excel_load"):
         keyword_data = excel_handler.load_keywords_from_excel(input_file)
+    
+    results = []
+    output_files = []
+    # 图库只能展示图片，统一使用Matplotlib输出PNG
+    visualizer = Visualizer(VISUALIZATION_DIR)
+    
+    chart_types = []
+    if generate_heatmap:
+        chart_types.extend(["heatmap", "segment_heatmap"])
+    if generate_wordcloud:
+        chart_types.append("wordcloud")
+    
+    with metrics.span("render", unit="charts") as span:
+        # 生成热力图（职位摘要热力图和各分组热力图）和词云，各图表按render_workers并行渲染
+        progress(0.2, "正在生成图表")
+        charts = visualizer.generate_all_visualizations(
+            keyword_data.get('job_summaries', []), keyword_data, prefix,
+            chart_types=chart_types, use_plotly=False)
         
-        results = []
-        output_files = []
-        
-        # 生成热力图
         if generate_heatmap:
-            heatmap_generator = HeatmapGenerator()
-            heatmap_path = os.path.join(VISUALIZATION_DIR, f"{prefix}_heatmap")
-            heatmap_files = heatmap_generator.generate(keyword_data, heatmap_path)
-            results.append(f"热力图已生成: {', '.join(heatmap_files)}")
+            heatmap_files = [path for name, path in charts.items() if "heatmap" in name and path]
+            if heatmap_files:
+                results.append(f"热力图已生成: {', '.join(heatmap_files)}")
+            else:
+                results.append("关键词文件中没有职位摘要或分组统计，未生成热力图")
             output_files.extend(heatmap_files)
         
-        # 生成词云
         if generate_wordcloud:
-            wordcloud_generator = WordCloudGenerator()
-            wordcloud_path = os.path.join(VISUALIZATION_DIR, f"{prefix}_wordcloud")
-            wordcloud_files = wordcloud_generator.generate(keyword_data, wordcloud_path)
-            results.append(f"词云已生成: {', '.join(wordcloud_files)}")
-            output_files.extend(wordcloud_files)
+            wordcloud_files = [path for name, path in charts.items() if name.endswith("_wordcloud") and path]
+            if wordcloud_files:
+                results.append(f"词云已生成: {', '.join(wordcloud_files)}")
+                output_files.extend(wordcloud_files)
+            else:
+                results.append("生成词云失败")
         
-        return "\n".join(results), output_files
+        span.add(len(output_files))
+    
+    for output_file in output_files:
+        run_catalog.record(output_file, STAGE_VISUALIZATION, run_id=prefix, source_path=input_file)
+    
+    return "\n".join(results), output_files
+
+# 后台任务
+def stream_job(job_id, placeholders):
+    """
+    将后台任务状态流式推送到界面：运行中输出任务状态，结束后输出任务结果
     
-    except Exception as e:
-        error_msg = f"可视化过程中发生错误: {str(e)}"
-        logger.error(error_msg, exc_info=True)
-        return error_msg, []
+    Args:
+        job_id: 任务ID
+        placeholders: 任务运行期间其余输出组件的占位值
+    """
+    for job in job_queue.watch(job_id, GRADIO_CONFIG.get("job_poll_interval", 1.0)):
+        if job["status"] == STATUS_SUCCEEDED:
+            yield (job_id, *job["result"])
+        else:
+            yield (job_id, format_job_status(job), *placeholders)
+
+def submit_crawl(*args):
+    """
+    提交爬取任务
+    """
+    job_id = job_queue.submit("crawl", crawl_linkedin, *args)
+    yield from stream_job(job_id, [gr.update()])
+
+def submit_analysis(*args):
+    """
+    提交分析任务
+    """
+    job_id = job_queue.submit("analyze", analyze_data, *args)
+    yield from stream_job(job_id, [gr.update()])
+
+def submit_visualization(*args):
+    """
+    提交可视化任务
+    """
+    job_id = job_queue.submit("visualize", generate_visualizations, *args)
+    yield from stream_job(job_id, [gr.update()])
+
+def get_jobs_table():
+    """
+    获取最近任务列表
+    """
+    columns = ["任务ID", "类型", "状态", "进度", "说明", "提交时间"]
+    rows = []
+    for job in job_queue.list_jobs(GRADIO_CONFIG.get("job_list_limit", 50)):
+        rows.append([
+            job["job_id"],
+            job["kind"],
+            STATUS_LABELS.get(job["status"], job["status"]),
+            f"{job['progress'] * 100:.0f}%",
+            job["error"] or job["message"],
+            datetime.fromtimestamp(job["created_at"]).strftime("%Y-%m-%d %H:%M:%S")
+        ])
+    return pd.DataFrame(rows, columns=columns)
+
+def watch_job(job_id):
+    """
+    查看任务状态（页面刷新后可按任务ID继续跟踪）
+    """
+    job_id = (job_id or "").strip()
+    if not job_id or job_queue.get(job_id) is None:
+        yield f"找不到任务: {job_id}"
+        return
+    for job in job_queue.watch(job_id, GRADIO_CONFIG.get("job_poll_interval", 1.0)):
+        text = format_job_status(job)
+        if job["status"] == STATUS_SUCCEEDED and job["result"]:
+            text += f"\n{job['result'][0]}"
+        yield text
 
 # 创建Gradio界面
 def create_interface():
@@ -273,6 +404,7 @@ def create_interface():
                     )
                     crawl_button = gr.Button("开始爬取")
             
+            crawl_job_id = gr.Textbox(label="任务ID", interactive=False)
             crawl_output = gr.Textbox(label="爬取结果")
             crawl_file_output = gr.Textbox(label="输出文件路径", visible=False)
         
@@ -282,13 +414,13 @@ def create_interface():
                 with gr.Column():
                     input_file_dropdown = gr.Dropdown(
                         label="选择输入文件",
-                        choices=get_available_excel_files(RAW_DATA_DIR),
+                        choices=get_available_data_files(RAW_DATA_DIR),
                         interactive=True
                     )
                     refresh_input_button = gr.Button("刷新文件列表")
                     
                     def refresh_input_files():
-                        return gr.Dropdown(choices=get_available_excel_files(RAW_DATA_DIR))
+                        return gr.Dropdown(choices=get_available_data_files(RAW_DATA_DIR))
                     
                     refresh_input_button.click(
                         refresh_input_files,
@@ -323,6 +455,7 @@ def create_interface():
                     )
                     analyze_button = gr.Button("开始分析")
             
+            analysis_job_id = gr.Textbox(label="任务ID", interactive=False)
             analysis_output = gr.Textbox(label="分析结果")
             analysis_file_output = gr.Textbox(label="输出文件路径", visible=False)
         
@@ -360,6 +493,7 @@ def create_interface():
                     )
                     visualize_button = gr.Button("生成可视化")
             
+            viz_job_id = gr.Textbox(label="任务ID", interactive=False)
             viz_output = gr.Textbox(label="可视化结果")
             viz_gallery = gr.Gallery(label="可视化图表", show_label=True, columns=2, rows=2, height=600)
         
@@ -373,7 +507,7 @@ def create_interface():
                     gr.HTML("<h3>原始数据文件</h3>")
                     raw_files_dropdown = gr.Dropdown(
                         label="选择文件",
-                        choices=get_available_excel_files(RAW_DATA_DIR),
+                        choices=get_available_data_files(RAW_DATA_DIR),
                         interactive=True
                     )
                     view_raw_button = gr.Button("查看数据")
@@ -382,7 +516,7 @@ def create_interface():
                     gr.HTML("<h3>处理后的数据文件</h3>")
                     processed_files_dropdown = gr.Dropdown(
                         label="选择文件",
-                        choices=get_available_excel_files(PROCESSED_DATA_DIR),
+                        choices=get_available_data_files(PROCESSED_DATA_DIR, STAGE_PROCESSED),
                         interactive=True
                     )
                     view_processed_button = gr.Button("查看数据")
@@ -397,50 +531,120 @@ def create_interface():
                     view_keywords_button = gr.Button("查看数据")
             
             def refresh_result_files():
-                raw_files = get_available_excel_files(RAW_DATA_DIR)
-                processed_files = get_available_excel_files(PROCESSED_DATA_DIR)
+                raw_files = get_available_data_files(RAW_DATA_DIR)
+                processed_files = get_available_data_files(PROCESSED_DATA_DIR, STAGE_PROCESSED)
                 keywords_files = get_available_excel_files(EXCEL_OUTPUT_DIR)
-                return raw_files, processed_files, keywords_files
+                return (gr.Dropdown(choices=raw_files), gr.Dropdown(choices=processed_files),
+                        gr.Dropdown(choices=keywords_files))
             
             refresh_results_button.click(
                 refresh_result_files,
                 outputs=[raw_files_dropdown, processed_files_dropdown, keywords_files_dropdown]
             )
             
+            # 预览控件：服务端分页、列选择、长文本截断和关键字过滤
+            preview_file = gr.State(None)
+            with gr.Row():
+                preview_columns = gr.Dropdown(label="显示列", choices=[], multiselect=True, interactive=True)
+                preview_query = gr.Textbox(label="过滤关键字", placeholder="只显示包含该关键字的行")
+            with gr.Row():
+                preview_page_size = gr.Dropdown(label="每页行数", choices=[20, 50, 100, 200], value=50)
+                preview_text_length = gr.Number(label="文本最大显示长度（0为不截断）", value=200, precision=0)
+                preview_page = gr.Number(label="页码", value=1, precision=0)
+            with gr.Row():
+                prev_page_button = gr.Button("上一页")
+                next_page_button = gr.Button("下一页")
+                apply_preview_button = gr.Button("应用")
+            preview_info = gr.Markdown()
+            
             with gr.Row():
                 data_table = gr.Dataframe(label="数据预览", interactive=False)
             
-            def load_excel_preview(file_path):
+            def render_preview(file_path, columns, query, page_size, text_length, page):
                 if not file_path:
-                    return pd.DataFrame()
+                    return pd.DataFrame(), "", 1
                 try:
-                    df = pd.read_excel(file_path)
-                    return df
+                    df, info = data_preview.get_page(
+                        file_path, page=page or 1, page_size=page_size or 50, columns=columns,
+                        query=query, max_text_length=int(text_length or 0)
+                    )
+                    summary = (f"第{info['page']}/{info['total_pages']}页，"
+                               f"匹配{info['matched_rows']}行（共{info['total_rows']}行）")
+                    return df, summary, info['page']
                 except Exception as e:
-                    logger.error(f"加载Excel文件时出错: {str(e)}")
-                    return pd.DataFrame({"错误": [f"加载文件时出错: {str(e)}"]})
+                    logger.error(f"加载预览数据时出错: {str(e)}")
+                    return pd.DataFrame({"错误": [f"加载文件时出错: {str(e)}"]}), "", 1
             
-            view_raw_button.click(
-                load_excel_preview,
-                inputs=[raw_files_dropdown],
-                outputs=[data_table]
-            )
+            def open_preview(file_path, page_size, text_length):
+                if not file_path:
+                    return None, gr.Dropdown(choices=[], value=[]), "", pd.DataFrame(), "", 1
+                try:
+                    all_columns = data_preview.get_columns(file_path)
+                except Exception as e:
+                    logger.error(f"加载预览数据时出错: {str(e)}")
+                    return (None, gr.Dropdown(choices=[], value=[]), "",
+                            pd.DataFrame({"错误": [f"加载文件时出错: {str(e)}"]}), "", 1)
+                visible_columns = [column for column in all_columns if column not in DEFAULT_HIDDEN_COLUMNS]
+                df, summary, page = render_preview(file_path, visible_columns, "", page_size, text_length, 1)
+                return file_path, gr.Dropdown(choices=all_columns, value=visible_columns), "", df, summary, page
             
-            view_processed_button.click(
-                load_excel_preview,
-                inputs=[processed_files_dropdown],
-                outputs=[data_table]
-            )
+            preview_controls = [preview_file, preview_columns, preview_query, preview_page_size,
+                                preview_text_length]
+            preview_outputs = [data_table, preview_info, preview_page]
+            
+            for view_button, files_dropdown in [(view_raw_button, raw_files_dropdown),
+                                                (view_processed_button, processed_files_dropdown),
+                                                (view_keywords_button, keywords_files_dropdown)]:
+                view_button.click(
+                    open_preview,
+                    inputs=[files_dropdown, preview_page_size, preview_text_length],
+                    outputs=[preview_file, preview_columns, preview_query] + preview_outputs
+                )
             
-            view_keywords_button.click(
-                load_excel_preview,
-                inputs=[keywords_files_dropdown],
-                outputs=[data_table]
+            apply_preview_button.click(
+                render_preview,
+                inputs=preview_controls + [preview_page],
+                outputs=preview_outputs
+            )
+            preview_query.submit(
+                lambda *args: render_preview(*args, 1),
+                inputs=preview_controls,
+                outputs=preview_outputs
             )
+            prev_page_button.click(
+                lambda *args: render_preview(*args[:-1], (args[-1] or 1) - 1),
+                inputs=preview_controls + [preview_page],
+                outputs=preview_outputs
+            )
+            next_page_button.click(
+                lambda *args: render_preview(*args[:-1], (args[-1] or 1) + 1),
+                inputs=preview_controls + [preview_page],
+                outputs=preview_outputs
+            )
+        
+        # 任务标签页：页面刷新后可在此查看已提交任务的状态和结果
+        with gr.Tab("5. 任务列表"):
+            with gr.Row():
+                refresh_jobs_button = gr.Button("刷新任务列表")
+            jobs_table = gr.Dataframe(label="最近任务", interactive=False)
+            with gr.Row():
+                watch_job_id_input = gr.Textbox(label="任务ID", placeholder="输入任务ID查看状态和结果")
+                watch_job_button = gr.Button("查看任务")
+            watch_job_output = gr.Textbox(label="任务状态")
+            
+            # 进程内累计的运行指标（Prometheus文本格式）
+            with gr.Row():
+                show_metrics_button = gr.Button("查看运行指标")
+            metrics_output = gr.Code(label="运行指标（Prometheus文本格式）")
+            show_metrics_button.click(metrics.to_prometheus, outputs=[metrics_output])
+            
+            refresh_jobs_button.click(get_jobs_table, outputs=[jobs_table])
+            watch_job_button.click(watch_job, inputs=[watch_job_id_input], outputs=[watch_job_output])
+            demo.load(get_jobs_table, outputs=[jobs_table])
         
         # 连接爬虫功能
         crawl_button.click(
-            crawl_linkedin,
+            submit_crawl,
             inputs=[
                 keywords_input,
                 locations_input,
@@ -449,12 +653,12 @@ def create_interface():
                 proxy_checkbox,
                 output_prefix_input
             ],
-            outputs=[crawl_output, crawl_file_output]
+            outputs=[crawl_job_id, crawl_output, crawl_file_output]
         )
         
         # 连接分析功能
         analyze_button.click(
-            analyze_data,
+            submit_analysis,
             inputs=[
                 input_file_dropdown,
                 llm_weight_input,
@@ -462,19 +666,19 @@ def create_interface():
                 top_n_input,
                 analysis_prefix_input
             ],
-            outputs=[analysis_output, analysis_file_output]
+            outputs=[analysis_job_id, analysis_output, analysis_file_output]
         )
         
         # 连接可视化功能
         visualize_button.click(
-            generate_visualizations,
+            submit_visualization,
             inputs=[
                 viz_file_dropdown,
                 wordcloud_checkbox,
                 heatmap_checkbox,
                 viz_prefix_input
             ],
-            outputs=[viz_output, viz_gallery]
+            outputs=[viz_job_id, viz_output, viz_gallery]
         )
     
     return demo
@@ -488,8 +692,16 @@ def main():
     for directory in [RAW_DATA_DIR, PROCESSED_DATA_DIR, OUTPUT_DIR, EXCEL_OUTPUT_DIR, VISUALIZATION_DIR]:
         os.makedirs(directory, exist_ok=True)
     
+    # 登记运行目录启用前已有的输出文件（之后由各阶段写文件时登记）
+    run_catalog.register_existing(RAW_DATA_DIR, STAGE_RAW, DATA_FILE_EXTENSIONS)
+    run_catalog.register_existing(PROCESSED_DATA_DIR, STAGE_PROCESSED, DATA_FILE_EXTENSIONS)
+    run_catalog.register_existing(EXCEL_OUTPUT_DIR, STAGE_KEYWORDS, (".xlsx", ".xls"))
+    run_catalog.register_existing(VISUALIZATION_DIR, STAGE_VISUALIZATION, (".png", ".html"))
+    
     # 创建并启动Gradio界面
     demo = create_interface()
+    # 事件处理函数只负责提交任务和轮询状态，允许多个用户同时跟踪各自的任务
+    demo.queue(default_concurrency_limit=GRADIO_CONFIG.get("concurrency_limit", 16))
     demo.launch(
         server_name="0.0.0.0",
         server_port=GRADIO_CONFIG.get("port", 7860),
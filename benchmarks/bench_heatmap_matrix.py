@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+热力图矩阵构建基准测试
+
+比较两种职位×关键词矩阵构建方式的耗时，并校验结果一致：
+1. 原实现：逐个单元格做子串查找，每个职位重复转换技能列表
+2. Visualizer.build_job_keyword_matrix：每个职位描述一次多模式扫描，技能使用集合判断
+
+用法:
+    python benchmarks/bench_heatmap_matrix.py --jobs 2000 --keywords 200
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+
+# 将项目根目录添加到系统路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from benchmarks.synthetic import generate_jobs, TECH_TERMS, FILLER_WORDS
+from src.visualizer.visualizer import Visualizer
+from src.analyzer.keyword_matcher import AHOCORASICK_AVAILABLE
+
+def legacy_matrix(jobs, keywords):
+    """
+    原实现：嵌套循环填充矩阵
+    """
+    matrix = np.zeros((len(jobs), len(keywords)))
+    for i, job in enumerate(jobs):
+        job_skills = [skill.lower() for skill in job.get("skills", [])]
+        job_desc = job.get("job_description", "").lower()
+
+        for j, keyword in enumerate(keywords):
+            keyword_lower = keyword.lower()
+            if keyword_lower in job_skills:
+                matrix[i, j] = 1
+            elif keyword_lower in job_desc:
+                matrix[i, j] = 0.5
+    return matrix
+
+def build_keywords(n_keywords):
+    """
+    生成关键词列表：技术词汇、普通词汇及其双词组合
+    """
+    keywords = list(TECH_TERMS) + [word for word in FILLER_WORDS if len(word) > 3]
+    for first in TECH_TERMS:
+        for second in FILLER_WORDS:
+            if len(keywords) >= n_keywords:
+                return keywords[:n_keywords]
+            keywords.append(f"{second} {first}")
+    return keywords[:n_keywords]
+
+def main():
+    parser = argparse.ArgumentParser(description="热力图矩阵构建基准测试")
+    parser.add_argument("--jobs", type=int, default=2000, help="职位数量")
+    parser.add_argument("--keywords", type=int, default=200, help="关键词数量")
+    args = parser.parse_args()
+
+    jobs = generate_jobs(args.jobs)
+    keywords = build_keywords(args.keywords)
+    visualizer = Visualizer()
+    print(f"职位: {len(jobs)}, 关键词: {len(keywords)}, pyahocorasick: {AHOCORASICK_AVAILABLE}")
+
+    start = time.perf_counter()
+    expected = legacy_matrix(jobs, keywords)
+    legacy_time = time.perf_counter() - start
+    print(f"{'原实现(嵌套循环)':<24} {legacy_time:8.3f}s")
+
+    start = time.perf_counter()
+    matrix = visualizer.build_job_keyword_matrix(jobs, keywords)
+    new_time = time.perf_counter() - start
+    print(f"{'多模式扫描':<24} {new_time:8.3f}s")
+
+    status = "一致" if np.array_equal(matrix, expected) else "不一致"
+    print(f"结果{status}，加速比 {legacy_time / new_time:.1f}x")
+
+if __name__ == "__main__":
+    main()
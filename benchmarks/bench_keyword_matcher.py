@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+技术关键词白名单过滤基准测试
+
+比较两种白名单过滤方式的耗时，并校验过滤结果一致：
+1. 原实现：对每个词语逐个检查 any(tech_keyword in word for tech_keyword in tech_keywords)
+2. KeywordMatcher（Aho-Corasick自动机）
+
+用法:
+    python benchmarks/bench_keyword_matcher.py --vocab 100000 --whitelist 5000
+"""
+
+import os
+import sys
+import time
+import random
+import string
+import argparse
+
+# 将项目根目录添加到系统路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from benchmarks.synthetic import TECH_TERMS, FILLER_WORDS
+from src.analyzer.keyword_matcher import KeywordMatcher, AHOCORASICK_AVAILABLE
+
+def random_word(rng: random.Random) -> str:
+    """
+    生成随机词语
+    """
+    return "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10)))
+
+def build_vocabulary(n_terms: int, seed: int = 42) -> list:
+    """
+    生成与n-gram词表规模相当的词语列表（单词和双词组合）
+    """
+    rng = random.Random(seed)
+    words = FILLER_WORDS + [term.replace(" ", "") for term in TECH_TERMS] + [random_word(rng) for _ in range(5000)]
+    vocabulary = set()
+    while len(vocabulary) < n_terms:
+        if rng.random() < 0.5:
+            vocabulary.add(rng.choice(words))
+        else:
+            vocabulary.add(f"{rng.choice(words)} {rng.choice(words)}")
+    return sorted(vocabulary)
+
+def build_whitelist(n_terms: int, seed: int = 7) -> set:
+    """
+    生成技术关键词母表
+    """
+    rng = random.Random(seed)
+    whitelist = {term.lower() for term in TECH_TERMS}
+    while len(whitelist) < n_terms:
+        whitelist.add(random_word(rng))
+    return whitelist
+
+def main():
+    parser = argparse.ArgumentParser(description="技术关键词白名单过滤基准测试")
+    parser.add_argument("--vocab", type=int, default=100000, help="词表大小")
+    parser.add_argument("--whitelist", type=int, default=5000, help="技术关键词母表大小")
+    parser.add_argument("--skip-naive", action="store_true", help="跳过原实现（规模较大时需要数分钟）")
+    args = parser.parse_args()
+
+    vocabulary = build_vocabulary(args.vocab)
+    tech_keywords = build_whitelist(args.whitelist)
+    print(f"词表: {len(vocabulary)}, 技术关键词: {len(tech_keywords)}, pyahocorasick: {AHOCORASICK_AVAILABLE}")
+
+    start = time.perf_counter()
+    matchers = {"Aho-Corasick(Python)": KeywordMatcher(tech_keywords, use_native=False)}
+    if AHOCORASICK_AVAILABLE:
+        matchers["Aho-Corasick(pyahocorasick)"] = KeywordMatcher(tech_keywords)
+    print(f"{'构建自动机':<30} {time.perf_counter() - start:8.3f}s")
+
+    results = {}
+    for name, matcher in matchers.items():
+        start = time.perf_counter()
+        results[name] = [word for word in vocabulary if word in tech_keywords or matcher.contains_any(word)]
+        print(f"{name:<30} {time.perf_counter() - start:8.3f}s  保留{len(results[name])}个词语")
+
+    if not args.skip_naive:
+        start = time.perf_counter()
+        naive = [word for word in vocabulary
+                 if word in tech_keywords or any(tech_keyword in word for tech_keyword in tech_keywords)]
+        naive_time = time.perf_counter() - start
+        print(f"{'原实现(any子串查找)':<30} {naive_time:8.3f}s  保留{len(naive)}个词语")
+
+        for name, filtered in results.items():
+            status = "一致" if filtered == naive else "不一致"
+            print(f"{name}: 与原实现结果{status}")
+
+if __name__ == "__main__":
+    main()
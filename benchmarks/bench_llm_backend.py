@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+LLM提取吞吐量基准测试
+
+用本地假后端代替Gemini API，在不同并发数和批量提示设置下运行
+GeminiExtractor.batch_analyze_jobs，统计吞吐量、请求数、限流和失败情况，
+用于离线调优并发、批量和重试参数。可选通过本地HTTP假服务调用，
+以包含序列化和网络栈的开销。
+
+重试次数和等待时间使用配置中的GEMINI_CONFIG["retry_config"]。
+
+用法:
+    python benchmarks/bench_llm_backend.py --jobs 200 --latency 0.2 --workers 1 4 8 16
+    python benchmarks/bench_llm_backend.py --http --rate-limit-rate 0.05 --max-concurrency 8 --batch-modes 0 1
+"""
+
+import os
+import sys
+import time
+import logging
+import argparse
+
+# 将项目根目录添加到系统路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from benchmarks.synthetic import generate_jobs, TECH_TERMS
+from src.analyzer.llm_backends import StubBackend, HTTPBackend, StubServer
+from src.analyzer.llm_extractor import GeminiExtractor
+from src.utils.rate_limiter import TokenBucketRateLimiter
+from src.utils.metrics import metrics
+
+def run(extractor, jobs, max_workers, batch_mode):
+    """
+    运行一次批量分析并返回统计结果
+    """
+    batch = [{key: value for key, value in job.items() if key not in ("summary", "skills")} for job in jobs]
+    metrics.reset()
+    start = time.perf_counter()
+    extractor.batch_analyze_jobs(batch, max_workers=max_workers, batch_mode=batch_mode)
+    elapsed = time.perf_counter() - start
+    return {
+        "elapsed": elapsed,
+        "jobs_per_second": len(batch) / elapsed if elapsed > 0 else 0.0,
+        "ok": metrics.get_counter("llm_requests_total", status="ok"),
+        "rate_limited": metrics.get_counter("llm_requests_total", status="rate_limited"),
+        "errors": metrics.get_counter("llm_requests_total", status="error"),
+        "failed_jobs": sum(1 for job in batch if not job.get("summary")),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM提取吞吐量基准测试")
+    parser.add_argument("--jobs", type=int, default=200, help="职位数量")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8, 16], help="要测试的并发数")
+    parser.add_argument("--batch-modes", type=int, nargs="+", choices=[0, 1], default=[0, 1],
+                        help="要测试的批量提示设置（0关闭，1开启）")
+    parser.add_argument("--latency", type=float, default=0.2, help="假后端每次调用的基础延迟（秒）")
+    parser.add_argument("--jitter", type=float, default=0.0, help="随机延迟上限（秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="服务端错误概率")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="限流（429）概率")
+    parser.add_argument("--max-concurrency", type=int, help="假后端同时处理的最大请求数，超出时返回429")
+    parser.add_argument("--rpm", type=float, help="客户端限流的每分钟请求数，默认不限流")
+    parser.add_argument("--http", action="store_true", help="通过本地HTTP假服务调用")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    parser.add_argument("--verbose", action="store_true", help="输出提取器的日志（包括每次限流和重试）")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        # 模拟的限流和错误会产生大量重试日志，默认只输出结果表
+        logging.disable(logging.ERROR)
+
+    jobs = generate_jobs(args.jobs, seed=args.seed)
+    server = None
+    try:
+        print(f"{'并发数':>6} {'批量':>4} {'耗时(s)':>9} {'职位/秒':>9} {'成功请求':>8} {'429':>6} {'错误':>6} {'失败职位':>8}")
+        for batch_mode in args.batch_modes:
+            for max_workers in args.workers:
+                # 每组设置使用新的假后端，保证限流和错误的模拟结果可复现
+                stub = StubBackend(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                                   rate_limit_rate=args.rate_limit_rate, max_concurrency=args.max_concurrency,
+                                   seed=args.seed, vocabulary=TECH_TERMS)
+                if args.http:
+                    if server is not None:
+                        server.stop()
+                    server = StubServer(backend=stub).start()
+                    backend = HTTPBackend(server.url)
+                else:
+                    backend = stub
+
+                extractor = GeminiExtractor(api_key="fake", backend=backend, use_cache=False)
+                extractor.rate_limiter = TokenBucketRateLimiter(requests_per_minute=args.rpm)
+
+                result = run(extractor, jobs, max_workers, bool(batch_mode))
+                print(f"{max_workers:>6} {'是' if batch_mode else '否':>4} {result['elapsed']:9.2f} "
+                      f"{result['jobs_per_second']:9.1f} {result['ok']:8g} {result['rate_limited']:6g} "
+                      f"{result['errors']:6g} {result['failed_jobs']:8}")
+    finally:
+        if server is not None:
+            server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+页面解析基准测试
+
+比较两种列表页提取方式的耗时：
+1. 逐字段WebDriver调用（每个职位约5次RPC，用模拟延迟代替真实浏览器）
+2. 获取一次页面源码后使用lxml离线解析
+
+用法:
+    python benchmarks/bench_page_parser.py --items 25 --pages 20 --rpc-latency-ms 3
+"""
+
+import os
+import sys
+import time
+import argparse
+
+from lxml import html as lxml_html
+
+# 将项目根目录添加到系统路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.crawler.page_parser import (
+    parse_job_listings, extract_job_id, LISTING_LINK_XPATH, LISTING_TITLE_XPATH,
+    LISTING_COMPANY_XPATH, LISTING_LOCATION_XPATH, LISTING_ITEMS_XPATH
+)
+
+# WebDriver路径使用的CSS选择器到XPath的映射
+SELECTOR_XPATHS = {
+    "a.job-card-container__link": LISTING_LINK_XPATH,
+    "h3.job-card-container__title": LISTING_TITLE_XPATH,
+    "h4.job-card-container__company-name": LISTING_COMPANY_XPATH,
+    ".job-card-container__metadata-item": LISTING_LOCATION_XPATH,
+}
+
+def build_listing_page(n_items: int) -> str:
+    """
+    生成与LinkedIn列表页结构一致的合成HTML
+    """
+    items = []
+    for i in range(n_items):
+        items.append(f"""
+        <li>
+          <div class="job-card-container">
+            <a class="job-card-container__link" href="https://www.linkedin.com/jobs/view/{3900000000 + i}/">link</a>
+            <h3 class="job-card-container__title">  Senior Engineer {i}  </h3>
+            <h4 class="job-card-container__company-name">Company {i % 37}</h4>
+            <div class="job-card-container__metadata-item">City {i % 11}, Country</div>
+          </div>
+        </li>""")
+    return f"""<html><body><ul class="jobs-search__results-list">{''.join(items)}</ul></body></html>"""
+
+class SimulatedRemoteElement:
+    """
+    模拟WebDriver远程元素：每次find_element、.text、get_attribute都计为一次RPC
+    """
+
+    def __init__(self, element, latency: float, counter: list):
+        self._element = element
+        self._latency = latency
+        self._counter = counter
+
+    def _rpc(self):
+        self._counter[0] += 1
+        time.sleep(self._latency)
+
+    def find_element(self, by, selector):
+        self._rpc()
+        return SimulatedRemoteElement(self._element.xpath(SELECTOR_XPATHS[selector])[0], self._latency, self._counter)
+
+    def get_attribute(self, name):
+        self._rpc()
+        return self._element.get(name)
+
+    @property
+    def text(self):
+        self._rpc()
+        return self._element.text_content()
+
+def extract_via_rpc(page_source: str, latency: float, counter: list) -> list:
+    """
+    按LinkedInCrawler._extract_listings_via_webdriver的调用模式逐字段提取
+    """
+    tree = lxml_html.fromstring(page_source)
+    counter[0] += 1  # find_elements获取列表项
+    time.sleep(latency)
+
+    results = []
+    for item in tree.xpath(LISTING_ITEMS_XPATH):
+        if not item.xpath(LISTING_LINK_XPATH):
+            continue
+        job_item = SimulatedRemoteElement(item, latency, counter)
+        job_link = job_item.find_element(None, "a.job-card-container__link").get_attribute("href")
+        results.append({
+            "job_id": extract_job_id(job_link),
+            "job_title": job_item.find_element(None, "h3.job-card-container__title").text.strip(),
+            "company": job_item.find_element(None, "h4.job-card-container__company-name").text.strip(),
+            "location": job_item.find_element(None, ".job-card-container__metadata-item").text.strip(),
+            "job_link": job_link,
+        })
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="页面解析基准测试")
+    parser.add_argument("--items", type=int, default=25, help="每页职位数")
+    parser.add_argument("--pages", type=int, default=20, help="页数")
+    parser.add_argument("--rpc-latency-ms", type=float, default=3.0, help="模拟的单次WebDriver调用延迟（毫秒）")
+    args = parser.parse_args()
+
+    page_source = build_listing_page(args.items)
+    latency = args.rpc_latency_ms / 1000.0
+
+    counter = [0]
+    start = time.perf_counter()
+    for _ in range(args.pages):
+        rpc_jobs = extract_via_rpc(page_source, latency, counter)
+    rpc_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(args.pages):
+        # 快照方式只需一次page_source调用
+        time.sleep(latency)
+        snapshot_jobs = parse_job_listings(page_source, "keyword", "location")
+    snapshot_seconds = time.perf_counter() - start
+
+    assert [j["job_id"] for j in rpc_jobs] == [j["job_id"] for j in snapshot_jobs]
+
+    print(f"页数: {args.pages}，每页职位: {args.items}，模拟RPC延迟: {args.rpc_latency_ms}ms")
+    print(f"逐字段RPC: {rpc_seconds:.3f}秒，RPC次数: {counter[0]}（{counter[0] / args.pages:.0f}/页）")
+    print(f"快照解析:  {snapshot_seconds:.3f}秒，RPC次数: {args.pages}（1/页）")
+    print(f"加速比: {rpc_seconds / snapshot_seconds:.1f}x")
+
+if __name__ == "__main__":
+    main()
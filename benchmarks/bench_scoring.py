@@ -0,0 +1,69 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+关键词评分基准测试
+
+在大规模语料（默认10万个文档）上比较各评分方式的耗时和峰值内存，
+并给出计数矩阵稀疏存储与稠密化所需内存的对比，验证评分过程不会稠密化矩阵。
+
+用法:
+    python benchmarks/bench_scoring.py --docs 100000
+"""
+
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer, ENGLISH_STOP_WORDS
+
+# 将项目根目录添加到系统路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from benchmarks.synthetic import generate_job_descriptions
+from src.analyzer.tokenizer import DocumentTokenizer, passthrough_analyzer
+from src.analyzer.scoring import SCORING_METHODS, compute_scores
+
+def format_mb(num_bytes: float) -> str:
+    """
+    格式化字节数
+    """
+    return f"{num_bytes / 1024 / 1024:10.1f} MB"
+
+def main():
+    parser = argparse.ArgumentParser(description="关键词评分基准测试")
+    parser.add_argument("--docs", type=int, default=100000, help="文档数量")
+    parser.add_argument("--ngram-max", type=int, default=2, help="n-gram最大长度")
+    args = parser.parse_args()
+
+    texts = generate_job_descriptions(args.docs)
+    tokenizer = DocumentTokenizer(ENGLISH_STOP_WORDS, ngram_range=(1, args.ngram_max))
+    count_matrix = CountVectorizer(analyzer=passthrough_analyzer).fit_transform(tokenizer.analyze_corpus(texts))
+
+    n_docs, n_terms = count_matrix.shape
+    sparse_bytes = count_matrix.data.nbytes + count_matrix.indices.nbytes + count_matrix.indptr.nbytes
+    print(f"文档数: {n_docs}, 词语数: {n_terms}, 非零元素: {count_matrix.nnz}")
+    print(f"{'稀疏计数矩阵':<20} {format_mb(sparse_bytes)}")
+    print(f"{'稠密化(float64)':<20} {format_mb(n_docs * n_terms * 8)}")
+    print()
+
+    # 背景语料：用前一半文档的词频模拟历史语料
+    background_counts = np.asarray(count_matrix[: n_docs // 2].sum(axis=0)).ravel()
+
+    print(f"{'评分方式':<12} {'耗时':>10} {'峰值内存':>13}")
+    for method in SCORING_METHODS:
+        tracemalloc.start()
+        start = time.perf_counter()
+        compute_scores(count_matrix, method, background_counts=background_counts)
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{method:<12} {elapsed:9.3f}s {format_mb(peak)}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Plotly静态图片导出基准测试
+
+比较三种PNG导出方式的单图耗时：
+1. 逐次导出：每个图表单独启动一次Kaleido（原实现的fig.write_image）
+2. 常驻服务：StaticExporter复用同一个Kaleido导出服务逐个导出
+3. 批量导出：StaticExporter.write_images一次提交全部图表
+
+需要安装kaleido及其依赖的Chrome（可用 plotly_get_chrome 安装）。
+
+用法:
+    python benchmarks/bench_static_export.py --figures 20
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import plotly.graph_objects as go
+
+# 将项目根目录添加到系统路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from benchmarks.synthetic import TECH_TERMS
+from src.visualizer.static_export import StaticExporter, KALEIDO_SERVER_AVAILABLE
+
+def build_figures(n_figures):
+    """
+    生成与关键词条形图结构一致的Plotly图表
+    """
+    figures = []
+    for i in range(n_figures):
+        words = TECH_TERMS[:20]
+        freqs = [(i * 7 + j * 13) % 97 + 1 for j in range(len(words))]
+        fig = go.Figure(go.Bar(y=words, x=freqs, orientation='h',
+                               marker=dict(color=freqs, colorscale="viridis")))
+        fig.update_layout(title=f"关键词频率 {i}", width=1000, height=600)
+        figures.append(fig)
+    return figures
+
+def run(label, export, figures, paths):
+    """
+    执行一种导出方式并打印耗时
+    """
+    start = time.perf_counter()
+    export(figures, paths)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<16} 总计 {elapsed:8.3f}s  单图 {elapsed / len(figures) * 1000:8.1f}ms")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="Plotly静态图片导出基准测试")
+    parser.add_argument("--figures", type=int, default=20, help="图表数量")
+    args = parser.parse_args()
+
+    figures = build_figures(args.figures)
+    print(f"图表: {len(figures)}, Kaleido常驻服务: {KALEIDO_SERVER_AVAILABLE}")
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        def paths_for(mode):
+            return [os.path.join(output_dir, f"{mode}_{i}.png") for i in range(len(figures))]
+
+        try:
+            # 预热：导入导出相关模块，避免首次调用的导入开销计入第一种方式
+            oneshot = StaticExporter(persistent=False)
+            oneshot.write_image(figures[0], os.path.join(output_dir, "warmup.png"))
+        except Exception as e:
+            print(f"无法导出PNG（需要Kaleido和Chrome）: {str(e)}")
+            return
+
+        oneshot_time = run("逐次导出", lambda figs, paths: [
+            oneshot.write_image(fig, path) for fig, path in zip(figs, paths)
+        ], figures, paths_for("oneshot"))
+
+        exporter = StaticExporter(persistent=True)
+        try:
+            persistent_time = run("常驻服务", lambda figs, paths: [
+                exporter.write_image(fig, path) for fig, path in zip(figs, paths)
+            ], figures, paths_for("persistent"))
+            batch_time = run("批量导出", exporter.write_images, figures, paths_for("batch"))
+        finally:
+            exporter.stop()
+
+        print(f"常驻服务加速比 {oneshot_time / persistent_time:.1f}x，"
+              f"批量导出加速比 {oneshot_time / batch_time:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+分词基准测试
+
+比较三种词频统计方式的吞吐量（文档/秒），并校验结果一致：
+1. 原实现：多次正则替换 + nltk.word_tokenize + 列表过滤，拼接后由CountVectorizer再次分词
+2. 单次扫描分词器，通过自定义analyzer直接输入CountVectorizer
+3. 单次扫描分词器 + 进程池并行分词
+
+用法:
+    python benchmarks/bench_tokenization.py --docs 50000 --jobs 4
+"""
+
+import os
+import re
+import sys
+import time
+import argparse
+
+from sklearn.feature_extraction.text import CountVectorizer
+
+# 将项目根目录添加到系统路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from benchmarks.synthetic import generate_job_descriptions
+from src.analyzer.tokenizer import DocumentTokenizer, passthrough_analyzer
+
+def load_stop_words() -> set:
+    """
+    加载与FrequencyAnalyzer一致的停用词
+    """
+    import nltk
+    from nltk.corpus import stopwords
+    try:
+        nltk.data.find('corpora/stopwords')
+    except LookupError:
+        nltk.download('stopwords')
+    try:
+        return set(stopwords.words('english'))
+    except LookupError:
+        # 无法下载NLTK数据时使用sklearn内置停用词，不影响性能对比
+        from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+        print("NLTK停用词不可用，使用sklearn内置停用词")
+        return set(ENGLISH_STOP_WORDS)
+
+def punkt_available() -> bool:
+    """
+    检查原实现依赖的punkt分词模型是否可用
+    """
+    import nltk
+    for resource in ('tokenizers/punkt', 'tokenizers/punkt_tab'):
+        try:
+            nltk.data.find(resource)
+        except LookupError:
+            try:
+                if not nltk.download(resource.split('/')[1], quiet=True):
+                    return False
+            except Exception:
+                return False
+    return True
+
+def legacy_count(texts, stop_words, ngram_range, min_word_length):
+    """
+    原实现：preprocess_text + CountVectorizer默认分词
+    """
+    from nltk.tokenize import word_tokenize
+
+    def preprocess_text(text):
+        if not text:
+            return ""
+        text = text.lower()
+        text = re.sub(r'[^\w\s]', ' ', text)
+        tokens = word_tokenize(text)
+        tokens = [token for token in tokens if token not in stop_words]
+        tokens = [token for token in tokens if len(token) >= min_word_length]
+        return ' '.join(tokens)
+
+    vectorizer = CountVectorizer(stop_words=list(stop_words), ngram_range=ngram_range)
+    matrix = vectorizer.fit_transform([preprocess_text(text) for text in texts])
+    return vectorizer, matrix
+
+def single_pass_count(texts, tokenizer, n_jobs):
+    """
+    新实现：单次扫描分词 + 自定义analyzer
+    """
+    vectorizer = CountVectorizer(analyzer=passthrough_analyzer)
+    matrix = vectorizer.fit_transform(tokenizer.analyze_corpus(texts, n_jobs=n_jobs))
+    return vectorizer, matrix
+
+def term_totals(vectorizer, matrix):
+    """
+    汇总每个词语的总频率，用于结果校验
+    """
+    return dict(zip(vectorizer.get_feature_names_out(), matrix.sum(axis=0).A1.tolist()))
+
+def timed(label, n_docs, func, *args):
+    """
+    执行并打印耗时和吞吐量
+    """
+    start = time.perf_counter()
+    result = func(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:8.2f}s  {n_docs / elapsed:10.0f} docs/s")
+    return result, elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description="分词基准测试")
+    parser.add_argument("--docs", type=int, default=50000, help="文档数量")
+    parser.add_argument("--jobs", type=int, default=os.cpu_count() or 1, help="并行分词的进程数")
+    parser.add_argument("--ngram-max", type=int, default=2, help="n-gram最大长度")
+    parser.add_argument("--skip-legacy", action="store_true", help="跳过原实现（文档很多时较慢）")
+    args = parser.parse_args()
+
+    texts = generate_job_descriptions(args.docs)
+    stop_words = load_stop_words()
+    ngram_range = (1, args.ngram_max)
+    tokenizer = DocumentTokenizer(stop_words, min_word_length=2, ngram_range=ngram_range)
+
+    print(f"文档数: {args.docs}, n-gram: {ngram_range}, 进程数: {args.jobs}")
+
+    if not args.skip_legacy and not punkt_available():
+        print("NLTK punkt模型不可用，跳过原实现")
+        args.skip_legacy = True
+
+    results = {}
+    if not args.skip_legacy:
+        results["legacy"], legacy_time = timed("原实现(word_tokenize)", args.docs, legacy_count,
+                                               texts, stop_words, ngram_range, 2)
+    results["single"], single_time = timed("单次扫描", args.docs, single_pass_count, texts, tokenizer, 1)
+    results["pool"], pool_time = timed(f"单次扫描+进程池({args.jobs})", args.docs, single_pass_count,
+                                       texts, tokenizer, args.jobs)
+
+    totals = {name: term_totals(*result) for name, result in results.items()}
+    reference = totals["single"]
+    for name, counts in totals.items():
+        status = "一致" if counts == reference else "不一致"
+        print(f"{name}: {len(counts)}个词语，与单次扫描结果{status}")
+
+    if not args.skip_legacy:
+        print(f"加速比: 单次扫描 {legacy_time / single_time:.1f}x, 进程池 {legacy_time / pool_time:.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,299 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+流水线基准测试套件
+
+在确定的合成职位数据（固定随机种子）上，按不同规模测量流水线各环节的耗时，
+结果保存为JSON；比较模式对比两次结果（例如两个提交），标记超过阈值的性能回退。
+
+测试项:
+    freq_extract_keywords     FrequencyAnalyzer.extract_keywords
+    hybrid_combine_keywords   HybridAnalyzer.combine_keywords
+    excel_round_trip          ExcelHandler.save_to_excel + load_from_excel
+    visualizer_render         Visualizer词云、条形图和热力图渲染（Matplotlib，不使用缓存）
+    llm_extraction            GeminiExtractor.batch_analyze_jobs（本地假后端StubBackend，不使用缓存）
+
+用法:
+    python benchmarks/run_benchmarks.py --scales 1000 10000 100000
+    python benchmarks/run_benchmarks.py --cases freq_extract_keywords --repeat 5 --output base.json
+    python benchmarks/run_benchmarks.py --compare base.json head.json --threshold 0.1
+"""
+
+import os
+import sys
+import json
+import time
+import socket
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+from datetime import datetime
+from typing import List, Dict, Any, Callable
+
+# 将项目根目录添加到系统路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from benchmarks.synthetic import generate_jobs, TECH_TERMS
+
+# 默认结果目录
+RESULTS_DIR = os.path.join(project_root, "benchmarks", "results")
+
+def git_commit() -> str:
+    """
+    获取当前提交的短哈希，不在git仓库中时返回unknown
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=project_root,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return "unknown"
+
+def bench_freq_extract_keywords(jobs: List[Dict[str, Any]], context: Dict[str, Any]) -> Callable[[], int]:
+    """
+    词频关键词提取
+    """
+    from src.analyzer.freq_analyzer import FrequencyAnalyzer
+    analyzer = FrequencyAnalyzer()
+    descriptions = [job["job_description"] for job in jobs]
+
+    def run() -> int:
+        context["traditional_keywords"] = analyzer.extract_keywords(descriptions, top_n=100)
+        return len(descriptions)
+    return run
+
+def bench_hybrid_combine_keywords(jobs: List[Dict[str, Any]], context: Dict[str, Any]) -> Callable[[], int]:
+    """
+    传统关键词与LLM关键词融合
+    """
+    from src.analyzer.freq_analyzer import FrequencyAnalyzer
+    from src.analyzer.hybrid_analyzer import HybridAnalyzer
+    analyzer = HybridAnalyzer()
+    traditional_keywords = context.get("traditional_keywords") or FrequencyAnalyzer().extract_keywords(
+        [job["job_description"] for job in jobs], top_n=100)
+    llm_keywords = analyzer.extract_llm_keywords(jobs, top_n=100)
+
+    def run() -> int:
+        context["hybrid_keywords"] = analyzer.combine_keywords(traditional_keywords, llm_keywords, top_n=100)
+        return len(traditional_keywords) + len(llm_keywords)
+    return run
+
+def bench_excel_round_trip(jobs: List[Dict[str, Any]], context: Dict[str, Any]) -> Callable[[], int]:
+    """
+    Excel保存并重新加载
+    """
+    from src.processor.excel_handler import ExcelHandler
+    handler = ExcelHandler()
+    file_path = os.path.join(context["work_dir"], "round_trip.xlsx")
+
+    def run() -> int:
+        handler.save_to_excel(jobs, file_path)
+        loaded = handler.load_from_excel(file_path)
+        if len(loaded) != len(jobs):
+            raise RuntimeError(f"Excel往返后行数不一致: {len(loaded)} != {len(jobs)}")
+        return len(jobs)
+    return run
+
+def bench_visualizer_render(jobs: List[Dict[str, Any]], context: Dict[str, Any]) -> Callable[[], int]:
+    """
+    图表渲染（Matplotlib后端，不依赖Kaleido）
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    from src.visualizer.visualizer import Visualizer
+    visualizer = Visualizer(os.path.join(context["work_dir"], "visualizations"), use_cache=False)
+    keywords = context.get("hybrid_keywords") or [
+        {"keyword": keyword["keyword"], "frequency": keyword["frequency"], "score": keyword["score"]}
+        for keyword in bench_keywords(jobs)
+    ]
+
+    def run() -> int:
+        paths = [
+            visualizer.generate_wordcloud(keywords, filename="bench_wordcloud"),
+            visualizer.generate_bar_chart(keywords, filename="bench_bar", use_plotly=False),
+            visualizer.generate_heatmap(jobs, keywords, filename="bench_heatmap", use_plotly=False),
+        ]
+        if not all(paths):
+            raise RuntimeError("部分图表渲染失败")
+        return len(paths)
+    return run
+
+def bench_keywords(jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    从合成职位的技能列表统计关键词（渲染测试单独运行时使用）
+    """
+    from src.analyzer.hybrid_analyzer import HybridAnalyzer
+    return HybridAnalyzer().extract_llm_keywords(jobs, top_n=100)
+
+def bench_llm_extraction(jobs: List[Dict[str, Any]], context: Dict[str, Any]) -> Callable[[], int]:
+    """
+    LLM职位分析（本地假后端，不限流、不使用缓存）
+    """
+    from src.analyzer.llm_backends import StubBackend
+    from src.analyzer.llm_extractor import GeminiExtractor
+    from src.utils.rate_limiter import TokenBucketRateLimiter
+    llm_jobs = jobs[:context["llm_jobs"]]
+    backend = StubBackend(latency=context["llm_latency"], vocabulary=TECH_TERMS)
+    extractor = GeminiExtractor(api_key="fake", backend=backend, use_cache=False)
+    # 只测量提取流程本身的开销，不受配置中的速率限制影响
+    extractor.rate_limiter = TokenBucketRateLimiter()
+
+    def run() -> int:
+        batch = [{key: value for key, value in job.items() if key not in ("summary", "skills")}
+                 for job in llm_jobs]
+        extractor.batch_analyze_jobs(batch)
+        return len(batch)
+    return run
+
+# 测试项名称 -> 准备函数（返回被计时的无参函数，该函数返回处理的条目数）
+BENCHMARKS = {
+    "freq_extract_keywords": bench_freq_extract_keywords,
+    "hybrid_combine_keywords": bench_hybrid_combine_keywords,
+    "excel_round_trip": bench_excel_round_trip,
+    "visualizer_render": bench_visualizer_render,
+    "llm_extraction": bench_llm_extraction,
+}
+
+def run_case(name: str, jobs: List[Dict[str, Any]], context: Dict[str, Any], repeat: int) -> Dict[str, Any]:
+    """
+    运行单个测试项
+
+    Args:
+        name: 测试项名称
+        jobs: 职位数据
+        context: 测试项之间共享的上下文（前一项的结果可供后一项使用）
+        repeat: 重复次数
+
+    Returns:
+        Dict[str, Any]: 测试结果
+    """
+    result = {"case": name, "scale": len(jobs)}
+    try:
+        run = BENCHMARKS[name](jobs, context)
+        timings = []
+        items = 0
+        for _ in range(repeat):
+            start = time.perf_counter()
+            items = run()
+            timings.append(time.perf_counter() - start)
+        median = statistics.median(timings)
+        result.update({
+            "seconds": timings,
+            "median": median,
+            "min": min(timings),
+            "items": items,
+            "items_per_second": items / median if median > 0 else None,
+        })
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+def run_suite(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    按规模运行选定的测试项
+
+    Returns:
+        Dict[str, Any]: 包含运行环境和各测试结果的报告
+    """
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "host": socket.gethostname(),
+            "cpu_count": os.cpu_count(),
+            "seed": args.seed,
+            "repeat": args.repeat,
+            "llm_jobs": args.llm_jobs,
+            "llm_latency": args.llm_latency,
+        },
+        "results": [],
+    }
+
+    with tempfile.TemporaryDirectory() as work_dir:
+        for scale in args.scales:
+            jobs = generate_jobs(scale, seed=args.seed)
+            context = {"work_dir": work_dir, "llm_jobs": args.llm_jobs, "llm_latency": args.llm_latency}
+            for name in args.cases:
+                result = run_case(name, jobs, context, args.repeat)
+                report["results"].append(result)
+                if "error" in result:
+                    print(f"{name:<26} {scale:>8}  出错: {result['error']}")
+                else:
+                    print(f"{name:<26} {scale:>8}  中位数 {result['median']:9.3f}s  "
+                          f"{result['items_per_second']:12.1f} 条/秒")
+    return report
+
+def compare_reports(base: Dict[str, Any], head: Dict[str, Any], threshold: float) -> int:
+    """
+    对比两次结果，打印各测试项的耗时变化并标记回退
+
+    Args:
+        base: 基准结果
+        head: 对比结果
+        threshold: 判定回退或提升的相对变化阈值（如0.1表示10%）
+
+    Returns:
+        int: 回退的测试项数
+    """
+    base_results = {(r["case"], r["scale"]): r for r in base["results"] if "median" in r}
+    print(f"基准: {base['meta'].get('commit')} ({base['meta'].get('timestamp')})")
+    print(f"对比: {head['meta'].get('commit')} ({head['meta'].get('timestamp')})")
+    print(f"{'测试项':<26} {'规模':>8} {'基准(s)':>10} {'对比(s)':>10} {'变化':>8}")
+
+    regressions = 0
+    for result in head["results"]:
+        key = (result["case"], result["scale"])
+        if key not in base_results or "median" not in result:
+            continue
+        base_median = base_results[key]["median"]
+        ratio = result["median"] / base_median if base_median > 0 else 1.0
+        if ratio > 1 + threshold:
+            status = "回退"
+            regressions += 1
+        elif ratio < 1 - threshold:
+            status = "提升"
+        else:
+            status = ""
+        print(f"{result['case']:<26} {result['scale']:>8} {base_median:10.3f} {result['median']:10.3f} "
+              f"{(ratio - 1) * 100:+7.1f}% {status}")
+
+    print(f"共{regressions}项回退（阈值{threshold * 100:.0f}%）")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="流水线基准测试套件")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1000, 10000], help="职位数量（可指定多个规模）")
+    parser.add_argument("--cases", nargs="+", choices=list(BENCHMARKS.keys()), default=list(BENCHMARKS.keys()),
+                        help="要运行的测试项，默认全部")
+    parser.add_argument("--repeat", type=int, default=3, help="每个测试项的重复次数，取中位数")
+    parser.add_argument("--seed", type=int, default=42, help="合成数据的随机种子")
+    parser.add_argument("--llm-jobs", type=int, default=1000, help="LLM测试最多使用的职位数")
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="假后端每次调用的模拟延迟（秒）")
+    parser.add_argument("--output", type=str, help="结果JSON路径，默认保存到benchmarks/results")
+    parser.add_argument("--compare", nargs=2, metavar=("BASE", "HEAD"), help="对比两个结果JSON，不运行测试")
+    parser.add_argument("--threshold", type=float, default=0.1, help="判定回退的相对变化阈值")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0], "r", encoding="utf-8") as f:
+            base = json.load(f)
+        with open(args.compare[1], "r", encoding="utf-8") as f:
+            head = json.load(f)
+        sys.exit(1 if compare_reports(base, head, args.threshold) else 0)
+
+    report = run_suite(args)
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"{datetime.now().strftime('%Y%m%d_%H%M%S')}_{report['meta']['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"结果已保存到: {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+合成数据生成模块
+
+生成结构与爬虫输出一致、内容确定（固定随机种子）的职位数据和职位描述，
+供各基准测试脚本使用，不依赖网络或已爬取的数据。
+"""
+
+import random
+from typing import List, Dict, Any
+
+# 技术词汇（部分为多词短语，便于覆盖n-gram和白名单匹配）
+TECH_TERMS = [
+    "python", "java", "javascript", "typescript", "golang", "rust", "c++", "sql",
+    "postgresql", "mysql", "mongodb", "redis", "kafka", "spark", "hadoop", "airflow",
+    "docker", "kubernetes", "terraform", "aws", "azure", "gcp", "linux", "git",
+    "react", "vue", "angular", "node.js", "django", "flask", "fastapi", "spring boot",
+    "machine learning", "deep learning", "pytorch", "tensorflow", "scikit-learn",
+    "pandas", "numpy", "data pipelines", "rest api", "graphql", "microservices",
+    "ci/cd", "jenkins", "github actions", "elasticsearch", "snowflake", "dbt", "tableau",
+]
+
+# 普通词汇
+FILLER_WORDS = [
+    "team", "experience", "work", "build", "design", "develop", "maintain", "scalable",
+    "systems", "collaborate", "engineers", "product", "customers", "strong", "skills",
+    "communication", "years", "degree", "computer", "science", "responsible", "ownership",
+    "quality", "testing", "production", "services", "platform", "performance", "reliable",
+    "fast", "growing", "company", "mission", "impact", "remote", "office", "benefits",
+    "the", "and", "with", "for", "our", "you", "will", "to", "of", "in", "a", "is",
+]
+
+JOB_TITLES = ["Software Engineer", "Data Engineer", "Backend Developer", "Frontend Developer",
+              "Machine Learning Engineer", "DevOps Engineer", "Data Scientist", "Full Stack Engineer"]
+COMPANIES = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark Industries", "Wayne Enterprises", "Soylent"]
+LOCATIONS = ["Remote", "New York, NY", "San Francisco, CA", "London, UK", "Berlin, Germany", "Singapore"]
+EXPERIENCE_LEVELS = ["Entry level", "Associate", "Mid-Senior level", "Director"]
+
+def generate_job_description(rng: random.Random, n_sentences: int = 8) -> str:
+    """
+    生成一段职位描述
+
+    Args:
+        rng: 随机数生成器
+        n_sentences: 句子数量
+
+    Returns:
+        str: 职位描述文本
+    """
+    sentences = []
+    for _ in range(n_sentences):
+        words = rng.choices(FILLER_WORDS, k=rng.randint(8, 16))
+        # 每句插入若干技术词汇，热门技术出现频率更高
+        for _ in range(rng.randint(1, 3)):
+            index = min(int(rng.expovariate(1 / 12)), len(TECH_TERMS) - 1)
+            words.insert(rng.randrange(len(words) + 1), TECH_TERMS[index])
+        if rng.random() < 0.3:
+            words.append(f"{rng.randint(1, 10)}+ years")
+        sentence = " ".join(words)
+        sentences.append(sentence[0].upper() + sentence[1:] + ".")
+    return " ".join(sentences)
+
+def generate_job_descriptions(n: int, seed: int = 42) -> List[str]:
+    """
+    生成职位描述列表
+
+    Args:
+        n: 职位描述数量
+        seed: 随机种子
+
+    Returns:
+        List[str]: 职位描述列表
+    """
+    rng = random.Random(seed)
+    return [generate_job_description(rng, rng.randint(5, 12)) for _ in range(n)]
+
+def generate_jobs(n: int, seed: int = 42) -> List[Dict[str, Any]]:
+    """
+    生成与爬虫输出结构一致的职位数据
+
+    Args:
+        n: 职位数量
+        seed: 随机种子
+
+    Returns:
+        List[Dict[str, Any]]: 职位数据列表
+    """
+    rng = random.Random(seed)
+    jobs = []
+    for i in range(n):
+        title = rng.choice(JOB_TITLES)
+        jobs.append({
+            "job_id": str(3900000000 + i),
+            "job_title": title,
+            "company": rng.choice(COMPANIES),
+            "location": rng.choice(LOCATIONS),
+            "job_link": f"https://www.linkedin.com/jobs/view/{3900000000 + i}/",
+            "search_keyword": title,
+            "search_location": rng.choice(LOCATIONS),
+            "crawl_time": f"2024-01-{1 + i % 28:02d} 12:00:00",
+            "experience_level": rng.choice(EXPERIENCE_LEVELS),
+            "job_description": generate_job_description(rng, rng.randint(5, 12)),
+            "skills": rng.sample(TECH_TERMS, rng.randint(3, 8)),
+        })
+    return jobs
@@ -19,17 +19,22 @@ from datetime import datetime
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 # 导入配置和模块
-from config import LINKEDIN_CONFIG, GEMINI_CONFIG, TEXT_ANALYSIS_CONFIG, LOGGING_CONFIG
+from config import LINKEDIN_CONFIG, TEXT_ANALYSIS_CONFIG, LOGGING_CONFIG
 from config import RAW_DATA_DIR, PROCESSED_DATA_DIR, OUTPUT_DIR, EXCEL_OUTPUT_DIR, VISUALIZATION_DIR
 
 # 导入项目模块
 from src.crawler.linkedin_crawler import LinkedInCrawler
+from src.crawler.page_archive import replay_archive
 from src.processor.excel_handler import ExcelHandler
+from src.processor.storage import get_storage, get_extension, STORAGE_BACKENDS
 from src.analyzer.llm_extractor import GeminiExtractor
 from src.analyzer.freq_analyzer import FrequencyAnalyzer
+from src.analyzer.scoring import SCORING_METHODS
 from src.analyzer.hybrid_analyzer import HybridAnalyzer
-from src.visualizer.heatmap import HeatmapGenerator
-from src.visualizer.wordcloud import WordCloudGenerator
+from src.visualizer.visualizer import Visualizer
+from src.utils.metrics import metrics
+from src.utils.run_catalog import (RunCatalog, STAGE_RAW, STAGE_PROCESSED, STAGE_KEYWORDS,
+                                   STAGE_VISUALIZATION)
 
 # 设置日志
 def setup_logging():
@@ -58,8 +63,8 @@ def parse_args():
     
     # 主要操作模式
     parser.add_argument('--mode', type=str, default='all',
-                        choices=['crawl', 'analyze', 'visualize', 'all'],
-                        help='运行模式: 爬取(crawl), 分析(analyze), 可视化(visualize), 或全部(all)')
+                        choices=['crawl', 'replay', 'analyze', 'visualize', 'all'],
+                        help='运行模式: 爬取(crawl), 回放归档页面(replay), 分析(analyze), 可视化(visualize), 或全部(all)')
     
     # 爬虫参数
     parser.add_argument('--keywords', type=str, nargs='+',
@@ -72,14 +77,24 @@ def parse_args():
                         help='使用无头模式运行浏览器')
     parser.add_argument('--use-proxy', action='store_true',
                         help='使用代理')
+    parser.add_argument('--resume', type=str, metavar='RUN_ID',
+                        help='从指定运行ID的检查点恢复爬取，跳过已完成的页面')
+    parser.add_argument('--archive-pages', action='store_true',
+                        help='将爬取的原始页面压缩归档，供replay模式使用')
+    parser.add_argument('--replay-runs', type=str, nargs='+', metavar='RUN_ID',
+                        help='replay模式下要回放的运行ID，默认回放全部归档')
     
     # 分析参数
     parser.add_argument('--input-file', type=str,
-                        help='要分析的Excel文件路径')
+                        help='要分析的数据文件路径（.parquet/.jsonl/.xlsx）')
     parser.add_argument('--llm-weight', type=float,
                         help='LLM结果权重')
     parser.add_argument('--top-n', type=int,
                         help='保留前N个关键词')
+    parser.add_argument('--no-llm-cache', action='store_true',
+                        help='绕过LLM结果缓存，强制重新调用API')
+    parser.add_argument('--scoring', type=str, choices=SCORING_METHODS,
+                        help='传统词频分析的关键词评分方式')
     
     # 可视化参数
     parser.add_argument('--no-wordcloud', action='store_true',
@@ -87,6 +102,16 @@ def parse_args():
     parser.add_argument('--no-heatmap', action='store_true',
                         help='不生成热力图')
     
+    # 存储参数
+    parser.add_argument('--data-format', type=str, choices=list(STORAGE_BACKENDS.keys()),
+                        help='中间数据存储格式，默认parquet（未安装pyarrow时为jsonl）')
+    
+    # 指标参数
+    parser.add_argument('--metrics-file', type=str,
+                        help='JSON指标报告路径，默认保存到输出目录的metrics子目录')
+    parser.add_argument('--prometheus-file', type=str,
+                        help='同时将指标以Prometheus文本格式保存到该路径')
+    
     # 其他参数
     parser.add_argument('--output-prefix', type=str,
                         help='输出文件前缀')
@@ -111,12 +136,16 @@ def update_config(args):
         LINKEDIN_CONFIG['crawler']['headless'] = True
     if args.use_proxy:
         LINKEDIN_CONFIG['crawler']['use_proxy'] = True
+    if args.archive_pages:
+        LINKEDIN_CONFIG['crawler']['archive_pages'] = True
     
     # 更新分析配置
     if args.llm_weight:
         TEXT_ANALYSIS_CONFIG['hybrid']['llm_weight'] = args.llm_weight
     if args.top_n:
         TEXT_ANALYSIS_CONFIG['hybrid']['top_n'] = args.top_n
+    if args.scoring:
+        TEXT_ANALYSIS_CONFIG['traditional']['scoring'] = args.scoring
     
     # 更新日志级别
     if args.debug:
@@ -146,55 +175,104 @@ def main():
         os.makedirs(directory, exist_ok=True)
     
     # 定义输出文件路径
-    raw_excel_path = os.path.join(RAW_DATA_DIR, f"{output_prefix}_raw.xlsx")
-    processed_excel_path = os.path.join(PROCESSED_DATA_DIR, f"{output_prefix}_processed.xlsx")
+    # 中间数据使用可插拔存储格式，Excel仅用于最终导出
+    data_ext = get_extension(args.data_format)
+    raw_data_path = os.path.join(RAW_DATA_DIR, f"{output_prefix}_raw{data_ext}")
+    processed_data_path = os.path.join(PROCESSED_DATA_DIR, f"{output_prefix}_processed{data_ext}")
     keywords_excel_path = os.path.join(EXCEL_OUTPUT_DIR, f"{output_prefix}_keywords.xlsx")
     
+    # 运行目录：各阶段写文件后登记元数据
+    run_catalog = RunCatalog()
+    
     try:
         # 爬取数据
         if args.mode in ['crawl', 'all']:
             logger.info("开始爬取LinkedIn职位数据")
-            crawler = LinkedInCrawler(LINKEDIN_CONFIG)
-            job_data = crawler.run()
+            with metrics.span("crawl", unit="jobs") as span:
+                crawler = LinkedInCrawler(LINKEDIN_CONFIG, run_id=args.resume, resume=bool(args.resume))
+                job_data = crawler.run()
+                span.add(len(job_data))
             
             # 保存原始数据
-            excel_handler = ExcelHandler()
-            excel_handler.save_to_excel(job_data, raw_excel_path)
-            logger.info(f"原始数据已保存到: {raw_excel_path}")
+            with metrics.span("data_save", items=len(job_data), unit="jobs"):
+                if not get_storage(raw_data_path).save(job_data, raw_data_path):
+                    raise RuntimeError(f"保存文件失败: {raw_data_path}")
+            run_catalog.record(
+                raw_data_path, STAGE_RAW, row_count=len(job_data),
+                keywords=LINKEDIN_CONFIG['search']['keywords'], locations=LINKEDIN_CONFIG['search']['locations'],
+                params={"pages_per_search": LINKEDIN_CONFIG['search'].get('pages_per_search')},
+                run_id=output_prefix
+            )
+            logger.info(f"原始数据已保存到: {raw_data_path}")
+        
+        # 回放归档页面
+        if args.mode == 'replay':
+            logger.info("使用当前解析器回放归档页面")
+            with metrics.span("replay", unit="jobs") as span:
+                job_data = replay_archive(LINKEDIN_CONFIG['crawler'].get('archive_dir'), args.replay_runs)
+                span.add(len(job_data))
+            
+            # 保存原始数据
+            with metrics.span("data_save", items=len(job_data), unit="jobs"):
+                if not get_storage(raw_data_path).save(job_data, raw_data_path):
+                    raise RuntimeError(f"保存文件失败: {raw_data_path}")
+            run_catalog.record(raw_data_path, STAGE_RAW, row_count=len(job_data),
+                               params={"replay_runs": args.replay_runs}, run_id=output_prefix)
+            logger.info(f"回放数据已保存到: {raw_data_path}")
         
         # 分析数据
         if args.mode in ['analyze', 'all']:
             logger.info("开始分析职位数据")
             
-            # 如果不是从爬虫阶段开始，则加载指定的Excel文件
+            # 如果不是从爬虫阶段开始，则加载指定的数据文件
             if args.mode != 'all' and args.input_file:
-                raw_excel_path = args.input_file
+                raw_data_path = args.input_file
             
             # 加载数据
             excel_handler = ExcelHandler()
-            job_data = excel_handler.load_from_excel(raw_excel_path)
+            with metrics.span("data_load", unit="jobs") as span:
+                job_data = get_storage(raw_data_path).load(raw_data_path)
+                span.add(len(job_data))
             
             # LLM抽取
             logger.info("使用Gemini进行职位摘要和技能抽取")
-            gemini_extractor = GeminiExtractor(GEMINI_CONFIG)
-            job_data_with_llm = gemini_extractor.process_jobs(job_data)
+            llm_tokens = metrics.get_counter("llm_tokens_total", kind="output")
+            with metrics.span("llm_extraction", items=len(job_data), unit="jobs") as span:
+                gemini_extractor = GeminiExtractor(use_cache=not args.no_llm_cache)
+                job_data_with_llm = gemini_extractor.batch_analyze_jobs(job_data)
+            llm_tokens = metrics.get_counter("llm_tokens_total", kind="output") - llm_tokens
+            if llm_tokens and span.elapsed > 0:
+                logger.info(f"LLM输出速率: {llm_tokens / span.elapsed:.1f} tokens/秒")
             
             # 保存处理后的数据
-            excel_handler.save_to_excel(job_data_with_llm, processed_excel_path)
-            logger.info(f"处理后的数据已保存到: {processed_excel_path}")
+            with metrics.span("data_save", items=len(job_data_with_llm), unit="jobs"):
+                if not get_storage(processed_data_path).save(job_data_with_llm, processed_data_path):
+                    raise RuntimeError(f"保存文件失败: {processed_data_path}")
+            run_catalog.record(processed_data_path, STAGE_PROCESSED, row_count=len(job_data_with_llm),
+                               run_id=output_prefix, source_path=raw_data_path)
+            logger.info(f"处理后的数据已保存到: {processed_data_path}")
             
             # 传统词频分析
             logger.info("执行传统词频分析")
-            freq_analyzer = FrequencyAnalyzer(TEXT_ANALYSIS_CONFIG['traditional'])
-            traditional_keywords = freq_analyzer.analyze(job_data_with_llm)
+            with metrics.span("frequency_analysis", items=len(job_data_with_llm), unit="jobs"):
+                freq_analyzer = FrequencyAnalyzer()
+                traditional_keywords = freq_analyzer.analyze_jobs(
+                    job_data_with_llm, TEXT_ANALYSIS_CONFIG['hybrid'].get('top_n', 100))
             
-            # 混合分析
+            # 混合分析（融合关键词并按分组字段统计）
             logger.info("执行混合关键词分析")
-            hybrid_analyzer = HybridAnalyzer(TEXT_ANALYSIS_CONFIG['hybrid'])
-            keyword_results = hybrid_analyzer.analyze(job_data_with_llm, traditional_keywords)
+            with metrics.span("hybrid_merge", items=len(job_data_with_llm), unit="jobs"):
+                hybrid_analyzer = HybridAnalyzer(freq_analyzer)
+                keyword_results = hybrid_analyzer.analyze_jobs(job_data_with_llm, traditional_keywords)
             
             # 保存关键词结果
-            excel_handler.save_keywords_to_excel(keyword_results, keywords_excel_path)
+            with metrics.span("excel_save"):
+                if not excel_handler.save_keywords_to_excel(keyword_results, keywords_excel_path):
+                    raise RuntimeError(f"保存文件失败: {keywords_excel_path}")
+            run_catalog.record(keywords_excel_path, STAGE_KEYWORDS,
+                               row_count=len(keyword_results.get('hybrid_keywords', [])),
+                               params={"scoring": TEXT_ANALYSIS_CONFIG['traditional'].get('scoring')},
+                               run_id=output_prefix, source_path=processed_data_path)
             logger.info(f"关键词分析结果已保存到: {keywords_excel_path}")
         
         # 可视化
@@ -207,21 +285,28 @@ def main():
             
             # 加载关键词数据
             excel_handler = ExcelHandler()
-            keyword_data = excel_handler.load_keywords_from_excel(keywords_excel_path)
+            with metrics.span("excel_load"):
+                keyword_data = excel_handler.load_keywords_from_excel(keywords_excel_path)
             
-            # 生成热力图
+            visualizer = Visualizer(VISUALIZATION_DIR)
+            chart_types = []
             if not args.no_heatmap:
-                logger.info("生成热力图")
-                heatmap_generator = HeatmapGenerator()
-                heatmap_path = os.path.join(VISUALIZATION_DIR, f"{output_prefix}_heatmap")
-                heatmap_generator.generate(keyword_data, heatmap_path)
-            
-            # 生成词云
+                chart_types.extend(["heatmap", "segment_heatmap"])
             if not args.no_wordcloud:
-                logger.info("生成词云")
-                wordcloud_generator = WordCloudGenerator()
-                wordcloud_path = os.path.join(VISUALIZATION_DIR, f"{output_prefix}_wordcloud")
-                wordcloud_generator.generate(keyword_data, wordcloud_path)
+                chart_types.append("wordcloud")
+            
+            # 生成热力图（职位摘要热力图和各分组热力图）和词云，各图表按render_workers并行渲染
+            with metrics.span("render", unit="charts") as span:
+                logger.info(f"生成图表: {', '.join(chart_types) or '无'}")
+                charts = visualizer.generate_all_visualizations(
+                    keyword_data.get('job_summaries', []), keyword_data, output_prefix, chart_types=chart_types)
+                output_files = list(charts.values())
+                span.add(len([path for path in output_files if path]))
+            
+            for output_file in output_files:
+                if output_file:
+                    run_catalog.record(output_file, STAGE_VISUALIZATION, run_id=output_prefix,
+                                       source_path=keywords_excel_path)
         
         logger.info("LinkedIn关键词分析系统执行完成")
         
@@ -229,6 +314,12 @@ def main():
         logger.error(f"执行过程中发生错误: {str(e)}", exc_info=True)
         return 1
     
+    finally:
+        # 保存本次运行的指标报告（出错时也保存已完成阶段的指标）
+        metrics.write_report(args.metrics_file or os.path.join(OUTPUT_DIR, "metrics", f"{output_prefix}_metrics.json"))
+        if args.prometheus_file:
+            metrics.write_prometheus(args.prometheus_file)
+    
     return 0
 
 if __name__ == "__main__":
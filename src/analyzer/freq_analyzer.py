@@ -8,17 +8,16 @@
 使用NLP技术提取关键词并计算其频率。
 """
 
-import re
 import os
 import logging
 import numpy as np
+import scipy.sparse as sp
 from typing import List, Dict, Any, Optional, Union, Tuple, Set
 from collections import Counter
 
-from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
+from sklearn.feature_extraction.text import CountVectorizer
 import nltk
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
 
 # 导入配置
 import sys
@@ -31,6 +30,12 @@ if project_root not in sys.path:
     sys.path.append(project_root)
 
 from config import TEXT_ANALYSIS_CONFIG
+from src.analyzer.tokenizer import DocumentTokenizer, passthrough_analyzer
+from src.analyzer.keyword_matcher import KeywordMatcher
+from src.analyzer.ranking import select_top_keywords
+from src.analyzer.term_stats import TermStatsStore
+from src.analyzer.scoring import SCORING_METHODS, compute_scores, log_odds_scores
+from src.utils.helpers import md5_hash
 
 # 设置日志
 logger = logging.getLogger(__name__)
@@ -43,11 +48,6 @@ class FrequencyAnalyzer:
         初始化频率分析器
         """
         # 下载NLTK资源（如果尚未下载）
-        try:
-            nltk.data.find('tokenizers/punkt')
-        except LookupError:
-            nltk.download('punkt')
-            
         try:
             nltk.data.find('corpora/stopwords')
         except LookupError:
@@ -72,21 +72,50 @@ class FrequencyAnalyzer:
             except Exception as e:
                 logger.error(f"加载技术关键词文件时出错: {str(e)}")
         
-        # 初始化向量化器
-        self.count_vectorizer = CountVectorizer(
-            stop_words=list(self.stop_words),
-            ngram_range=TEXT_ANALYSIS_CONFIG['traditional']['ngram_range'],
-            min_df=TEXT_ANALYSIS_CONFIG['traditional']['min_df'],
-            max_df=TEXT_ANALYSIS_CONFIG['traditional']['max_df']
+        # 将技术关键词母表编译为多模式匹配自动机
+        self.tech_matcher = KeywordMatcher(self.tech_keywords)
+        
+        # 单次扫描分词器（分词、停用词和词长过滤、n-gram生成）
+        self.tokenizer = DocumentTokenizer(
+            stop_words=self.stop_words,
+            min_word_length=TEXT_ANALYSIS_CONFIG['traditional'].get('min_word_length', 2),
+            remove_numbers=TEXT_ANALYSIS_CONFIG['traditional'].get('remove_numbers', False),
+            ngram_range=TEXT_ANALYSIS_CONFIG['traditional']['ngram_range']
         )
         
-        self.tfidf_vectorizer = TfidfVectorizer(
-            stop_words=list(self.stop_words),
-            ngram_range=TEXT_ANALYSIS_CONFIG['traditional']['ngram_range'],
+        # 分词并行进程数（大规模语料时使用）
+        self.n_jobs = TEXT_ANALYSIS_CONFIG['traditional'].get('n_jobs', 1)
+        
+        # 初始化向量化器，直接接收分词器生成的n-gram列表
+        self.count_vectorizer = CountVectorizer(
+            analyzer=passthrough_analyzer,
             min_df=TEXT_ANALYSIS_CONFIG['traditional']['min_df'],
             max_df=TEXT_ANALYSIS_CONFIG['traditional']['max_df']
         )
         
+        # 关键词评分方式（count/tfidf/bm25/log_odds），均直接在稀疏计数矩阵上计算
+        self.scoring = TEXT_ANALYSIS_CONFIG['traditional'].get('scoring', 'count')
+        if self.scoring not in SCORING_METHODS:
+            logger.warning(f"不支持的评分方式: {self.scoring}，使用词频")
+            self.scoring = 'count'
+        self.bm25_k1 = TEXT_ANALYSIS_CONFIG['traditional'].get('bm25_k1', 1.2)
+        self.bm25_b = TEXT_ANALYSIS_CONFIG['traditional'].get('bm25_b', 0.75)
+        self.log_odds_prior = TEXT_ANALYSIS_CONFIG['traditional'].get('log_odds_prior', 100.0)
+        # log_odds的背景语料：增量词频统计文件（例如历史职位的累计统计）
+        self.background_stats_path = TEXT_ANALYSIS_CONFIG['traditional'].get('background_stats_path')
+        
+        # 增量模式：词频统计持久化，每次只对新增职位计数
+        self.incremental = TEXT_ANALYSIS_CONFIG['traditional'].get('incremental', False)
+        self.term_stats = None
+        if self.incremental:
+            self.term_stats = TermStatsStore(TEXT_ANALYSIS_CONFIG['traditional'].get('term_stats_path'))
+        
+        # 最近一次extract_keywords的文档-词语计数矩阵及其特征和输入描述，
+        # 供keyword_matrix复用（例如混合分析的分组统计），避免重新分词
+        self.last_count_matrix = None
+        self.last_feature_names = None
+        self.last_descriptions = None
+        
         logger.info("频率分析器初始化完成")
     
     def preprocess_text(self, text: str) -> str:
@@ -99,102 +128,216 @@ class FrequencyAnalyzer:
         Returns:
             str: 预处理后的文本
         """
-        if not text:
-            return ""
-        
-        # 转换为小写
-        text = text.lower()
-        
-        # 移除特殊字符，保留字母、数字和空格
-        text = re.sub(r'[^\w\s]', ' ', text)
-        
-        # 移除数字（可选，取决于是否需要保留版本号等信息）
-        if TEXT_ANALYSIS_CONFIG['traditional'].get('remove_numbers', False):
-            text = re.sub(r'\d+', '', text)
-        
-        # 分词
-        tokens = word_tokenize(text)
-        
-        # 移除停用词
-        tokens = [token for token in tokens if token not in self.stop_words]
-        
-        # 移除过短的词
-        min_word_length = TEXT_ANALYSIS_CONFIG['traditional'].get('min_word_length', 2)
-        tokens = [token for token in tokens if len(token) >= min_word_length]
-        
-        # 重新组合为文本
-        return ' '.join(tokens)
+        return ' '.join(self.tokenizer.tokenize(text))
     
-    def extract_keywords(self, job_descriptions: List[str], top_n: int = 50) -> List[Dict[str, Any]]:
+    def extract_keywords(self, job_descriptions: List[str], top_n: int = 50,
+                         scoring: Optional[str] = None) -> List[Dict[str, Any]]:
         """
         提取关键词
         
         Args:
             job_descriptions: 职位描述列表
             top_n: 返回前N个关键词
+            scoring: 评分方式，如果为None则使用配置中的方式
         
         Returns:
             List[Dict[str, Any]]: 关键词列表，包含关键词、频率和分数
         """
         try:
-            # 预处理文本
-            preprocessed_texts = [self.preprocess_text(text) for text in job_descriptions]
+            # 单次扫描分词并生成n-gram
+            analyzed_docs = self.tokenizer.analyze_corpus(job_descriptions, n_jobs=self.n_jobs)
             
             # 使用CountVectorizer提取词频
-            count_matrix = self.count_vectorizer.fit_transform(preprocessed_texts)
+            count_matrix = self.count_vectorizer.fit_transform(analyzed_docs)
             
             # 获取特征名称（词语）
             feature_names = self.count_vectorizer.get_feature_names_out()
             
             # 计算总词频
-            word_counts = count_matrix.sum(axis=0).A1
-            
-            # 创建词频字典
-            word_freq = {feature_names[i]: int(word_counts[i]) for i in range(len(feature_names))}
-            
-            # 如果有技术关键词母表，优先保留母表中的词
-            if self.tech_keywords:
-                # 过滤关键词
-                filtered_word_freq = {}
-                for word, freq in word_freq.items():
-                    # 检查单词或其小写形式是否在技术关键词母表中
-                    word_lower = word.lower()
-                    if word_lower in self.tech_keywords or any(tech_keyword in word_lower for tech_keyword in self.tech_keywords):
-                        filtered_word_freq[word] = freq
-                
-                # 如果过滤后的词太少，则添加一些高频词
-                if len(filtered_word_freq) < top_n:
-                    # 按频率排序
-                    sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-                    # 添加高频词，直到达到top_n或用完所有词
-                    for word, freq in sorted_words:
-                        if word not in filtered_word_freq:
-                            filtered_word_freq[word] = freq
-                            if len(filtered_word_freq) >= top_n:
-                                break
-                
-                word_freq = filtered_word_freq
-            
-            # 按频率排序并取前N个
-            sorted_keywords = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:top_n]
-            
-            # 转换为所需格式
-            result = [
-                {
-                    "keyword": keyword,
-                    "frequency": freq,
-                    "score": float(freq)  # 使用频率作为分数
-                }
-                for keyword, freq in sorted_keywords
-            ]
-            
-            logger.info(f"提取了{len(result)}个关键词")
+            word_counts = np.asarray(count_matrix.sum(axis=0)).ravel()
+            
+            self.last_count_matrix = count_matrix.tocsr()
+            self.last_feature_names = feature_names
+            self.last_descriptions = list(job_descriptions)
+            
+            # 计算关键词分数
+            scoring = scoring or self.scoring
+            background_counts = None
+            if scoring == 'log_odds':
+                background_counts = self._load_background_counts(feature_names)
+            scores = compute_scores(
+                count_matrix, scoring,
+                k1=self.bm25_k1, b=self.bm25_b,
+                background_counts=background_counts, prior=self.log_odds_prior
+            )
+            
+            result = self._rank_keywords(feature_names, word_counts, top_n, scores)
+            
+            logger.info(f"使用{scoring}评分提取了{len(result)}个关键词")
             return result
             
         except Exception as e:
             logger.error(f"提取关键词时出错: {str(e)}")
             return []
     
+    def keyword_matrix(self, job_descriptions: List[str], keywords: List[str]) -> Any:
+        """
+        统计指定关键词在每个职位描述中的出现次数（与extract_keywords使用相同的分词和n-gram）
+        
+        job_descriptions与最近一次extract_keywords的输入相同时，直接从其计数矩阵中截取列，
+        不再重新分词；不在特征中的关键词（例如只由LLM提取的技能）对应全零列。
+        
+        Args:
+            job_descriptions: 职位描述列表
+            keywords: 关键词列表（不能重复）
+        
+        Returns:
+            scipy.sparse.csr_matrix: 文档-关键词计数矩阵，列与keywords对应
+        """
+        if self.last_count_matrix is not None and self.last_descriptions == list(job_descriptions):
+            feature_index = {str(word): i for i, word in enumerate(self.last_feature_names)}
+            pairs = [(feature_index[keyword], col) for col, keyword in enumerate(keywords)
+                     if keyword in feature_index]
+            rows = [feature_col for feature_col, _ in pairs]
+            cols = [col for _, col in pairs]
+            # 用0/1选择矩阵相乘截取列，缺失的关键词得到全零列
+            selector = sp.csr_matrix((np.ones(len(pairs), dtype=self.last_count_matrix.dtype), (rows, cols)),
+                                     shape=(len(feature_index), len(keywords)))
+            return (self.last_count_matrix @ selector).tocsr()
+        
+        analyzed_docs = self.tokenizer.analyze_corpus(job_descriptions, n_jobs=self.n_jobs)
+        vectorizer = CountVectorizer(analyzer=passthrough_analyzer,
+                                     vocabulary={keyword: i for i, keyword in enumerate(keywords)})
+        return vectorizer.transform(analyzed_docs).tocsr()
+    
+    def _load_background_counts(self, feature_names: np.ndarray) -> Optional[np.ndarray]:
+        """
+        加载背景语料词频并与特征名称对齐
+        
+        Args:
+            feature_names: 特征名称
+        
+        Returns:
+            Optional[np.ndarray]: 背景词频向量，未配置背景语料时返回None
+        """
+        if not self.background_stats_path or not os.path.exists(self.background_stats_path):
+            return None
+        
+        store = TermStatsStore(self.background_stats_path)
+        try:
+            terms, counts, _, _ = store.load()
+        finally:
+            store.close()
+        
+        background = dict(zip(terms, counts))
+        return np.fromiter((background.get(word, 0) for word in feature_names),
+                           dtype=np.float64, count=len(feature_names))
+    
+    def _rank_keywords(self, feature_names: np.ndarray, word_counts: np.ndarray,
+                       top_n: int, scores: Optional[np.ndarray] = None) -> List[Dict[str, Any]]:
+        """
+        按分数选取前N个关键词
+        
+        Args:
+            feature_names: 特征名称（按字母序排列）
+            word_counts: 与特征名称对应的总词频
+            top_n: 返回前N个关键词
+            scores: 关键词分数，如果为None则使用词频
+        
+        Returns:
+            List[Dict[str, Any]]: 关键词列表，包含关键词、频率和分数
+        """
+        # 如果有技术关键词母表，优先保留母表中的词（白名单以特征索引掩码表示）
+        whitelist_mask = None
+        if self.tech_keywords:
+            whitelist_mask = np.fromiter(
+                (word in self.tech_keywords or self.tech_matcher.contains_any(word)
+                 for word in feature_names),
+                dtype=bool, count=len(feature_names)
+            )
+        
+        if scores is None:
+            scores = word_counts
+        
+        # 直接在分数向量上选取前N个关键词
+        top_indices = select_top_keywords(scores, top_n, whitelist_mask)
+        
+        # 转换为所需格式
+        return [
+            {
+                "keyword": str(feature_names[i]),
+                "frequency": int(word_counts[i]),
+                "score": float(scores[i])
+            }
+            for i in top_indices
+        ]
+    
+    def update_term_stats(self, jobs: List[Dict[str, Any]]) -> int:
+        """
+        将尚未统计的职位合并到增量词频统计中
+        
+        Args:
+            jobs: 职位列表（可以是完整的主数据集，已统计的职位会被跳过）
+        
+        Returns:
+            int: 新合并的职位数
+        """
+        if self.term_stats is None:
+            self.term_stats = TermStatsStore(TEXT_ANALYSIS_CONFIG['traditional'].get('term_stats_path'))
+        
+        # 没有job_id的职位使用描述哈希作为文档ID
+        descriptions = {}
+        for job in jobs:
+            description = job.get("job_description")
+            if description:
+                doc_id = str(job.get("job_id") or md5_hash(description))
+                descriptions.setdefault(doc_id, description)
+        
+        new_ids = self.term_stats.filter_new(descriptions.keys())
+        if not new_ids:
+            logger.info("没有需要统计的新职位")
+            return 0
+        
+        analyzed_docs = self.tokenizer.analyze_corpus([descriptions[doc_id] for doc_id in new_ids], n_jobs=self.n_jobs)
+        return self.term_stats.update(analyzed_docs, new_ids)
+    
+    def extract_keywords_from_stats(self, top_n: int = 50) -> List[Dict[str, Any]]:
+        """
+        基于增量词频统计提取关键词，结果与对全部已统计职位调用extract_keywords一致
+        
+        Args:
+            top_n: 返回前N个关键词
+        
+        Returns:
+            List[Dict[str, Any]]: 关键词列表，包含关键词、频率和分数
+        """
+        try:
+            if self.term_stats is None:
+                self.term_stats = TermStatsStore(TEXT_ANALYSIS_CONFIG['traditional'].get('term_stats_path'))
+            
+            feature_names, word_counts, _, n_docs = self.term_stats.load(
+                min_df=TEXT_ANALYSIS_CONFIG['traditional']['min_df'],
+                max_df=TEXT_ANALYSIS_CONFIG['traditional']['max_df']
+            )
+            
+            # 增量统计只保留语料级计数，只支持词频和log_odds评分
+            scores = None
+            if self.scoring == 'log_odds':
+                background_counts = self._load_background_counts(feature_names)
+                if background_counts is not None:
+                    scores = log_odds_scores(word_counts, background_counts, prior=self.log_odds_prior)
+            elif self.scoring != 'count':
+                logger.warning(f"增量模式不支持{self.scoring}评分，使用词频")
+            
+            result = self._rank_keywords(feature_names, word_counts, top_n, scores)
+            
+            logger.info(f"基于{n_docs}个已统计职位提取了{len(result)}个关键词")
+            return result
+            
+        except Exception as e:
+            logger.error(f"基于增量统计提取关键词时出错: {str(e)}")
+            return []
+    
     def analyze_jobs(self, jobs: List[Dict[str, Any]], top_n: int = 50) -> List[Dict[str, Any]]:
         """
         分析职位数据，提取关键词
@@ -207,6 +350,12 @@ class FrequencyAnalyzer:
             List[Dict[str, Any]]: 关键词列表
         """
         try:
+            # 增量模式：只统计新增职位，再基于累计统计排序（不保留计数矩阵）
+            if self.incremental:
+                self.last_count_matrix = self.last_feature_names = self.last_descriptions = None
+                self.update_term_stats(jobs)
+                return self.extract_keywords_from_stats(top_n)
+            
             # 提取职位描述
             job_descriptions = [job.get("job_description", "") for job in jobs if job.get("job_description")]
             
@@ -5,13 +5,17 @@
 混合分析器模块
 
 该模块负责融合传统词频分析和LLM提取的关键词，
-生成更全面的关键词分析结果。
+生成更全面的关键词分析结果，并按分组字段统计混合关键词。
 """
 
 import logging
+from datetime import datetime
 from typing import List, Dict, Any, Optional, Union, Tuple
 from collections import Counter
 
+import numpy as np
+import scipy.sparse as sp
+
 # 导入配置
 import sys
 import os
@@ -23,21 +27,53 @@ if project_root not in sys.path:
     sys.path.append(project_root)
 
 from config import TEXT_ANALYSIS_CONFIG
+from src.analyzer.freq_analyzer import FrequencyAnalyzer
+from src.analyzer.segments import DEFAULT_SEGMENT_FIELDS, build_segment_table
 
 # 设置日志
 logger = logging.getLogger(__name__)
 
+def normalize_scores(keywords: List[Dict[str, Any]]) -> List[float]:
+    """
+    将关键词分数最小-最大归一化到[0, 1]
+
+    传统方法的分数量纲随评分方式变化（tfidf、bm25、词频的数量级不同，log_odds可以为负），
+    LLM分数为技能出现次数，归一化后两者才能按权重相加。
+
+    Args:
+        keywords: 关键词列表，每项包含score字段
+
+    Returns:
+        List[float]: 与关键词列表对应的归一化分数，所有分数相同时均为1.0
+    """
+    scores = [float(item["score"]) for item in keywords]
+    if not scores:
+        return []
+
+    low, high = min(scores), max(scores)
+    if high == low:
+        return [1.0] * len(scores)
+    return [(score - low) / (high - low) for score in scores]
+
 class HybridAnalyzer:
     """混合分析器类，用于融合传统词频分析和LLM提取的关键词"""
     
-    def __init__(self):
+    def __init__(self, freq_analyzer: Optional[FrequencyAnalyzer] = None):
         """
         初始化混合分析器
+        
+        Args:
+            freq_analyzer: 提取传统关键词的频率分析器，分组统计复用其计数矩阵；
+                如果为None则在需要时创建（此时需要重新分词）
         """
+        self.freq_analyzer = freq_analyzer
         self.llm_weight = TEXT_ANALYSIS_CONFIG['hybrid']['llm_weight']
         self.traditional_weight = TEXT_ANALYSIS_CONFIG['hybrid']['traditional_weight']
         self.min_frequency = TEXT_ANALYSIS_CONFIG['hybrid'].get('min_frequency', 2)
         self.top_n = TEXT_ANALYSIS_CONFIG['hybrid'].get('top_n', 100)
+        # 分组统计字段，配置为空列表时不做分组统计
+        self.segment_fields = TEXT_ANALYSIS_CONFIG.get('segment_fields', DEFAULT_SEGMENT_FIELDS)
+        self.top_segments = TEXT_ANALYSIS_CONFIG.get('top_segments')
         
         logger.info("混合分析器初始化完成")
     
@@ -89,7 +125,7 @@ class HybridAnalyzer:
                         traditional_weight: float = None,
                         top_n: int = None) -> List[Dict[str, Any]]:
         """
-        融合传统关键词和LLM关键词
+        融合传统关键词和LLM关键词，两组分数先分别归一化到[0, 1]再按权重相加
         
         Args:
             traditional_keywords: 传统方法提取的关键词
@@ -111,9 +147,9 @@ class HybridAnalyzer:
             keyword_dict = {}
             
             # 添加传统关键词
-            for item in traditional_keywords:
+            for item, normalized in zip(traditional_keywords, normalize_scores(traditional_keywords)):
                 keyword = item["keyword"].lower()
-                score = item["score"] * traditional_weight
+                score = normalized * traditional_weight
                 frequency = item["frequency"]
                 
                 keyword_dict[keyword] = {
@@ -124,9 +160,9 @@ class HybridAnalyzer:
                 }
             
             # 添加LLM关键词
-            for item in llm_keywords:
+            for item, normalized in zip(llm_keywords, normalize_scores(llm_keywords)):
                 keyword = item["keyword"].lower()
-                score = item["score"] * llm_weight
+                score = normalized * llm_weight
                 frequency = item["frequency"]
                 
                 if keyword in keyword_dict:
@@ -164,13 +200,84 @@ class HybridAnalyzer:
             logger.error(f"融合关键词时出错: {str(e)}")
             return []
     
+    def _build_keyword_matrix(self, jobs: List[Dict[str, Any]], keywords: List[str]) -> sp.csr_matrix:
+        """
+        构建文档-混合关键词计数矩阵
+        
+        描述中的出现次数取自频率分析器对同一批描述构建的计数矩阵（只截取关键词对应的列，
+        不重新分词）；只由LLM提取、不在特征中的技能（如"ci/cd"）在职位的skills中出现时计为1次。
+        
+        Args:
+            jobs: 职位列表
+            keywords: 混合关键词列表
+        
+        Returns:
+            sp.csr_matrix: 文档-关键词计数矩阵
+        """
+        if self.freq_analyzer is None:
+            self.freq_analyzer = FrequencyAnalyzer()
+        
+        descriptions = [job.get("job_description") or "" for job in jobs]
+        count_matrix = self.freq_analyzer.keyword_matrix(descriptions, keywords)
+        
+        keyword_index = {keyword: i for i, keyword in enumerate(keywords)}
+        rows, cols = [], []
+        for row, job in enumerate(jobs):
+            skills = job.get("skills", [])
+            if skills and isinstance(skills, list):
+                for col in {keyword_index.get(skill.lower()) for skill in skills if skill} - {None}:
+                    rows.append(row)
+                    cols.append(col)
+        skill_matrix = sp.csr_matrix((np.ones(len(rows), dtype=np.int64), (rows, cols)),
+                                     shape=count_matrix.shape)
+        
+        return count_matrix.maximum(skill_matrix).tocsr()
+    
+    def extract_segment_keywords(self, jobs: List[Dict[str, Any]], keywords: List[str],
+                                 segment_fields: Optional[List[str]] = None,
+                                 top_segments: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """
+        按分组字段统计混合关键词，计数矩阵只构建一次，各分组通过稀疏指示矩阵相乘聚合
+        
+        Args:
+            jobs: 职位列表（与矩阵行对应）
+            keywords: 统计表中的关键词
+            segment_fields: 分组字段列表，如果为None则使用配置值
+            top_segments: 每个字段只保留职位数最多的前N个分组，如果为None则使用配置值
+        
+        Returns:
+            Dict[str, Dict[str, Any]]: 分组字段到分组×关键词统计表的映射
+        """
+        try:
+            segment_fields = segment_fields if segment_fields is not None else self.segment_fields
+            top_segments = top_segments if top_segments is not None else self.top_segments
+            if not segment_fields or not jobs or not keywords:
+                return {}
+            
+            keyword_matrix = self._build_keyword_matrix(jobs, keywords)
+            binary_matrix = (keyword_matrix > 0).astype(np.int64)
+            
+            tables = {}
+            for field in segment_fields:
+                values = [job.get(field) for job in jobs]
+                tables[field] = build_segment_table(keyword_matrix, values, keywords,
+                                                    top_segments=top_segments, binary_matrix=binary_matrix)
+                logger.info(f"按{field}统计了{len(tables[field]['segments'])}个分组的关键词")
+            
+            return tables
+            
+        except Exception as e:
+            logger.error(f"按分组统计关键词时出错: {str(e)}")
+            return {}
+    
     def analyze_jobs(self, jobs: List[Dict[str, Any]], 
                     traditional_keywords: List[Dict[str, Any]],
                     llm_weight: float = None, 
                     traditional_weight: float = None,
-                    top_n: int = None) -> List[Dict[str, Any]]:
+                    top_n: int = None,
+                    segment_fields: Optional[List[str]] = None) -> Dict[str, Any]:
         """
-        分析职位数据，融合传统关键词和LLM关键词
+        分析职位数据，融合传统关键词和LLM关键词，并按分组字段统计混合关键词
         
         Args:
             jobs: 职位列表
@@ -178,13 +285,20 @@ class HybridAnalyzer:
             llm_weight: LLM关键词权重，如果为None则使用配置值
             traditional_weight: 传统关键词权重，如果为None则使用配置值
             top_n: 返回前N个关键词，如果为None则使用配置值
+            segment_fields: 分组统计字段，如果为None则使用配置中的segment_fields
+                （未配置时使用默认字段，配置为空列表时不做分组统计）
         
         Returns:
-            List[Dict[str, Any]]: 融合后的关键词列表
+            Dict[str, Any]: 分析结果，包含传统关键词、LLM关键词、混合关键词、职位摘要、
+                元数据和分组关键词统计，可直接传给ExcelHandler.save_keywords_to_excel
         """
         try:
+            llm_weight = llm_weight if llm_weight is not None else self.llm_weight
+            traditional_weight = traditional_weight if traditional_weight is not None else self.traditional_weight
+            top_n = top_n if top_n is not None else self.top_n
+            
             # 从LLM结果中提取关键词
-            llm_keywords = self.extract_llm_keywords(jobs, top_n or self.top_n)
+            llm_keywords = self.extract_llm_keywords(jobs, top_n)
             
             # 融合关键词
             hybrid_keywords = self.combine_keywords(
@@ -195,8 +309,46 @@ class HybridAnalyzer:
                 top_n
             )
             
-            return hybrid_keywords
+            # 按分组统计混合关键词
+            jobs_with_desc = [job for job in jobs if job.get("job_description")]
+            segment_keywords = self.extract_segment_keywords(
+                jobs_with_desc, [item["keyword"] for item in hybrid_keywords], segment_fields
+            )
+            
+            # 提取职位摘要
+            job_summaries = [
+                {
+                    "job_id": job.get("job_id", ""),
+                    "job_title": job.get("job_title", ""),
+                    "company": job.get("company", ""),
+                    "summary": job.get("summary", "")
+                }
+                for job in jobs if job.get("summary")
+            ]
+            
+            # 创建元数据
+            metadata = {
+                "total_jobs": len(jobs),
+                "analyzed_jobs": len(jobs_with_desc),
+                "llm_weight": llm_weight,
+                "traditional_weight": traditional_weight,
+                "top_n": top_n,
+                "analysis_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+            }
+            
+            result = {
+                "traditional_keywords": traditional_keywords,
+                "llm_keywords": llm_keywords,
+                "hybrid_keywords": hybrid_keywords,
+                "job_summaries": job_summaries,
+                "metadata": metadata
+            }
+            if segment_keywords:
+                result["segment_keywords"] = segment_keywords
+            
+            logger.info(f"成功分析{len(jobs)}个职位")
+            return result
             
         except Exception as e:
             logger.error(f"分析职位时出错: {str(e)}")
-            return []
\ No newline at end of file
+            return {}
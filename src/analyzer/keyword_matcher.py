@@ -0,0 +1,163 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+关键词匹配模块
+
+该模块将技术关键词母表编译为Aho-Corasick自动机，一次扫描即可判断词语中
+是否包含任一技术关键词（或找出包含的所有关键词），代替对母表逐个做子串查找。
+安装了pyahocorasick时使用其C实现，否则使用纯Python实现。
+"""
+
+import logging
+from collections import deque
+from typing import Iterable, List, Dict, Set, Tuple
+
+# 可选的pyahocorasick（C实现）
+AHOCORASICK_AVAILABLE = False
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    pass
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+# 纯Python实现下，关键词不超过该数量时find_all直接逐个子串查找（C实现的str.__contains__更快）
+DIRECT_SCAN_MAX_PATTERNS = 256
+
+class KeywordMatcher:
+    """
+    多模式子串匹配器，语义与 any(keyword in text for keyword in keywords) 一致
+    """
+
+    def __init__(self, keywords: Iterable[str], use_native: bool = True):
+        """
+        构建自动机
+
+        Args:
+            keywords: 关键词集合（应已转为小写）
+            use_native: pyahocorasick可用时是否使用
+        """
+        self.keywords = {keyword for keyword in keywords}
+        # 空字符串是任何文本的子串
+        self._matches_everything = "" in self.keywords
+        patterns = [keyword for keyword in self.keywords if keyword]
+        self._patterns = patterns
+
+        self._automaton = None
+        if use_native and AHOCORASICK_AVAILABLE and patterns:
+            self._automaton = ahocorasick.Automaton()
+            for pattern in patterns:
+                self._automaton.add_word(pattern, pattern)
+            self._automaton.make_automaton()
+        else:
+            self._build(patterns)
+
+        logger.debug(f"关键词匹配器构建完成，共{len(patterns)}个关键词")
+
+    def _build(self, patterns: List[str]) -> None:
+        """
+        构建纯Python的Aho-Corasick自动机
+
+        Args:
+            patterns: 非空关键词列表
+        """
+        # 状态0为根节点；goto[state]为字符到下一状态的映射
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[bool] = [False]
+        # 每个状态匹配到的关键词（含失败链上的关键词）
+        self._matches: List[Tuple[str, ...]] = [()]
+
+        for pattern in patterns:
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append(False)
+                    self._matches.append(())
+                state = next_state
+            self._output[state] = True
+            self._matches[state] = (pattern,)
+
+        # 广度优先计算失败指针，并沿失败链传播输出标记
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                target = self._goto[fail].get(char, 0)
+                self._fail[next_state] = target if target != next_state else 0
+                if self._output[self._fail[next_state]]:
+                    self._output[next_state] = True
+                    self._matches[next_state] = self._matches[next_state] + self._matches[self._fail[next_state]]
+
+    def contains_any(self, text: str) -> bool:
+        """
+        判断文本中是否包含任一关键词
+
+        Args:
+            text: 待匹配文本
+
+        Returns:
+            bool: 是否包含
+        """
+        if self._matches_everything:
+            return True
+
+        if self._automaton is not None:
+            for _ in self._automaton.iter(text):
+                return True
+            return False
+
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                return True
+        return False
+
+    def find_all(self, text: str) -> Set[str]:
+        """
+        一次扫描找出文本中出现的所有关键词
+
+        Args:
+            text: 待匹配文本
+
+        Returns:
+            Set[str]: 出现的关键词集合
+        """
+        found = set()
+        if self._matches_everything:
+            found.add("")
+
+        if self._automaton is not None:
+            for _, keyword in self._automaton.iter(text):
+                found.add(keyword)
+            return found
+
+        if len(self._patterns) <= DIRECT_SCAN_MAX_PATTERNS:
+            found.update(pattern for pattern in self._patterns if pattern in text)
+            return found
+
+        goto, fail, output, matches = self._goto, self._fail, self._output, self._matches
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(matches[state])
+        return found
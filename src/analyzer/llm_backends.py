@@ -0,0 +1,469 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+LLM后端模块
+
+该模块定义提取器调用大模型的后端接口（输入提示词，返回文本），并提供三种实现：
+Gemini API、本地确定性假后端（可配置延迟、错误率、429限流率和并发上限）
+以及调用本地HTTP假服务的后端。假服务也在本模块中，可单独启动：
+
+    python -m src.analyzer.llm_backends --port 8765 --latency 0.5 --rate-limit-rate 0.05
+
+这样批量提示、并发和重试策略可以在没有网络和API配额的情况下测试和调优。
+"""
+
+import re
+import json
+import time
+import random
+import hashlib
+import logging
+import argparse
+import threading
+from collections import Counter
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Dict, Any, Optional
+
+import requests
+
+# 可选的Gemini支持
+GENAI_AVAILABLE = False
+try:
+    import google.generativeai as genai
+    GENAI_AVAILABLE = True
+except ImportError:
+    pass
+
+# Gemini返回429时抛出的异常类型
+try:
+    from google.api_core.exceptions import ResourceExhausted
+except ImportError:
+    ResourceExhausted = None
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+class LLMBackendError(Exception):
+    """LLM后端调用失败"""
+
+class RateLimitError(LLMBackendError):
+    """LLM后端返回限流（HTTP 429）"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    解析Retry-After响应头
+
+    Args:
+        value: 响应头的值，可以是秒数或HTTP日期（例如"Wed, 21 Oct 2026 07:28:00 GMT"）
+
+    Returns:
+        Optional[float]: 需要等待的秒数（不小于0），缺失或无法解析时返回None
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        logger.warning(f"无法解析Retry-After: {value}")
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+class BaseLLMBackend:
+    """
+    LLM后端基类
+    """
+
+    # 后端名称（参与LLM结果缓存键，不同后端的结果互不复用）
+    model_name: str = ""
+
+    def generate(self, prompt: str) -> str:
+        """
+        生成文本
+
+        Args:
+            prompt: 提示词
+
+        Returns:
+            str: 模型返回的文本
+
+        Raises:
+            RateLimitError: 后端限流
+            LLMBackendError: 其他调用失败
+        """
+        raise NotImplementedError
+
+class GeminiBackend(BaseLLMBackend):
+    """
+    Gemini API后端
+    """
+
+    def __init__(self, api_key: str, model: str, generation_config: Optional[Dict[str, Any]] = None):
+        """
+        初始化Gemini后端
+
+        Args:
+            api_key: Gemini API密钥
+            model: 模型名称
+            generation_config: 生成配置
+        """
+        if not GENAI_AVAILABLE:
+            raise ImportError("使用Gemini后端需要安装google-generativeai")
+
+        self.model_name = model
+        genai.configure(api_key=api_key)
+        self.model_instance = genai.GenerativeModel(
+            model_name=model,
+            generation_config=generation_config
+        )
+
+    def generate(self, prompt: str) -> str:
+        try:
+            return self.model_instance.generate_content(prompt).text
+        except Exception as e:
+            if ResourceExhausted is not None and isinstance(e, ResourceExhausted):
+                raise RateLimitError(str(e)) from e
+            raise
+
+class ModelInstanceBackend(BaseLLMBackend):
+    """
+    包装实现了generate_content方法的模型对象（兼容直接注入模型实例的用法）
+    """
+
+    def __init__(self, model_instance: Any, model_name: str = ""):
+        """
+        初始化后端
+
+        Args:
+            model_instance: 模型对象，generate_content(prompt)返回带text属性的响应
+            model_name: 模型名称
+        """
+        self.model_instance = model_instance
+        self.model_name = model_name
+
+    def generate(self, prompt: str) -> str:
+        return self.model_instance.generate_content(prompt).text
+
+class StubBackend(BaseLLMBackend):
+    """
+    本地确定性假后端
+
+    响应内容只由提示词决定：批量提示词（"### job_id:"分隔的多个职位）返回JSON数组，
+    其他提示词返回包含summary和skills的JSON对象。是否限流或出错由随机种子、
+    提示词和该提示词的第几次调用共同决定，与线程调度无关，因此重试行为可以复现。
+    """
+
+    model_name = "stub"
+
+    def __init__(self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0,
+                 rate_limit_rate: float = 0.0, max_concurrency: Optional[int] = None,
+                 seed: int = 42, vocabulary: Optional[List[str]] = None):
+        """
+        初始化假后端
+
+        Args:
+            latency: 每次调用的基础延迟（秒）
+            jitter: 在基础延迟上增加的随机延迟上限（秒）
+            error_rate: 返回服务端错误的概率
+            rate_limit_rate: 返回限流（429）的概率
+            max_concurrency: 同时处理的最大请求数，超出时返回限流，如果为None则不限制
+            seed: 随机种子
+            vocabulary: 技能词表，响应中的技能为文本中出现的词表项；
+                如果为None则取文本中出现次数最多的单词
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.max_concurrency = max_concurrency
+        self.seed = seed
+        self.vocabulary = [term.lower() for term in vocabulary] if vocabulary else None
+
+        self._lock = threading.Lock()
+        # 提示词摘要 -> 已调用次数
+        self._attempts: Dict[str, int] = {}
+        self._active = 0
+        self.stats = {"calls": 0, "ok": 0, "errors": 0, "rate_limited": 0}
+
+    def _analyze(self, text: str) -> Dict[str, Any]:
+        """
+        生成单个职位的分析结果
+        """
+        lowered = text.lower()
+        if self.vocabulary is not None:
+            skills = [term for term in self.vocabulary if term in lowered]
+        else:
+            counts = Counter(re.findall(r"[a-z][a-z+#.]{2,}", lowered))
+            skills = [word for word, _ in sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:10]]
+        return {"summary": text.strip()[:80], "skills": skills}
+
+    def respond(self, prompt: str) -> str:
+        """
+        生成提示词对应的响应文本（不模拟延迟和错误）
+
+        Args:
+            prompt: 提示词
+
+        Returns:
+            str: JSON格式的响应文本
+        """
+        blocks = re.split(r"^### job_id: (.+)$", prompt, flags=re.MULTILINE)
+        if len(blocks) > 1:
+            results = [{"job_id": job_id.strip(), **self._analyze(body)}
+                       for job_id, body in zip(blocks[1::2], blocks[2::2])]
+            return json.dumps(results, ensure_ascii=False)
+        return json.dumps(self._analyze(prompt), ensure_ascii=False)
+
+    def generate(self, prompt: str) -> str:
+        digest = hashlib.sha1(prompt.encode("utf-8")).hexdigest()
+        with self._lock:
+            attempt = self._attempts[digest] = self._attempts.get(digest, 0) + 1
+            rng = random.Random(f"{self.seed}:{digest}:{attempt}")
+            roll = rng.random()
+            self.stats["calls"] += 1
+            # 限流在处理前立即返回
+            overloaded = self.max_concurrency is not None and self._active >= self.max_concurrency
+            limited = overloaded or roll < self.rate_limit_rate
+            if limited:
+                self.stats["rate_limited"] += 1
+            else:
+                self._active += 1
+
+        if limited:
+            raise RateLimitError("模拟限流: 429 Resource exhausted", retry_after=self.latency or None)
+
+        try:
+            delay = self.latency + (rng.uniform(0, self.jitter) if self.jitter else 0.0)
+            if delay > 0:
+                time.sleep(delay)
+        finally:
+            with self._lock:
+                self._active -= 1
+
+        if roll < self.rate_limit_rate + self.error_rate:
+            with self._lock:
+                self.stats["errors"] += 1
+            raise LLMBackendError("模拟服务端错误: 500 Internal error")
+
+        with self._lock:
+            self.stats["ok"] += 1
+        return self.respond(prompt)
+
+class HTTPBackend(BaseLLMBackend):
+    """
+    HTTP后端，调用本地假服务（或兼容接口的代理服务）
+
+    请求: POST {url}/v1/generate，JSON {"prompt": "..."}
+    响应: JSON {"text": "..."}；429表示限流，可带Retry-After头
+    """
+
+    def __init__(self, url: str, timeout: float = 60.0):
+        """
+        初始化HTTP后端
+
+        Args:
+            url: 服务地址，例如http://127.0.0.1:8765
+            timeout: 请求超时（秒）
+        """
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.model_name = f"http:{self.url}"
+        # requests.Session不保证线程安全，每个线程使用独立的会话
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = self._local.session = requests.Session()
+        return session
+
+    def generate(self, prompt: str) -> str:
+        try:
+            response = self._session().post(f"{self.url}/v1/generate", json={"prompt": prompt},
+                                            timeout=self.timeout)
+        except requests.RequestException as e:
+            raise LLMBackendError(f"请求LLM服务失败: {str(e)}") from e
+
+        if response.status_code == 429:
+            raise RateLimitError(f"LLM服务限流: {response.text}",
+                                 retry_after=parse_retry_after(response.headers.get("Retry-After")))
+        if response.status_code != 200:
+            raise LLMBackendError(f"LLM服务返回{response.status_code}: {response.text}")
+        return response.json()["text"]
+
+# 后端类型 -> 后端类
+LLM_BACKENDS = {
+    "gemini": GeminiBackend,
+    "stub": StubBackend,
+    "http": HTTPBackend
+}
+
+def get_backend(backend_config: Optional[Dict[str, Any]] = None, api_key: Optional[str] = None,
+                model: str = "", generation_config: Optional[Dict[str, Any]] = None) -> BaseLLMBackend:
+    """
+    按配置创建LLM后端
+
+    Args:
+        backend_config: 后端配置（GEMINI_CONFIG["backend"]），type为gemini、stub或http，
+            stub的其他键对应StubBackend的参数，http使用url和timeout；如果为None则使用Gemini
+        api_key: Gemini API密钥
+        model: Gemini模型名称
+        generation_config: Gemini生成配置
+
+    Returns:
+        BaseLLMBackend: 后端实例
+    """
+    backend_config = backend_config or {}
+    backend_type = backend_config.get("type", "gemini")
+    if backend_type not in LLM_BACKENDS:
+        raise ValueError(f"不支持的LLM后端: {backend_type}")
+
+    if backend_type == "stub":
+        return StubBackend(
+            latency=backend_config.get("latency", 0.0),
+            jitter=backend_config.get("jitter", 0.0),
+            error_rate=backend_config.get("error_rate", 0.0),
+            rate_limit_rate=backend_config.get("rate_limit_rate", 0.0),
+            max_concurrency=backend_config.get("max_concurrency"),
+            seed=backend_config.get("seed", 42)
+        )
+    if backend_type == "http":
+        return HTTPBackend(backend_config.get("url", "http://127.0.0.1:8765"),
+                           timeout=backend_config.get("timeout", 60.0))
+    return GeminiBackend(api_key, model, generation_config)
+
+class _StubRequestHandler(BaseHTTPRequestHandler):
+    """
+    假服务的请求处理器，把请求转发给服务器的StubBackend
+    """
+
+    def _send_json(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send_json(200, {"status": "ok"})
+        elif self.path == "/stats":
+            self._send_json(200, self.server.backend.stats)
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/v1/generate":
+            self._send_json(404, {"error": "not found"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            prompt = json.loads(self.rfile.read(length).decode("utf-8"))["prompt"]
+        except Exception as e:
+            self._send_json(400, {"error": f"无效的请求: {str(e)}"})
+            return
+
+        try:
+            self._send_json(200, {"text": self.server.backend.generate(prompt)})
+        except RateLimitError as e:
+            headers = {"Retry-After": f"{e.retry_after:g}"} if e.retry_after else None
+            self._send_json(429, {"error": str(e)}, headers)
+        except LLMBackendError as e:
+            self._send_json(500, {"error": str(e)})
+
+    def log_message(self, format, *args):
+        logger.debug(f"{self.address_string()} {format % args}")
+
+class StubServer:
+    """
+    本地HTTP假服务，每个请求在独立线程中处理
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, backend: Optional[StubBackend] = None):
+        """
+        初始化假服务
+
+        Args:
+            host: 监听地址
+            port: 监听端口，为0时自动分配
+            backend: 处理请求的假后端，如果为None则使用默认参数的StubBackend
+        """
+        self.httpd = ThreadingHTTPServer((host, port), _StubRequestHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.backend = backend or StubBackend()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        """
+        服务地址
+        """
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "StubServer":
+        """
+        在后台线程中启动服务
+
+        Returns:
+            StubServer: 服务自身，便于链式调用
+        """
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="llm-stub-server", daemon=True)
+        self._thread.start()
+        logger.info(f"LLM假服务已启动: {self.url}")
+        return self
+
+    def stop(self) -> None:
+        """
+        停止服务
+        """
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        logger.info("LLM假服务已停止")
+
+def main():
+    parser = argparse.ArgumentParser(description="本地LLM假服务")
+    parser.add_argument("--host", type=str, default="127.0.0.1", help="监听地址")
+    parser.add_argument("--port", type=int, default=8765, help="监听端口")
+    parser.add_argument("--latency", type=float, default=0.0, help="每次调用的基础延迟（秒）")
+    parser.add_argument("--jitter", type=float, default=0.0, help="随机延迟上限（秒）")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="返回500的概率")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="返回429的概率")
+    parser.add_argument("--max-concurrency", type=int, help="同时处理的最大请求数，超出时返回429")
+    parser.add_argument("--seed", type=int, default=42, help="随机种子")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+    backend = StubBackend(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                          rate_limit_rate=args.rate_limit_rate, max_concurrency=args.max_concurrency,
+                          seed=args.seed)
+    server = StubServer(args.host, args.port, backend)
+    logger.info(f"LLM假服务监听 {server.url}，在配置中设置 GEMINI_CONFIG['backend'] = "
+                f"{{'type': 'http', 'url': '{server.url}'}} 即可使用")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+LLM结果缓存模块
+
+该模块提供基于SQLite的LLM抽取结果持久化缓存，以模型、生成配置、提示词版本和
+职位描述的哈希作为键（与单职位或多职位批量提示无关），避免对未变化的职位重复调用API。
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import Dict, Any, Optional
+
+# 导入配置
+import sys
+
+# 获取项目根目录
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+# 将项目根目录添加到系统路径
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.utils.helpers import md5_hash
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+# 默认缓存路径
+DEFAULT_CACHE_PATH = os.path.join(project_root, "data", "cache", "llm_cache.sqlite")
+
+class LLMResultCache:
+    """LLM抽取结果缓存类，支持命中统计和按大小淘汰"""
+
+    def __init__(self, cache_path: Optional[str] = None, max_size_mb: float = 512):
+        """
+        初始化缓存
+
+        Args:
+            cache_path: SQLite文件路径，如果为None则使用默认路径
+            max_size_mb: 缓存最大容量（MB），超过后按最近访问时间淘汰
+        """
+        self.cache_path = cache_path or DEFAULT_CACHE_PATH
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+
+        # 允许线程池中的多个线程共享连接，由锁保证串行访问
+        self._conn = sqlite3.connect(self.cache_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS llm_results (
+                cache_key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed_at ON llm_results (accessed_at)")
+        self._conn.commit()
+
+        logger.info(f"LLM结果缓存初始化完成: {self.cache_path}")
+
+    @staticmethod
+    def make_key(model: str, generation_config: Dict[str, Any], prompt_version: str,
+                 job_description: str) -> str:
+        """
+        构建缓存键（不包含具体的提示词文本，单职位和批量提示的结果可以互相复用）
+
+        Args:
+            model: 模型名称
+            generation_config: 生成配置
+            prompt_version: 提示词版本，提示词模板变化时应随之变化
+            job_description: 职位描述
+
+        Returns:
+            str: 缓存键
+        """
+        payload = json.dumps({
+            "model": model,
+            "generation_config": generation_config,
+            "prompt_version": prompt_version,
+            "job_description": job_description
+        }, sort_keys=True, ensure_ascii=False)
+        return md5_hash(payload)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        读取缓存
+
+        Args:
+            key: 缓存键
+
+        Returns:
+            Optional[Dict[str, Any]]: 缓存的结果，未命中时返回None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM llm_results WHERE cache_key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            self.hits += 1
+            self._conn.execute(
+                "UPDATE llm_results SET accessed_at = ? WHERE cache_key = ?", (time.time(), key)
+            )
+            self._conn.commit()
+
+        return json.loads(row[0])
+
+    def set(self, key: str, value: Dict[str, Any]) -> None:
+        """
+        写入缓存，写入后如超过容量则淘汰最久未访问的条目
+
+        Args:
+            key: 缓存键
+            value: 要缓存的结果
+        """
+        data = json.dumps(value, ensure_ascii=False)
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_results (cache_key, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, data, len(data.encode("utf-8")), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """
+        按最近访问时间淘汰条目，直到总大小不超过上限（调用方需持有锁）
+        """
+        total_size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_results").fetchone()[0]
+        if total_size <= self.max_size_bytes:
+            return
+
+        removed = 0
+        for key, size in self._conn.execute(
+            "SELECT cache_key, size FROM llm_results ORDER BY accessed_at ASC"
+        ).fetchall():
+            if total_size <= self.max_size_bytes:
+                break
+            self._conn.execute("DELETE FROM llm_results WHERE cache_key = ?", (key,))
+            total_size -= size
+            removed += 1
+
+        logger.info(f"LLM结果缓存超过容量，淘汰了{removed}条记录")
+
+    def clear(self) -> None:
+        """
+        清空缓存
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_results")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取缓存统计信息
+
+        Returns:
+            Dict[str, Any]: 命中数、未命中数、命中率、条目数和总大小
+        """
+        with self._lock:
+            entries, total_size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_results"
+            ).fetchone()
+
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "entries": entries,
+            "size_bytes": total_size
+        }
+
+    def close(self) -> None:
+        """
+        关闭数据库连接
+        """
+        with self._lock:
+            self._conn.close()
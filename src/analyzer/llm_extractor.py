@@ -12,10 +12,11 @@ import os
 import json
 import logging
 import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import List, Dict, Any, Optional, Union, Tuple
 
-import google.generativeai as genai
 from tenacity import retry, stop_after_attempt, wait_exponential
+from tenacity.wait import wait_base
 from pydantic import BaseModel, Field, ValidationError
 
 # 导入配置
@@ -29,6 +30,11 @@ if project_root not in sys.path:
     sys.path.append(project_root)
 
 from config import GEMINI_CONFIG, PROMPT_TEMPLATES
+from src.utils.helpers import count_tokens, md5_hash
+from src.utils.rate_limiter import TokenBucketRateLimiter
+from src.analyzer.llm_cache import LLMResultCache
+from src.analyzer.llm_backends import BaseLLMBackend, ModelInstanceBackend, RateLimitError, get_backend
+from src.utils.metrics import metrics
 
 # 从PROMPT_TEMPLATES获取提示词模板
 JOB_SUMMARY_PROMPT_TEMPLATE = PROMPT_TEMPLATES["job_summary"]
@@ -48,6 +54,24 @@ SKILL_EXTRACTION_PROMPT_TEMPLATE = PROMPT_TEMPLATES.get("skill_extraction", """
 - 技能应该按照在职位描述中的重要性排序
 - 不要输出任何解释或额外文本，只输出JSON数组
 """)
+# 多职位批量提示词模板，{jobs_block}为按job_id分隔的多个职位描述
+BATCH_JOB_SUMMARY_PROMPT_TEMPLATE = PROMPT_TEMPLATES.get("batch_job_summary", """
+你是一位专业的职位分析专家。下面给出多个LinkedIn职位描述，每个职位以"### job_id: <ID>"开头。
+请分别为每个职位生成简短摘要并提取所需的技术技能和软技能。
+
+{jobs_block}
+
+请以JSON数组格式输出，每个职位一个对象，job_id必须与输入完全一致：
+[{{"job_id": "<ID>", "summary": "职位摘要", "skills": ["技能1", "技能2", ...]}}, ...]
+
+注意：
+- 每个输入职位都必须在输出中出现且只出现一次
+- 技能列表应该只包含关键词，每个技能应该是1-3个单词的简短表述
+- 不要输出任何解释或额外文本，只输出JSON数组
+""")
+# 提示词版本（参与缓存键计算）：修改任一提示词模板后旧的缓存结果自动失效，
+# 单职位和批量提示使用同一版本，结果仍可互相复用
+PROMPT_VERSION = md5_hash(JOB_SUMMARY_PROMPT_TEMPLATE + BATCH_JOB_SUMMARY_PROMPT_TEMPLATE)
 
 # 设置日志
 logger = logging.getLogger(__name__)
@@ -58,15 +82,41 @@ class JobAnalysisResult(BaseModel):
     summary: str = Field(..., description="职位摘要")
     skills: List[str] = Field(..., description="技能列表")
 
+class wait_retry_after(wait_base):
+    """
+    tenacity等待策略：限流异常带有retry_after（服务端Retry-After）时按其等待，
+    否则使用后备等待策略
+    """
+    
+    def __init__(self, fallback: wait_base):
+        """
+        初始化等待策略
+        
+        Args:
+            fallback: 没有retry_after时使用的等待策略
+        """
+        self.fallback = fallback
+    
+    def __call__(self, retry_state: Any) -> float:
+        exception = retry_state.outcome.exception() if retry_state.outcome else None
+        if isinstance(exception, RateLimitError) and exception.retry_after is not None:
+            return exception.retry_after
+        return self.fallback(retry_state)
+
 class GeminiExtractor:
     """Gemini提取器类，用于调用Gemini API进行职位摘要和技能提取"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, model_instance: Optional[Any] = None,
+                 use_cache: Optional[bool] = None, backend: Optional[BaseLLMBackend] = None):
         """
         初始化Gemini提取器
         
         Args:
             api_key: Gemini API密钥，如果为None则使用配置文件中的密钥
+            model_instance: 自定义模型实例（需实现generate_content方法），
+                用于本地假模型测试，如果为None则创建Gemini模型
+            use_cache: 是否使用LLM结果缓存，如果为None则使用配置值；为False时绕过缓存
+            backend: LLM后端，优先于model_instance；如果都为None则按GEMINI_CONFIG["backend"]创建
         """
         self.api_key = api_key or GEMINI_CONFIG["api_key"]
         self.model = GEMINI_CONFIG["model"]
@@ -75,25 +125,60 @@ class GeminiExtractor:
         self.top_p = GEMINI_CONFIG["top_p"]
         self.top_k = GEMINI_CONFIG["top_k"]
         
-        # 初始化Gemini API
-        genai.configure(api_key=self.api_key)
-        
-        # 获取模型
-        self.model_instance = genai.GenerativeModel(
-            model_name=self.model,
-            generation_config={
-                "temperature": self.temperature,
-                "max_output_tokens": self.max_output_tokens,
-                "top_p": self.top_p,
-                "top_k": self.top_k
-            }
+        # 并发与限流配置
+        concurrency_config = GEMINI_CONFIG.get("concurrency", {})
+        self.max_workers = concurrency_config.get("max_workers", 1)
+        self.rate_limiter = TokenBucketRateLimiter(
+            requests_per_minute=concurrency_config.get("requests_per_minute", 60),
+            tokens_per_minute=concurrency_config.get("tokens_per_minute")
         )
         
-        logger.info(f"Gemini提取器初始化完成，使用模型: {self.model}")
+        # 生成配置（同时参与缓存键计算）
+        self.generation_config = {
+            "temperature": self.temperature,
+            "max_output_tokens": self.max_output_tokens,
+            "top_p": self.top_p,
+            "top_k": self.top_k
+        }
+        
+        self.prompt_version = PROMPT_VERSION
+        
+        # LLM结果缓存
+        cache_config = GEMINI_CONFIG.get("cache", {})
+        use_cache = use_cache if use_cache is not None else cache_config.get("enabled", True)
+        self.cache = None
+        if use_cache:
+            try:
+                self.cache = LLMResultCache(
+                    cache_path=cache_config.get("path"),
+                    max_size_mb=cache_config.get("max_size_mb", 512)
+                )
+            except Exception as e:
+                logger.error(f"初始化LLM结果缓存时出错，将不使用缓存: {str(e)}")
+        
+        # 多职位批量提示配置
+        batching_config = GEMINI_CONFIG.get("batching", {})
+        self.batch_mode = batching_config.get("enabled", False)
+        self.max_jobs_per_prompt = batching_config.get("max_jobs_per_prompt", 10)
+        self.max_prompt_tokens = batching_config.get("max_prompt_tokens", 8000)
+        self.output_tokens_per_job = batching_config.get("output_tokens_per_job", 300)
+        
+        if backend is not None:
+            self.backend = backend
+        elif model_instance is not None:
+            # 使用注入的模型实例（例如本地假模型）
+            self.backend = ModelInstanceBackend(model_instance, self.model)
+        else:
+            self.backend = get_backend(GEMINI_CONFIG.get("backend"), self.api_key, self.model,
+                                       self.generation_config)
+        # 缓存键使用后端的模型名称，假后端的结果不会被当作Gemini的结果复用
+        self.model = self.backend.model_name or self.model
+        
+        logger.info(f"Gemini提取器初始化完成，使用模型: {self.model}（后端: {type(self.backend).__name__}）")
     
     @retry(stop=stop_after_attempt(GEMINI_CONFIG["retry_config"]["max_retries"]), 
-           wait=wait_exponential(multiplier=1, min=GEMINI_CONFIG["retry_config"]["min_seconds"], 
-                                max=GEMINI_CONFIG["retry_config"]["max_seconds"]))
+           wait=wait_retry_after(wait_exponential(multiplier=1, min=GEMINI_CONFIG["retry_config"]["min_seconds"], 
+                                                  max=GEMINI_CONFIG["retry_config"]["max_seconds"])))
     def _call_gemini_api(self, prompt: str) -> str:
         """
         调用Gemini API
@@ -105,9 +190,23 @@ class GeminiExtractor:
             str: API返回的文本
         """
         try:
-            response = self.model_instance.generate_content(prompt)
-            return response.text
+            # 等待限流器放行（每次重试同样计入限流）
+            prompt_tokens = count_tokens(prompt)
+            self.rate_limiter.acquire(prompt_tokens)
+            
+            start_time = time.perf_counter()
+            response_text = self.backend.generate(prompt)
+            metrics.observe("llm_request_seconds", time.perf_counter() - start_time)
+            metrics.inc("llm_requests_total", status="ok")
+            metrics.inc("llm_tokens_total", prompt_tokens, kind="prompt")
+            metrics.inc("llm_tokens_total", count_tokens(response_text), kind="output")
+            return response_text
+        except RateLimitError as e:
+            metrics.inc("llm_requests_total", status="rate_limited")
+            logger.warning(f"Gemini API限流，稍后重试: {str(e)}")
+            raise
         except Exception as e:
+            metrics.inc("llm_requests_total", status="error")
             logger.error(f"调用Gemini API时出错: {str(e)}")
             raise
     
@@ -140,6 +239,36 @@ class GeminiExtractor:
                 logger.error(f"解析JSON响应时出错: {str(e)}")
                 raise ValueError(f"无法解析响应为JSON: {response_text}")
     
+    def _parse_json_array_response(self, response_text: str) -> List[Dict[str, Any]]:
+        """
+        解析JSON数组响应
+        
+        Args:
+            response_text: API返回的文本
+        
+        Returns:
+            List[Dict[str, Any]]: 解析后的对象列表
+        """
+        try:
+            parsed = json.loads(response_text)
+        except json.JSONDecodeError:
+            # 如果直接解析失败，尝试提取JSON数组部分
+            start_idx = response_text.find('[')
+            end_idx = response_text.rfind(']')
+            
+            if start_idx == -1 or end_idx == -1 or end_idx <= start_idx:
+                raise ValueError("无法在响应中找到有效的JSON数组")
+            parsed = json.loads(response_text[start_idx:end_idx+1])
+        
+        # 兼容 {"results": [...]} 形式的包装
+        if isinstance(parsed, dict):
+            parsed = parsed.get("results", parsed.get("jobs", []))
+        
+        if not isinstance(parsed, list):
+            raise ValueError("响应不是JSON数组")
+        
+        return [item for item in parsed if isinstance(item, dict)]
+    
     def analyze_job(self, job_description: str) -> JobAnalysisResult:
         """
         分析职位描述
@@ -151,6 +280,15 @@ class GeminiExtractor:
             JobAnalysisResult: 职位分析结果
         """
         try:
+            # 查询缓存
+            cache_key = None
+            if self.cache:
+                cache_key = LLMResultCache.make_key(self.model, self.generation_config,
+                                                   self.prompt_version, job_description)
+                cached = self.cache.get(cache_key)
+                if cached is not None:
+                    return JobAnalysisResult(**cached)
+            
             # 构建提示词
             prompt = JOB_SUMMARY_PROMPT_TEMPLATE.format(job_description=job_description)
             
@@ -166,51 +304,240 @@ class GeminiExtractor:
                 skills=result_dict.get("skills", [])
             )
             
+            # 写入缓存
+            self._cache_result(cache_key, result)
+            
             return result
             
         except Exception as e:
             logger.error(f"分析职位描述时出错: {str(e)}")
-            # 返回空结果
+            # 返回空结果（不写入缓存）
             return JobAnalysisResult(summary="", skills=[])
     
-    def batch_analyze_jobs(self, jobs: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def _cache_result(self, cache_key: Optional[str], result: JobAnalysisResult) -> None:
+        """
+        写入缓存
+        
+        只在API调用成功且响应通过校验后调用，摘要或技能为空的有效回答同样缓存；
+        调用失败、解析失败时返回的空结果不经过这里，下次运行时重新调用API。
+        
+        Args:
+            cache_key: 缓存键
+            result: 职位分析结果
+        """
+        if not self.cache or cache_key is None:
+            return
+        self.cache.set(cache_key, result.model_dump())
+    
+    def _build_batches(self, jobs: List[Dict[str, Any]], indices: List[int]) -> List[List[int]]:
+        """
+        按token预算将职位打包为多个批次
+        
+        每个批次的提示词token数不超过max_prompt_tokens，职位数不超过max_jobs_per_prompt，
+        且预计输出不超过max_output_tokens；同一批次内job_id不重复。
+        
+        Args:
+            jobs: 职位列表
+            indices: 待分析职位的下标
+        
+        Returns:
+            List[List[int]]: 批次列表，每个批次为职位下标列表
+        """
+        max_jobs = self.max_jobs_per_prompt
+        if self.output_tokens_per_job > 0:
+            max_jobs = min(max_jobs, max(1, self.max_output_tokens // self.output_tokens_per_job))
+        
+        overhead = count_tokens(BATCH_JOB_SUMMARY_PROMPT_TEMPLATE.format(jobs_block=""))
+        
+        batches = []
+        current, current_ids, current_tokens = [], set(), overhead
+        for i in indices:
+            job_id = str(jobs[i].get("job_id", f"job_{i}"))
+            job_tokens = count_tokens(self._format_job_block(job_id, jobs[i]["job_description"]))
+            
+            if current and (len(current) >= max_jobs
+                            or current_tokens + job_tokens > self.max_prompt_tokens
+                            or job_id in current_ids):
+                batches.append(current)
+                current, current_ids, current_tokens = [], set(), overhead
+            
+            current.append(i)
+            current_ids.add(job_id)
+            current_tokens += job_tokens
+        
+        if current:
+            batches.append(current)
+        
+        return batches
+    
+    @staticmethod
+    def _format_job_block(job_id: str, job_description: str) -> str:
+        """
+        格式化批量提示词中的单个职位
+        
+        Args:
+            job_id: 职位ID
+            job_description: 职位描述
+        
+        Returns:
+            str: 格式化后的文本
+        """
+        return f"### job_id: {job_id}\n{job_description}\n"
+    
+    def analyze_job_batch(self, batch: List[Tuple[str, str]]) -> Dict[str, JobAnalysisResult]:
+        """
+        在一次请求中分析多个职位
+        
+        响应中缺失或无效的职位会回退为单职位调用。
+        
+        Args:
+            batch: (job_id, job_description)列表，job_id在批次内唯一
+        
+        Returns:
+            Dict[str, JobAnalysisResult]: job_id到分析结果的映射
+        """
+        results = {}
+        cache_keys = {}
+        
+        # 查询缓存
+        pending = []
+        for job_id, job_description in batch:
+            if self.cache:
+                cache_keys[job_id] = LLMResultCache.make_key(self.model, self.generation_config,
+                                                                self.prompt_version, job_description)
+                cached = self.cache.get(cache_keys[job_id])
+                if cached is not None:
+                    results[job_id] = JobAnalysisResult(**cached)
+                    continue
+            pending.append((job_id, job_description))
+        
+        if len(pending) > 1:
+            try:
+                # 构建提示词
+                jobs_block = "\n".join(self._format_job_block(job_id, desc) for job_id, desc in pending)
+                prompt = BATCH_JOB_SUMMARY_PROMPT_TEMPLATE.format(jobs_block=jobs_block)
+                
+                # 调用API并解析
+                response_text = self._call_gemini_api(prompt)
+                pending_ids = {job_id for job_id, _ in pending}
+                for item in self._parse_json_array_response(response_text):
+                    job_id = str(item.get("job_id", ""))
+                    if job_id not in pending_ids or job_id in results:
+                        continue
+                    try:
+                        results[job_id] = JobAnalysisResult(
+                            summary=item.get("summary", ""),
+                            skills=item.get("skills", [])
+                        )
+                    except ValidationError as e:
+                        logger.warning(f"批量结果中职位 {job_id} 无效: {str(e)}")
+                        continue
+                    
+                    self._cache_result(cache_keys.get(job_id), results[job_id])
+                
+            except Exception as e:
+                logger.error(f"批量分析{len(pending)}个职位时出错，回退为单职位调用: {str(e)}")
+        
+        # 缺失的职位回退为单职位调用
+        missing = [(job_id, desc) for job_id, desc in pending if job_id not in results]
+        if missing and len(pending) > 1:
+            logger.warning(f"批量响应缺少{len(missing)}/{len(pending)}个职位，回退为单职位调用")
+        for job_id, job_description in missing:
+            results[job_id] = self.analyze_job(job_description)
+        
+        return results
+    
+    def batch_analyze_jobs(self, jobs: List[Dict[str, Any]], 
+                          max_workers: Optional[int] = None,
+                          batch_mode: Optional[bool] = None) -> List[Dict[str, Any]]:
         """
         批量分析职位
         
+        请求速率由令牌桶限流器控制；max_workers大于1时使用线程池并发调用API，
+        结果按输入顺序写回，单个职位出错不影响其他职位。
+        batch_mode为True时，多个职位按token预算打包到同一提示词中。
+        
         Args:
             jobs: 职位列表
+            max_workers: 最大并发数，如果为None则使用配置值
+            batch_mode: 是否使用多职位批量提示，如果为None则使用配置值
         
         Returns:
             List[Dict[str, Any]]: 更新后的职位列表
         """
         try:
+            max_workers = max_workers if max_workers is not None else self.max_workers
+            batch_mode = batch_mode if batch_mode is not None else self.batch_mode
             total_jobs = len(jobs)
-            logger.info(f"开始批量分析{total_jobs}个职位")
+            logger.info(f"开始批量分析{total_jobs}个职位，并发数: {max_workers}，批量提示: {batch_mode}")
             
+            # 筛选有描述的职位
+            pending = []
             for i, job in enumerate(jobs):
                 job_id = job.get("job_id", f"job_{i}")
-                job_description = job.get("job_description", "")
-                
-                if not job_description:
+                if not job.get("job_description", ""):
                     logger.warning(f"职位 {job_id} 没有描述，跳过分析")
                     continue
+                pending.append(i)
+            
+            # 划分任务，每个任务为一组职位下标
+            if batch_mode:
+                tasks = self._build_batches(jobs, pending)
+                logger.info(f"{len(pending)}个职位打包为{len(tasks)}个请求")
+            else:
+                tasks = [[i] for i in pending]
+            
+            def run_task(indices: List[int]) -> Dict[int, JobAnalysisResult]:
+                if len(indices) == 1:
+                    i = indices[0]
+                    return {i: self.analyze_job(jobs[i]["job_description"])}
                 
-                logger.info(f"分析职位 {job_id} ({i+1}/{total_jobs})")
-                
-                # 分析职位
-                result = self.analyze_job(job_description)
-                
-                # 更新职位数据
-                job["summary"] = result.summary
-                job["skills"] = result.skills
-                
-                # 添加延迟以避免API限制
-                if i < total_jobs - 1:  # 不在最后一个请求后延迟
-                    time.sleep(1)  # 1秒延迟
+                id_to_index = {str(jobs[i].get("job_id", f"job_{i}")): i for i in indices}
+                batch_results = self.analyze_job_batch(
+                    [(job_id, jobs[i]["job_description"]) for job_id, i in id_to_index.items()]
+                )
+                return {id_to_index[job_id]: result for job_id, result in batch_results.items()}
+            
+            done = 0
+            if max_workers <= 1:
+                for indices in tasks:
+                    for i, result in run_task(indices).items():
+                        self._apply_result(jobs[i], result)
+                    done += len(indices)
+                    logger.info(f"已分析 {done}/{len(pending)} 个职位")
+            else:
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    futures = {executor.submit(run_task, indices): indices for indices in tasks}
+                    
+                    for future in as_completed(futures):
+                        indices = futures[future]
+                        try:
+                            task_results = future.result()
+                        except Exception as e:
+                            logger.error(f"分析职位 {[jobs[i].get('job_id', f'job_{i}') for i in indices]} 时出错: {str(e)}")
+                            task_results = {i: JobAnalysisResult(summary="", skills=[]) for i in indices}
+                        
+                        for i, result in task_results.items():
+                            self._apply_result(jobs[i], result)
+                        done += len(indices)
+                        logger.info(f"已分析 {done}/{len(pending)} 个职位")
             
             logger.info(f"批量分析完成，处理了{total_jobs}个职位")
+            if self.cache:
+                logger.info(f"LLM结果缓存统计: {self.cache.stats()}")
             return jobs
             
         except Exception as e:
             logger.error(f"批量分析职位时出错: {str(e)}")
-            return jobs
\ No newline at end of file
+            return jobs
+    
+    def _apply_result(self, job: Dict[str, Any], result: JobAnalysisResult) -> None:
+        """
+        将分析结果写回职位数据
+        
+        Args:
+            job: 职位数据
+            result: 职位分析结果
+        """
+        job["summary"] = result.summary
+        job["skills"] = result.skills
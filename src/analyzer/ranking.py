@@ -0,0 +1,74 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+关键词排序模块
+
+该模块直接在NumPy词频向量上选取前N个关键词（argpartition），
+避免为整个词表构建Python字典再排序。排序规则与原实现一致：
+按频率降序，频率相同时按特征索引（即词语字母序）升序。
+"""
+
+from typing import Optional
+
+import numpy as np
+
+def top_n_indices(scores: np.ndarray, top_n: int) -> np.ndarray:
+    """
+    选取分数最高的前N个索引
+
+    Args:
+        scores: 分数向量
+        top_n: 返回数量
+
+    Returns:
+        np.ndarray: 索引数组，按分数降序、索引升序排列
+    """
+    scores = np.asarray(scores)
+    size = scores.shape[0]
+    if top_n <= 0 or size == 0:
+        return np.empty(0, dtype=np.intp)
+
+    if top_n >= size:
+        candidates = np.arange(size)
+    else:
+        # 先用argpartition找到第N大的分数，再补齐与其相同分数中索引最小的若干项
+        threshold = scores[np.argpartition(-scores, top_n - 1)[top_n - 1]]
+        above = np.flatnonzero(scores > threshold)
+        ties = np.flatnonzero(scores == threshold)[:top_n - len(above)]
+        candidates = np.sort(np.concatenate([above, ties]))
+
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+def select_top_keywords(counts: np.ndarray, top_n: int,
+                        whitelist_mask: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    选取前N个关键词的特征索引
+
+    有白名单时只保留白名单中的词；白名单中的词不足N个时用其余高频词补足，
+    频率相同时白名单中的词排在前面。
+
+    Args:
+        counts: 词频向量
+        top_n: 返回数量
+        whitelist_mask: 白名单布尔掩码，为None时不过滤
+
+    Returns:
+        np.ndarray: 特征索引数组，按输出顺序排列
+    """
+    counts = np.asarray(counts)
+    if whitelist_mask is None:
+        return top_n_indices(counts, top_n)
+
+    allowed = np.flatnonzero(whitelist_mask)
+    if len(allowed) >= top_n:
+        return allowed[top_n_indices(counts[allowed], top_n)]
+
+    # 白名单中的词不足时，按频率补充其余的词
+    others = np.flatnonzero(~whitelist_mask)
+    fill = others[top_n_indices(counts[others], top_n - len(allowed))]
+
+    selected = np.concatenate([allowed, fill])
+    group = np.concatenate([np.zeros(len(allowed), dtype=np.int8), np.ones(len(fill), dtype=np.int8)])
+    order = np.lexsort((selected, group, -counts[selected]))
+    return selected[order]
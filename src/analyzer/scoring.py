@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+关键词评分模块
+
+该模块基于文档-词语计数矩阵（CSR稀疏矩阵）计算语料级关键词分数，
+所有计算只操作稀疏矩阵的非零元素或按词语的一维向量，不会将矩阵稠密化。
+
+支持的评分方式：
+    count: 总词频
+    tfidf: 每个文档的TF-IDF（L2归一化）在所有文档上求和
+    bm25: 每个文档的BM25词语权重在所有文档上求和
+    log_odds: 相对背景语料的对数几率比（带信息先验的z分数）
+"""
+
+import logging
+from typing import Optional
+
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import TfidfTransformer
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+# 支持的评分方式
+SCORING_METHODS = ["count", "tfidf", "bm25", "log_odds"]
+
+def count_scores(count_matrix: sp.spmatrix) -> np.ndarray:
+    """
+    总词频
+
+    Args:
+        count_matrix: 文档-词语计数矩阵
+
+    Returns:
+        np.ndarray: 每个词语的分数
+    """
+    return np.asarray(count_matrix.sum(axis=0)).ravel().astype(np.float64)
+
+def tfidf_scores(count_matrix: sp.spmatrix) -> np.ndarray:
+    """
+    TF-IDF分数（与TfidfVectorizer默认参数一致）在文档上求和
+
+    Args:
+        count_matrix: 文档-词语计数矩阵
+
+    Returns:
+        np.ndarray: 每个词语的分数
+    """
+    tfidf_matrix = TfidfTransformer().fit_transform(count_matrix)
+    return np.asarray(tfidf_matrix.sum(axis=0)).ravel()
+
+def bm25_scores(count_matrix: sp.spmatrix, k1: float = 1.2, b: float = 0.75) -> np.ndarray:
+    """
+    BM25词语权重在文档上求和
+
+    Args:
+        count_matrix: 文档-词语计数矩阵
+        k1: 词频饱和参数
+        b: 文档长度归一化参数
+
+    Returns:
+        np.ndarray: 每个词语的分数
+    """
+    matrix = sp.csr_matrix(count_matrix, dtype=np.float64, copy=True)
+    n_docs, n_terms = matrix.shape
+    if n_docs == 0 or matrix.nnz == 0:
+        return np.zeros(n_terms)
+
+    doc_lengths = np.asarray(matrix.sum(axis=1)).ravel()
+    avg_length = doc_lengths.mean() or 1.0
+    doc_freqs = np.bincount(matrix.indices, minlength=n_terms)
+    idf = np.log1p((n_docs - doc_freqs + 0.5) / (doc_freqs + 0.5))
+
+    # 逐个非零元素计算饱和词频：tf*(k1+1) / (tf + k1*(1-b+b*dl/avgdl))
+    row_norms = k1 * (1 - b + b * doc_lengths / avg_length)
+    row_of_entry = np.repeat(np.arange(n_docs), np.diff(matrix.indptr))
+    tf = matrix.data
+    matrix.data = tf * (k1 + 1) / (tf + row_norms[row_of_entry])
+
+    return np.asarray(matrix.sum(axis=0)).ravel() * idf
+
+def log_odds_scores(term_counts: np.ndarray, background_counts: np.ndarray,
+                    prior: float = 100.0) -> np.ndarray:
+    """
+    相对背景语料的对数几率比z分数（Monroe等人的信息Dirichlet先验方法）
+
+    Args:
+        term_counts: 当前语料的词频
+        background_counts: 背景语料中相同词语的词频
+        prior: 先验总强度，按两个语料合并后的词语分布分配到每个词语
+
+    Returns:
+        np.ndarray: 每个词语的z分数，越大表示越是当前语料特有
+    """
+    term_counts = np.asarray(term_counts, dtype=np.float64)
+    background_counts = np.asarray(background_counts, dtype=np.float64)
+
+    pooled = term_counts + background_counts
+    alpha = prior * pooled / max(pooled.sum(), 1.0)
+    # 避免未在任何语料中出现的词语导致log(0)
+    alpha = np.maximum(alpha, 1e-6)
+    alpha_total = alpha.sum()
+
+    n_target = term_counts.sum()
+    n_background = background_counts.sum()
+
+    target_odds = np.log(term_counts + alpha) - np.log(n_target + alpha_total - term_counts - alpha)
+    background_odds = np.log(background_counts + alpha) - np.log(n_background + alpha_total - background_counts - alpha)
+    variance = 1.0 / (term_counts + alpha) + 1.0 / (background_counts + alpha)
+
+    return (target_odds - background_odds) / np.sqrt(variance)
+
+def compute_scores(count_matrix: sp.spmatrix, method: str = "count",
+                   k1: float = 1.2, b: float = 0.75,
+                   background_counts: Optional[np.ndarray] = None,
+                   prior: float = 100.0) -> np.ndarray:
+    """
+    按指定方式计算关键词分数
+
+    Args:
+        count_matrix: 文档-词语计数矩阵
+        method: 评分方式，见SCORING_METHODS
+        k1: BM25词频饱和参数
+        b: BM25文档长度归一化参数
+        background_counts: log_odds使用的背景语料词频（与矩阵列对齐）
+        prior: log_odds的先验强度
+
+    Returns:
+        np.ndarray: 每个词语的分数
+    """
+    if method == "tfidf":
+        return tfidf_scores(count_matrix)
+    if method == "bm25":
+        return bm25_scores(count_matrix, k1=k1, b=b)
+    if method == "log_odds":
+        if background_counts is None:
+            logger.warning("未提供背景语料，log_odds评分回退为词频")
+            return count_scores(count_matrix)
+        return log_odds_scores(count_scores(count_matrix), background_counts, prior=prior)
+    if method != "count":
+        logger.warning(f"不支持的评分方式: {method}，使用词频")
+    return count_scores(count_matrix)
@@ -0,0 +1,87 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+分组关键词统计模块
+
+该模块在一次构建的文档-词语计数矩阵上按分组字段（如search_keyword、
+search_location、company）聚合关键词统计：用稀疏的分组指示矩阵
+（分组×文档）与计数矩阵相乘，一次得到所有分组的词频，
+无需对每个子集重新运行分析流程。
+"""
+
+import logging
+from typing import List, Dict, Any, Optional, Tuple, Sequence
+
+import numpy as np
+import scipy.sparse as sp
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+# 默认分组字段
+DEFAULT_SEGMENT_FIELDS = ["search_keyword", "search_location", "company"]
+
+# 分组字段缺失时使用的分组名
+UNKNOWN_SEGMENT = "未知"
+
+def segment_indicator(values: Sequence[Any]) -> Tuple[List[str], sp.csr_matrix]:
+    """
+    构建分组指示矩阵
+
+    Args:
+        values: 每个文档的分组取值
+
+    Returns:
+        Tuple[List[str], sp.csr_matrix]: (分组名列表, 分组×文档的0/1稀疏矩阵)
+    """
+    labels = [str(value) if value not in (None, "") else UNKNOWN_SEGMENT for value in values]
+    segments, inverse = np.unique(np.array(labels, dtype=object), return_inverse=True)
+    n_docs = len(labels)
+    indicator = sp.csr_matrix(
+        (np.ones(n_docs, dtype=np.int64), (inverse.ravel(), np.arange(n_docs))),
+        shape=(len(segments), n_docs)
+    )
+    return [str(segment) for segment in segments], indicator
+
+def build_segment_table(keyword_matrix: sp.spmatrix, values: Sequence[Any], keywords: List[str],
+                        top_segments: Optional[int] = None,
+                        binary_matrix: Optional[sp.spmatrix] = None) -> Dict[str, Any]:
+    """
+    生成分组×关键词统计表
+
+    Args:
+        keyword_matrix: 文档-关键词计数矩阵（只包含表中关键词的列）
+        values: 每个文档的分组取值（与矩阵的行对应）
+        keywords: 与矩阵列对应的关键词
+        top_segments: 只保留职位数最多的前N个分组，如果为None则保留全部
+        binary_matrix: 二值化的keyword_matrix（可在多个分组字段间复用），如果为None则自动计算
+
+    Returns:
+        Dict[str, Any]: 统计表，包含segments、keywords、job_counts、
+            counts（分组×关键词词频）和job_share（分组内提及该关键词的职位比例）
+    """
+    segments, indicator = segment_indicator(values)
+
+    if binary_matrix is None:
+        binary_matrix = (keyword_matrix > 0).astype(np.int64)
+
+    # 一次稀疏矩阵乘法得到所有分组的聚合结果
+    counts = (indicator @ keyword_matrix).toarray()
+    job_mentions = (indicator @ binary_matrix).toarray()
+    job_counts = np.asarray(indicator.sum(axis=1)).ravel()
+
+    # 按职位数降序、分组名升序排列
+    order = np.lexsort((np.arange(len(segments)), -job_counts))
+    if top_segments is not None:
+        order = order[:top_segments]
+
+    job_share = job_mentions[order] / np.maximum(job_counts[order], 1)[:, None]
+
+    return {
+        "segments": [segments[i] for i in order],
+        "keywords": list(keywords),
+        "job_counts": job_counts[order].astype(int).tolist(),
+        "counts": counts[order].astype(int).tolist(),
+        "job_share": np.round(job_share, 4).tolist(),
+    }
@@ -0,0 +1,169 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+增量词频统计模块
+
+该模块维护一个持久化的语料级词频统计（SQLite）：每个词语的总频率、
+文档频率以及已统计的文档数。每天只需对新增职位计数并合并到统计中，
+无需对全部历史数据重新fit_transform；排序时按与CountVectorizer相同的
+规则应用min_df/max_df，结果与全量重算一致。
+"""
+
+import os
+import sqlite3
+import logging
+from pathlib import Path
+from typing import List, Optional, Tuple, Iterable
+
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+
+from .tokenizer import passthrough_analyzer
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+# 默认统计文件路径
+DEFAULT_STATS_PATH = Path(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))) / "data" / "term_stats.sqlite"
+
+class TermStatsStore:
+    """
+    可合并的语料级词频统计存储类
+    """
+
+    def __init__(self, stats_path: Optional[str] = None):
+        """
+        初始化统计存储
+
+        Args:
+            stats_path: SQLite文件路径，如果为None则使用默认路径
+        """
+        self.stats_path = Path(stats_path) if stats_path else DEFAULT_STATS_PATH
+        os.makedirs(self.stats_path.parent, exist_ok=True)
+
+        self._conn = sqlite3.connect(str(self.stats_path))
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS terms (
+                term TEXT PRIMARY KEY,
+                term_count INTEGER NOT NULL,
+                doc_freq INTEGER NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS documents (
+                doc_id TEXT PRIMARY KEY
+            );
+        """)
+        self._conn.commit()
+
+        logger.info(f"增量词频统计初始化完成: {self.stats_path}")
+
+    @property
+    def n_docs(self) -> int:
+        """
+        已统计的文档数
+        """
+        return self._conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def filter_new(self, doc_ids: Iterable[str]) -> List[str]:
+        """
+        过滤出尚未统计的文档ID
+
+        Args:
+            doc_ids: 文档ID列表
+
+        Returns:
+            List[str]: 未统计过的文档ID
+        """
+        new_ids = []
+        seen = set()
+        for doc_id in doc_ids:
+            if doc_id in seen:
+                continue
+            seen.add(doc_id)
+            row = self._conn.execute("SELECT 1 FROM documents WHERE doc_id = ?", (doc_id,)).fetchone()
+            if row is None:
+                new_ids.append(doc_id)
+        return new_ids
+
+    def update(self, analyzed_docs: List[List[str]], doc_ids: List[str]) -> int:
+        """
+        将新文档的词频合并到统计中
+
+        Args:
+            analyzed_docs: 每个文档的n-gram列表（应只包含尚未统计的文档）
+            doc_ids: 与analyzed_docs对应的文档ID
+
+        Returns:
+            int: 新合并的文档数
+        """
+        if not analyzed_docs:
+            return 0
+
+        # 只对新文档计数，不做min_df/max_df过滤（过滤在排序时基于全量统计进行）
+        vectorizer = CountVectorizer(analyzer=passthrough_analyzer)
+        try:
+            count_matrix = vectorizer.fit_transform(analyzed_docs)
+        except ValueError:
+            # 新文档中没有任何词语
+            count_matrix = None
+
+        rows = []
+        if count_matrix is not None:
+            terms = vectorizer.get_feature_names_out()
+            term_counts = np.asarray(count_matrix.sum(axis=0)).ravel()
+            doc_freqs = np.bincount(count_matrix.tocsr().indices, minlength=len(terms))
+            rows = [(str(term), int(count), int(df)) for term, count, df in zip(terms, term_counts, doc_freqs)]
+
+        with self._conn:
+            self._conn.executemany(
+                """INSERT INTO terms (term, term_count, doc_freq) VALUES (?, ?, ?)
+                   ON CONFLICT(term) DO UPDATE SET
+                       term_count = term_count + excluded.term_count,
+                       doc_freq = doc_freq + excluded.doc_freq""",
+                rows
+            )
+            self._conn.executemany("INSERT OR IGNORE INTO documents (doc_id) VALUES (?)",
+                                   [(doc_id,) for doc_id in doc_ids])
+
+        logger.info(f"合并了{len(analyzed_docs)}个新文档的词频，新增或更新{len(rows)}个词语")
+        return len(analyzed_docs)
+
+    def load(self, min_df: float = 1, max_df: float = 1.0) -> Tuple[np.ndarray, np.ndarray, np.ndarray, int]:
+        """
+        读取统计，按与CountVectorizer相同的规则应用文档频率过滤
+
+        Args:
+            min_df: 最小文档频率（整数为文档数，小数为比例）
+            max_df: 最大文档频率（整数为文档数，小数为比例）
+
+        Returns:
+            Tuple: (按字母序排列的词语数组, 总频率数组, 文档频率数组, 文档数)
+        """
+        n_docs = self.n_docs
+        rows = self._conn.execute("SELECT term, term_count, doc_freq FROM terms ORDER BY term").fetchall()
+
+        terms = np.array([row[0] for row in rows], dtype=object)
+        term_counts = np.array([row[1] for row in rows], dtype=np.int64)
+        doc_freqs = np.array([row[2] for row in rows], dtype=np.int64)
+
+        # 与CountVectorizer._limit_features一致的阈值计算
+        max_doc_count = max_df if isinstance(max_df, int) else max_df * n_docs
+        min_doc_count = min_df if isinstance(min_df, int) else min_df * n_docs
+        keep = (doc_freqs >= min_doc_count) & (doc_freqs <= max_doc_count)
+
+        return terms[keep], term_counts[keep], doc_freqs[keep], n_docs
+
+    def reset(self) -> None:
+        """
+        清空统计
+        """
+        with self._conn:
+            self._conn.execute("DELETE FROM terms")
+            self._conn.execute("DELETE FROM documents")
+        logger.info("增量词频统计已清空")
+
+    def close(self) -> None:
+        """
+        关闭数据库连接
+        """
+        self._conn.close()
@@ -0,0 +1,127 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+分词模块
+
+该模块提供单次扫描的职位描述分词器：一次正则匹配完成分词，同时过滤停用词和
+过短的词，并直接生成n-gram供CountVectorizer使用（通过自定义analyzer），
+避免预处理后再由向量化器重新分词。大规模语料可使用进程池并行分词。
+"""
+
+import re
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Iterable, Set, Tuple
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+# 单词模式：与"移除标点后分词"的结果一致
+WORD_PATTERN = re.compile(r'\w+')
+DIGIT_PATTERN = re.compile(r'\d+')
+
+# 进程池工作进程中的分词器
+_worker_tokenizer = None
+
+class DocumentTokenizer:
+    """单次扫描分词器，输出过滤后的词语和n-gram"""
+
+    def __init__(self, stop_words: Set[str], min_word_length: int = 2,
+                 remove_numbers: bool = False, ngram_range: Tuple[int, int] = (1, 1)):
+        """
+        初始化分词器
+
+        Args:
+            stop_words: 停用词集合
+            min_word_length: 最小词长（CountVectorizer默认会丢弃单字符词，因此至少为2）
+            remove_numbers: 是否移除数字
+            ngram_range: n-gram范围
+        """
+        self.stop_words = frozenset(stop_words)
+        self.min_word_length = max(min_word_length, 2)
+        self.remove_numbers = remove_numbers
+        self.ngram_range = tuple(ngram_range)
+
+    def tokenize(self, text: str) -> List[str]:
+        """
+        分词并过滤停用词和过短的词
+
+        Args:
+            text: 原始文本
+
+        Returns:
+            List[str]: 词语列表
+        """
+        if not text:
+            return []
+
+        text = text.lower()
+        if self.remove_numbers:
+            text = DIGIT_PATTERN.sub('', text)
+
+        stop_words = self.stop_words
+        min_len = self.min_word_length
+        return [token for token in WORD_PATTERN.findall(text)
+                if len(token) >= min_len and token not in stop_words]
+
+    def analyze(self, text: str) -> List[str]:
+        """
+        分词并生成n-gram，可直接作为CountVectorizer的analyzer
+
+        Args:
+            text: 原始文本
+
+        Returns:
+            List[str]: n-gram列表
+        """
+        tokens = self.tokenize(text)
+        min_n, max_n = self.ngram_range
+        if max_n == 1:
+            return tokens
+
+        ngrams = list(tokens) if min_n == 1 else []
+        n_tokens = len(tokens)
+        for n in range(max(min_n, 2), max_n + 1):
+            ngrams.extend(' '.join(tokens[i:i + n]) for i in range(n_tokens - n + 1))
+        return ngrams
+
+    def analyze_corpus(self, texts: Iterable[str], n_jobs: int = 1,
+                       chunksize: int = 500) -> List[List[str]]:
+        """
+        对整个语料生成n-gram列表
+
+        Args:
+            texts: 文本列表
+            n_jobs: 并行进程数，<=1时在当前进程中处理
+            chunksize: 每个进程任务包含的文档数
+
+        Returns:
+            List[List[str]]: 每个文档的n-gram列表
+        """
+        texts = list(texts)
+        if n_jobs <= 1 or len(texts) < chunksize * 2:
+            return [self.analyze(text) for text in texts]
+
+        logger.info(f"使用{n_jobs}个进程对{len(texts)}个文档分词")
+        with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(self,)) as executor:
+            return list(executor.map(_analyze_in_worker, texts, chunksize=chunksize))
+
+def _init_worker(tokenizer: DocumentTokenizer) -> None:
+    """
+    进程池初始化函数，每个工作进程只接收一次分词器
+    """
+    global _worker_tokenizer
+    _worker_tokenizer = tokenizer
+
+def _analyze_in_worker(text: str) -> List[str]:
+    """
+    在工作进程中分词
+    """
+    return _worker_tokenizer.analyze(text)
+
+def passthrough_analyzer(tokens: List[str]) -> List[str]:
+    """
+    直接返回已分词的n-gram列表，用于向CountVectorizer传入预先分词的文档
+    """
+    return tokens
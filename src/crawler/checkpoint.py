@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+爬虫断点续爬模块
+
+该模块为每次爬取运行维护一个只追加的检查点日志（JSONL），在每个列表页和
+每个详情页完成后立即写入，崩溃后可通过run_id恢复并跳过已完成的工作。
+"""
+
+import os
+import json
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+# 默认检查点目录
+DEFAULT_CHECKPOINT_DIR = Path(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))) / "data" / "checkpoints"
+
+class CrawlCheckpoint:
+    """
+    爬取检查点日志类
+    """
+
+    def __init__(self, run_id: Optional[str] = None, checkpoint_dir: Optional[str] = None,
+                 resume: bool = False):
+        """
+        初始化检查点日志
+
+        Args:
+            run_id: 运行ID，如果为None则按时间戳生成
+            checkpoint_dir: 检查点目录，如果为None则使用默认目录
+            resume: 是否从已有日志恢复
+        """
+        self.run_id = run_id or f"crawl_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        self.checkpoint_dir = Path(checkpoint_dir) if checkpoint_dir else DEFAULT_CHECKPOINT_DIR
+        self.journal_path = self.checkpoint_dir / f"{self.run_id}.jsonl"
+
+        # (keyword, location, page) -> 该页的职位列表
+        self.listing_pages: Dict[Tuple[str, str, int], List[Dict[str, Any]]] = {}
+        # job_id -> 包含详情的职位数据
+        self.job_details: Dict[str, Dict[str, Any]] = {}
+
+        os.makedirs(self.checkpoint_dir, exist_ok=True)
+
+        if resume:
+            if not self.journal_path.exists():
+                raise FileNotFoundError(f"找不到运行 {self.run_id} 的检查点日志: {self.journal_path}")
+            self._load()
+            logger.info(f"从检查点恢复运行 {self.run_id}: 已完成{len(self.listing_pages)}个列表页，"
+                        f"{len(self.job_details)}个详情页")
+        elif self.journal_path.exists():
+            raise FileExistsError(f"运行 {self.run_id} 的检查点日志已存在，请使用恢复模式: {self.journal_path}")
+        else:
+            logger.info(f"新建爬取运行 {self.run_id}，检查点日志: {self.journal_path}")
+
+    def _load(self) -> None:
+        """
+        重放检查点日志
+        """
+        with open(self.journal_path, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # 崩溃时最后一行可能写入不完整
+                    logger.warning(f"跳过检查点日志第{line_no}行不完整记录")
+                    continue
+
+                if entry.get("type") == "listing_page":
+                    key = (entry["keyword"], entry["location"], entry["page"])
+                    self.listing_pages[key] = entry["jobs"]
+                elif entry.get("type") == "job_detail":
+                    self.job_details[entry["job"]["job_id"]] = entry["job"]
+
+    def _write(self, entry: Dict[str, Any]) -> None:
+        """
+        追加一条记录并刷新到磁盘
+
+        Args:
+            entry: 日志记录
+        """
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False, default=str))
+            f.write("\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def get_listing_page(self, keyword: str, location: str, page: int) -> Optional[List[Dict[str, Any]]]:
+        """
+        获取已完成列表页的职位数据
+
+        Returns:
+            Optional[List[Dict[str, Any]]]: 职位列表，未完成时返回None
+        """
+        return self.listing_pages.get((keyword, location, page))
+
+    def record_listing_page(self, keyword: str, location: str, page: int,
+                            jobs: List[Dict[str, Any]]) -> None:
+        """
+        记录已完成的列表页
+
+        Args:
+            keyword: 搜索关键词
+            location: 搜索地区
+            page: 页码
+            jobs: 该页的职位列表
+        """
+        self.listing_pages[(keyword, location, page)] = jobs
+        self._write({
+            "type": "listing_page",
+            "keyword": keyword,
+            "location": location,
+            "page": page,
+            "jobs": jobs
+        })
+
+    def get_job_detail(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        获取已完成详情页的职位数据
+
+        Returns:
+            Optional[Dict[str, Any]]: 职位数据，未完成时返回None
+        """
+        return self.job_details.get(job_id)
+
+    def record_job_detail(self, job: Dict[str, Any]) -> None:
+        """
+        记录已完成的详情页
+
+        Args:
+            job: 包含详情的职位数据
+        """
+        self.job_details[job["job_id"]] = job
+        self._write({"type": "job_detail", "job": job})
@@ -15,7 +15,7 @@ import random
 import logging
 from datetime import datetime
 from pathlib import Path
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Callable
 
 # Selenium相关
 import undetected_chromedriver as uc
@@ -45,6 +45,11 @@ except (ImportError, KeyError):
 
 # 导入反检测模块
 from .anti_detect import setup_anti_detection
+from .checkpoint import CrawlCheckpoint
+from .seen_jobs import SeenJobsIndex
+from .page_parser import parse_job_listings, parse_job_details, extract_job_id
+from ..utils.metrics import metrics
+from .page_archive import PageArchive
 
 # 设置日志
 logger = logging.getLogger(__name__)
@@ -54,18 +59,53 @@ class LinkedInCrawler:
     LinkedIn职位爬虫类
     """
     
-    def __init__(self, config: Dict[str, Any]):
+    def __init__(self, config: Dict[str, Any], run_id: Optional[str] = None, resume: bool = False):
         """
         初始化LinkedIn爬虫
         
         Args:
             config: 爬虫配置字典，包含搜索参数、爬虫行为控制等
+            run_id: 运行ID，用于检查点日志，如果为None则按时间戳生成
+            resume: 是否从run_id对应的检查点恢复，跳过已完成的列表页和详情页
         """
         self.config = config
         self.driver = None
         self.wait = None
         self.job_data = []
         
+        # 进度回调progress(kind, done, total)及按页面类型（listing/detail）统计的页数，
+        # 跳过的页面（检查点或索引中已完成）同样计为完成
+        self.progress = None
+        self.pages_done = {"listing": 0, "detail": 0}
+        self.pages_total = {"listing": 0, "detail": 0}
+        
+        # 检查点日志
+        self.checkpoint = CrawlCheckpoint(
+            run_id=run_id,
+            checkpoint_dir=self.config['crawler'].get('checkpoint_dir'),
+            resume=resume
+        )
+        self.run_id = self.checkpoint.run_id
+        
+        # 页面解析方式：snapshot为获取一次页面源码后离线解析，webdriver为逐字段调用
+        self.parse_mode = self.config['crawler'].get('parse_mode', 'snapshot')
+        
+        # 原始页面归档（可选），用于之后不重新爬取而回放解析
+        self.page_archive = None
+        if self.config['crawler'].get('archive_pages', False):
+            self.page_archive = PageArchive(
+                archive_dir=self.config['crawler'].get('archive_dir'),
+                run_id=self.run_id
+            )
+        
+        # 跨运行共享的已爬取职位索引
+        self.seen_jobs = None
+        if self.config['crawler'].get('use_seen_jobs_index', True):
+            self.seen_jobs = SeenJobsIndex(
+                index_path=self.config['crawler'].get('seen_jobs_index_path'),
+                ttl_days=self.config['crawler'].get('seen_jobs_ttl_days', 7)
+            )
+        
         # 创建截图目录
         if self.config['crawler'].get('save_screenshots', False):
             self.screenshot_dir = Path(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))) / "logs" / "screenshots"
@@ -290,8 +330,8 @@ class LinkedInCrawler:
         # 计算起始位置
         start = (page - 1) * 25
         
-        # 构造基本URL
-        base_url = "https://www.linkedin.com/jobs/search/"
+        # 构造基本URL（可配置为本地站点用于测试）
+        base_url = self.config['search'].get('base_url', "https://www.linkedin.com/jobs/search/")
         
         # 添加查询参数
         params = [
@@ -323,11 +363,21 @@ class LinkedInCrawler:
         
         try:
             for page in range(1, pages + 1):
+                # 跳过检查点中已完成的列表页
+                checkpointed_jobs = self.checkpoint.get_listing_page(keyword, location, page)
+                if checkpointed_jobs is not None:
+                    logger.info(f"跳过已完成的 '{keyword}' 在 '{location}' 的第 {page} 页")
+                    metrics.inc("crawl_pages_skipped_total", kind="listing")
+                    job_listings.extend(checkpointed_jobs)
+                    self._report_page_done("listing")
+                    continue
+                
                 logger.info(f"正在抓取 '{keyword}' 在 '{location}' 的第 {page} 页")
                 
                 # 构造并访问搜索URL
                 search_url = self.construct_search_url(keyword, location, page)
                 self.driver.get(search_url)
+                metrics.inc("crawl_pages_total", kind="listing")
                 
                 # 等待页面加载
                 self.random_delay(3, 5)
@@ -340,53 +390,35 @@ class LinkedInCrawler:
                     job_list = self.wait.until(EC.presence_of_element_located(
                         (By.CSS_SELECTOR, ".jobs-search__results-list")
                     ))
-                    job_items = job_list.find_elements(By.TAG_NAME, "li")
+                    page_source = None
+                    if self.parse_mode == "snapshot" or self.page_archive:
+                        page_source = self.driver.page_source
                     
-                    logger.info(f"找到 {len(job_items)} 个职位列表项")
+                    if self.page_archive:
+                        self.page_archive.store(page_source, "listing", url=search_url,
+                                                keyword=keyword, location=location, page=page)
                     
-                    # 提取每个职位的基本信息
-                    for job_item in job_items:
-                        try:
-                            # 提取职位链接和ID
-                            job_link_elem = job_item.find_element(By.CSS_SELECTOR, "a.job-card-container__link")
-                            job_link = job_link_elem.get_attribute("href")
-                            job_id = self.extract_job_id(job_link)
-                            
-                            # 提取职位标题
-                            job_title_elem = job_item.find_element(By.CSS_SELECTOR, "h3.job-card-container__title")
-                            job_title = job_title_elem.text.strip()
-                            
-                            # 提取公司名称
-                            company_elem = job_item.find_element(By.CSS_SELECTOR, "h4.job-card-container__company-name")
-                            company = company_elem.text.strip()
-                            
-                            # 提取地点
-                            location_elem = job_item.find_element(By.CSS_SELECTOR, ".job-card-container__metadata-item")
-                            job_location = location_elem.text.strip()
-                            
-                            # 创建职位数据字典
-                            job_data = {
-                                "job_id": job_id,
-                                "job_title": job_title,
-                                "company": company,
-                                "location": job_location,
-                                "job_link": job_link,
-                                "search_keyword": keyword,
-                                "search_location": location,
-                                "crawl_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                            }
-                            
-                            job_listings.append(job_data)
-                            
-                        except Exception as e:
-                            logger.warning(f"提取职位项时出错: {str(e)}")
-                            continue
+                    if self.parse_mode == "snapshot":
+                        # 一次获取页面源码，离线解析所有字段
+                        page_jobs = parse_job_listings(page_source, keyword, location)
+                    else:
+                        page_jobs = self._extract_listings_via_webdriver(job_list, keyword, location)
+                    
+                    logger.info(f"解析到 {len(page_jobs)} 个职位列表项")
+                    
+                    job_listings.extend(page_jobs)
+                    
+                    # 写入检查点
+                    self.checkpoint.record_listing_page(keyword, location, page, page_jobs)
                     
                 except TimeoutException:
                     logger.warning(f"等待职位列表超时，页面 {page}")
                     self.take_screenshot(f"timeout_page_{page}")
+                    self._report_page_done("listing")
                     continue
                 
+                self._report_page_done("listing")
+                
                 # 控制抓取频率
                 if page < pages:
                     self.random_delay(5, 8)
@@ -397,6 +429,64 @@ class LinkedInCrawler:
         
         return job_listings
     
+    def _extract_listings_via_webdriver(self, job_list, keyword: str, location: str) -> List[Dict[str, Any]]:
+        """
+        通过逐字段WebDriver调用提取列表页职位信息
+        
+        Args:
+            job_list: 职位列表容器元素
+            keyword: 搜索关键词
+            location: 搜索地区
+        
+        Returns:
+            List[Dict[str, Any]]: 职位数据列表
+        """
+        job_items = job_list.find_elements(By.TAG_NAME, "li")
+        
+        logger.info(f"找到 {len(job_items)} 个职位列表项")
+        
+        page_jobs = []
+        
+        # 提取每个职位的基本信息
+        for job_item in job_items:
+            try:
+                # 提取职位链接和ID
+                job_link_elem = job_item.find_element(By.CSS_SELECTOR, "a.job-card-container__link")
+                job_link = job_link_elem.get_attribute("href")
+                job_id = self.extract_job_id(job_link)
+                
+                # 提取职位标题
+                job_title_elem = job_item.find_element(By.CSS_SELECTOR, "h3.job-card-container__title")
+                job_title = job_title_elem.text.strip()
+                
+                # 提取公司名称
+                company_elem = job_item.find_element(By.CSS_SELECTOR, "h4.job-card-container__company-name")
+                company = company_elem.text.strip()
+                
+                # 提取地点
+                location_elem = job_item.find_element(By.CSS_SELECTOR, ".job-card-container__metadata-item")
+                job_location = location_elem.text.strip()
+                
+                # 创建职位数据字典
+                job_data = {
+                    "job_id": job_id,
+                    "job_title": job_title,
+                    "company": company,
+                    "location": job_location,
+                    "job_link": job_link,
+                    "search_keyword": keyword,
+                    "search_location": location,
+                    "crawl_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                }
+                
+                page_jobs.append(job_data)
+                
+            except Exception as e:
+                logger.warning(f"提取职位项时出错: {str(e)}")
+                continue
+        
+        return page_jobs
+    
     def scrape_job_details(self, job_listings: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
         抓取职位详情页
@@ -408,13 +498,40 @@ class LinkedInCrawler:
             List[Dict[str, Any]]: 包含详情的职位数据列表
         """
         detailed_jobs = []
+        self.pages_total["detail"] = len(job_listings)
         
         for i, job in enumerate(job_listings):
+            # 跳过检查点中已完成的详情页
+            checkpointed_job = self.checkpoint.get_job_detail(job['job_id'])
+            if checkpointed_job is not None:
+                logger.info(f"跳过已完成的职位详情 [{i+1}/{len(job_listings)}]: {job['job_id']}")
+                metrics.inc("crawl_pages_skipped_total", kind="detail")
+                detailed_jobs.append(checkpointed_job)
+                self._report_page_done("detail")
+                continue
+            
+            # 之前运行中已抓取且仍在有效期内的职位，直接从索引恢复详情
+            if self.seen_jobs:
+                seen_job = self.seen_jobs.get_fresh(job['job_id'], listing=job)
+                if seen_job is not None:
+                    logger.info(f"从索引恢复职位详情 [{i+1}/{len(job_listings)}]: {job['job_id']}")
+                    metrics.inc("crawl_pages_skipped_total", kind="seen_index")
+                    job_data = job.copy()
+                    for key, value in seen_job.items():
+                        job_data.setdefault(key, value)
+                    detailed_jobs.append(job_data)
+                    self.checkpoint.record_job_detail(job_data)
+                    if self.page_archive:
+                        self._archive_restored_job(job_data)
+                    self._report_page_done("detail")
+                    continue
+            
             try:
                 logger.info(f"正在抓取职位详情 [{i+1}/{len(job_listings)}]: {job['job_title']} at {job['company']}")
                 
                 # 访问职位详情页
                 self.driver.get(job['job_link'])
+                metrics.inc("crawl_pages_total", kind="detail")
                 
                 # 等待页面加载
                 self.random_delay(3, 5)
@@ -425,37 +542,22 @@ class LinkedInCrawler:
                         (By.CSS_SELECTOR, ".jobs-description__content")
                     ))
                     
-                    # 提取职位描述
-                    job_description = job_description_elem.text.strip()
-                    
-                    # 尝试提取其他详细信息
-                    job_details = {}
+                    page_source = None
+                    if self.parse_mode == "snapshot" or self.page_archive:
+                        page_source = self.driver.page_source
                     
-                    # 工作类型（全职/兼职等）
-                    try:
-                        job_type_elems = self.driver.find_elements(
-                            By.CSS_SELECTOR, ".jobs-unified-top-card__job-insight span"
-                        )
-                        if job_type_elems:
-                            job_details['job_type'] = job_type_elems[0].text.strip()
-                    except:
-                        pass
+                    archive_ref = None
+                    if self.page_archive:
+                        digest = self.page_archive.store(page_source, "detail", url=job['job_link'],
+                                                         job_id=job['job_id'], job=job)
+                        archive_ref = {"sha256": digest, "codec": self.page_archive.codec}
                     
-                    # 经验要求
-                    try:
-                        criteria_elems = self.driver.find_elements(
-                            By.CSS_SELECTOR, ".jobs-unified-top-card__job-criteria-item"
-                        )
-                        for elem in criteria_elems:
-                            label_elem = elem.find_element(By.CSS_SELECTOR, ".jobs-unified-top-card__job-criteria-subheader")
-                            value_elem = elem.find_element(By.CSS_SELECTOR, ".jobs-unified-top-card__job-criteria-text")
-                            
-                            label = label_elem.text.strip().lower().replace(' ', '_')
-                            value = value_elem.text.strip()
-                            
-                            job_details[label] = value
-                    except:
-                        pass
+                    if self.parse_mode == "snapshot":
+                        # 一次获取页面源码，离线解析描述和详细信息
+                        job_details = parse_job_details(page_source) or {}
+                        job_description = job_details.pop('job_description', None) or job_description_elem.text.strip()
+                    else:
+                        job_description, job_details = self._extract_details_via_webdriver(job_description_elem)
                     
                     # 更新职位数据
                     job_data = job.copy()
@@ -464,6 +566,12 @@ class LinkedInCrawler:
                     
                     detailed_jobs.append(job_data)
                     
+                    # 写入检查点（失败的详情页不记录，恢复时会重试）
+                    self.checkpoint.record_job_detail(job_data)
+                    if self.seen_jobs and self.seen_jobs.record(job_data, archive_ref=archive_ref):
+                        logger.info(f"职位描述已更新: {job['job_id']}")
+                        metrics.inc("crawl_jobs_changed_total")
+                    
                 except TimeoutException:
                     logger.warning(f"等待职位描述超时: {job['job_title']}")
                     self.take_screenshot(f"timeout_job_{i}")
@@ -485,9 +593,86 @@ class LinkedInCrawler:
                 job_data = job.copy()
                 job_data['job_description'] = f"[抓取错误: {str(e)}]"
                 detailed_jobs.append(job_data)
+            
+            self._report_page_done("detail")
         
         return detailed_jobs
     
+    def _report_page_done(self, kind: str) -> None:
+        """
+        记录一个页面已完成，并通过进度回调报告该类页面的完成数和总数
+        
+        Args:
+            kind: 页面类型，listing或detail
+        """
+        self.pages_done[kind] += 1
+        if self.progress is None:
+            return
+        try:
+            self.progress(kind, self.pages_done[kind], max(self.pages_total[kind], self.pages_done[kind]))
+        except Exception as e:
+            logger.warning(f"报告爬取进度时出错: {str(e)}")
+    
+    def _archive_restored_job(self, job_data: Dict[str, Any]) -> None:
+        """
+        将从索引恢复的职位记入本次运行的归档清单，使回放结果包含其详情
+        
+        优先引用之前归档的详情页，原详情页未归档时记录职位数据本身。
+        
+        Args:
+            job_data: 恢复的职位数据
+        """
+        archive_ref = self.seen_jobs.get_archive_ref(job_data['job_id'])
+        if archive_ref and self.page_archive.link(archive_ref['sha256'], archive_ref['codec'], "detail",
+                                                  url=job_data.get('job_link', ''),
+                                                  job_id=job_data['job_id'], job=job_data, restored=True):
+            return
+        self.page_archive.record_restored(job_data, url=job_data.get('job_link', ''))
+    
+    def _extract_details_via_webdriver(self, job_description_elem) -> Tuple[str, Dict[str, Any]]:
+        """
+        通过逐字段WebDriver调用提取详情页信息
+        
+        Args:
+            job_description_elem: 职位描述元素
+        
+        Returns:
+            Tuple[str, Dict[str, Any]]: 职位描述和其他详细信息
+        """
+        # 提取职位描述
+        job_description = job_description_elem.text.strip()
+        
+        # 尝试提取其他详细信息
+        job_details = {}
+        
+        # 工作类型（全职/兼职等）
+        try:
+            job_type_elems = self.driver.find_elements(
+                By.CSS_SELECTOR, ".jobs-unified-top-card__job-insight span"
+            )
+            if job_type_elems:
+                job_details['job_type'] = job_type_elems[0].text.strip()
+        except:
+            pass
+        
+        # 经验要求
+        try:
+            criteria_elems = self.driver.find_elements(
+                By.CSS_SELECTOR, ".jobs-unified-top-card__job-criteria-item"
+            )
+            for elem in criteria_elems:
+                label_elem = elem.find_element(By.CSS_SELECTOR, ".jobs-unified-top-card__job-criteria-subheader")
+                value_elem = elem.find_element(By.CSS_SELECTOR, ".jobs-unified-top-card__job-criteria-text")
+                
+                label = label_elem.text.strip().lower().replace(' ', '_')
+                value = value_elem.text.strip()
+                
+                job_details[label] = value
+        except:
+            pass
+        
+        return job_description, job_details
+    
     def extract_job_id(self, job_url: str) -> str:
         """
         从职位URL中提取职位ID
@@ -498,21 +683,7 @@ class LinkedInCrawler:
         Returns:
             str: 职位ID
         """
-        try:
-            # 尝试从URL中提取ID
-            if "currentJobId=" in job_url:
-                job_id = job_url.split("currentJobId=")[1].split("&")[0]
-            elif "/view/" in job_url:
-                job_id = job_url.split("/view/")[1].split("/")[0]
-            else:
-                # 生成随机ID作为后备
-                job_id = f"unknown_{int(time.time())}_{random.randint(1000, 9999)}"
-            
-            return job_id
-            
-        except Exception:
-            # 生成随机ID作为后备
-            return f"unknown_{int(time.time())}_{random.randint(1000, 9999)}"
+        return extract_job_id(job_url)
     
     def scroll_page(self, max_scrolls: int = 5) -> None:
         """
@@ -590,14 +761,20 @@ class LinkedInCrawler:
         except Exception as e:
             logger.error(f"保存截图时出错: {str(e)}")
     
-    def run(self) -> List[Dict[str, Any]]:
+    def run(self, progress: Optional[Callable[[str, int, int], None]] = None) -> List[Dict[str, Any]]:
         """
         运行爬虫
         
+        Args:
+            progress: 进度回调progress(kind, done, total)，每完成一个列表页（kind为listing）
+                或详情页（kind为detail）调用一次；详情页总数在列表页全部完成后才确定
+        
         Returns:
             List[Dict[str, Any]]: 爬取的职位数据
         """
         try:
+            logger.info(f"爬取运行ID: {self.run_id}")
+            
             # 设置WebDriver
             self.setup_driver()
             
@@ -609,6 +786,9 @@ class LinkedInCrawler:
             locations = self.config['search'].get('locations', [])
             pages_per_search = self.config['search'].get('pages_per_search', 5)
             
+            self.progress = progress
+            self.pages_total["listing"] = len(keywords) * len(locations) * pages_per_search
+            
             all_job_listings = []
             
             # 对每个关键词和地区组合进行搜索
@@ -617,7 +797,10 @@ class LinkedInCrawler:
                     logger.info(f"开始搜索关键词 '{keyword}' 在 '{location}'")
                     
                     # 抓取职位列表
-                    job_listings = self.scrape_job_listings(keyword, location, pages_per_search)
+                    with metrics.span("crawl_listings", unit="pages") as span:
+                        fetched_pages = metrics.get_counter("crawl_pages_total", kind="listing")
+                        job_listings = self.scrape_job_listings(keyword, location, pages_per_search)
+                        span.add(metrics.get_counter("crawl_pages_total", kind="listing") - fetched_pages)
                     logger.info(f"找到 {len(job_listings)} 个职位列表项")
                     
                     # 添加到总列表
@@ -639,7 +822,10 @@ class LinkedInCrawler:
             logger.info(f"去重后剩余 {len(unique_job_listings)} 个职位")
             
             # 抓取职位详情
-            detailed_jobs = self.scrape_job_details(unique_job_listings)
+            with metrics.span("crawl_details", items=len(unique_job_listings), unit="jobs"):
+                detailed_jobs = self.scrape_job_details(unique_job_listings)
+            if self.seen_jobs:
+                logger.info(f"已爬取职位索引: 复用{self.seen_jobs.hits}个，需抓取{self.seen_jobs.misses}个")
             
             # 保存结果
             self.job_data = detailed_jobs
@@ -0,0 +1,274 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+页面归档模块
+
+该模块将爬取到的列表页和详情页原始HTML压缩后按内容哈希存入归档目录，
+并为每次运行记录一份清单（JSONL）。回放时直接用解析器处理归档页面，
+无需重新爬取即可应用新的解析逻辑或新增字段。
+
+归档目录结构：
+    <archive_dir>/objects/<sha256前2位>/<sha256>.html.zst|.html.gz
+    <archive_dir>/manifests/<run_id>.jsonl
+
+从已爬取职位索引恢复的职位在清单中引用之前归档的详情页；原详情页未归档时
+记录恢复的职位数据本身（kind为restored）。
+"""
+
+import os
+import gzip
+import json
+import hashlib
+import logging
+from datetime import datetime
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Iterator
+
+# 可选的zstd压缩（未安装时使用gzip）
+ZSTD_AVAILABLE = False
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    pass
+
+from .page_parser import parse_job_listings, parse_job_details
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+# 默认归档目录
+DEFAULT_ARCHIVE_DIR = Path(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))) / "data" / "page_archive"
+
+# 压缩格式对应的文件扩展名
+CODEC_EXTENSIONS = {"zstd": ".html.zst", "gzip": ".html.gz"}
+
+class PageArchive:
+    """
+    内容寻址的原始页面归档类
+    """
+
+    def __init__(self, archive_dir: Optional[str] = None, run_id: Optional[str] = None):
+        """
+        初始化页面归档
+
+        Args:
+            archive_dir: 归档目录，如果为None则使用默认目录
+            run_id: 运行ID，写入页面时必须提供
+        """
+        self.archive_dir = Path(archive_dir) if archive_dir else DEFAULT_ARCHIVE_DIR
+        self.objects_dir = self.archive_dir / "objects"
+        self.manifests_dir = self.archive_dir / "manifests"
+        self.run_id = run_id
+        self.codec = "zstd" if ZSTD_AVAILABLE else "gzip"
+
+        os.makedirs(self.objects_dir, exist_ok=True)
+        os.makedirs(self.manifests_dir, exist_ok=True)
+
+    def _object_path(self, digest: str, codec: str) -> Path:
+        """
+        获取页面对象的存储路径
+        """
+        return self.objects_dir / digest[:2] / f"{digest}{CODEC_EXTENSIONS[codec]}"
+
+    def _compress(self, data: bytes) -> bytes:
+        if self.codec == "zstd":
+            return zstandard.ZstdCompressor(level=10).compress(data)
+        return gzip.compress(data, compresslevel=6)
+
+    @staticmethod
+    def _decompress(data: bytes, codec: str) -> bytes:
+        if codec == "zstd":
+            if not ZSTD_AVAILABLE:
+                raise ImportError("读取zstd归档需要安装zstandard")
+            return zstandard.ZstdDecompressor().decompress(data)
+        return gzip.decompress(data)
+
+    def store(self, page_source: str, kind: str, url: str = "", **metadata: Any) -> str:
+        """
+        归档一个页面，相同内容只存储一次
+
+        Args:
+            page_source: 页面HTML
+            kind: 页面类型，listing或detail
+            url: 页面URL
+            **metadata: 其他元数据（如keyword、location、page、job等）
+
+        Returns:
+            str: 页面内容的SHA-256哈希
+        """
+        data = page_source.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+
+        object_path = self._object_path(digest, self.codec)
+        if not object_path.exists():
+            os.makedirs(object_path.parent, exist_ok=True)
+            # 先写临时文件再重命名，避免崩溃时留下残缺对象
+            tmp_path = object_path.with_suffix(object_path.suffix + ".tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(self._compress(data))
+            os.replace(tmp_path, object_path)
+
+        self._append_entry(kind, url, sha256=digest, codec=self.codec, **metadata)
+        return digest
+
+    def link(self, digest: str, codec: str, kind: str, url: str = "", **metadata: Any) -> bool:
+        """
+        在本次运行的清单中引用之前归档的页面（例如从已爬取职位索引恢复、未重新抓取的详情页）
+
+        Args:
+            digest: 页面内容哈希
+            codec: 压缩格式
+            kind: 页面类型，listing或detail
+            url: 页面URL
+            **metadata: 其他元数据
+
+        Returns:
+            bool: 页面对象存在并已记录时返回True
+        """
+        if codec not in CODEC_EXTENSIONS or not self._object_path(digest, codec).exists():
+            return False
+        self._append_entry(kind, url, sha256=digest, codec=codec, **metadata)
+        return True
+
+    def record_restored(self, job: Dict[str, Any], url: str = "") -> None:
+        """
+        在清单中记录恢复的职位数据本身，用于原始详情页没有归档的情况
+
+        回放时这类记录只补充职位描述等详情字段，不经过解析器。
+
+        Args:
+            job: 包含详情的职位数据
+            url: 详情页URL
+        """
+        self._append_entry("restored", url, job_id=job.get("job_id"), job=job)
+
+    def _append_entry(self, kind: str, url: str, **metadata: Any) -> None:
+        """
+        向本次运行的清单追加一条记录
+        """
+        entry = {
+            "kind": kind,
+            "url": url,
+            "fetched_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        entry.update(metadata)
+
+        with open(self.manifests_dir / f"{self.run_id}.jsonl", "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False, default=str))
+            f.write("\n")
+
+    def load(self, digest: str, codec: str) -> str:
+        """
+        读取归档页面
+
+        Args:
+            digest: 页面内容哈希
+            codec: 压缩格式
+
+        Returns:
+            str: 页面HTML
+        """
+        with open(self._object_path(digest, codec), "rb") as f:
+            return self._decompress(f.read(), codec).decode("utf-8")
+
+    def list_runs(self) -> List[str]:
+        """
+        列出归档中的所有运行ID
+
+        Returns:
+            List[str]: 运行ID列表（按名称排序）
+        """
+        return sorted(path.stem for path in self.manifests_dir.glob("*.jsonl"))
+
+    def iter_entries(self, run_ids: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        按写入顺序遍历清单记录
+
+        Args:
+            run_ids: 要遍历的运行ID列表，如果为None则遍历所有运行
+
+        Yields:
+            Dict[str, Any]: 清单记录
+        """
+        for run_id in run_ids or self.list_runs():
+            manifest_path = self.manifests_dir / f"{run_id}.jsonl"
+            if not manifest_path.exists():
+                logger.warning(f"归档中不存在运行: {run_id}")
+                continue
+
+            with open(manifest_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        logger.warning(f"跳过清单{manifest_path}中的不完整记录")
+
+def replay_archive(archive_dir: Optional[str] = None,
+                   run_ids: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    使用当前解析器重新解析归档页面，重建职位数据
+
+    Args:
+        archive_dir: 归档目录，如果为None则使用默认目录
+        run_ids: 要回放的运行ID列表，如果为None则回放所有运行
+
+    Returns:
+        List[Dict[str, Any]]: 职位数据列表，结构与LinkedInCrawler.run的返回值一致
+    """
+    archive = PageArchive(archive_dir)
+
+    listings: Dict[str, Dict[str, Any]] = {}
+    details: Dict[str, Dict[str, Any]] = {}
+    restored: Dict[str, Dict[str, Any]] = {}
+    pages = 0
+
+    for entry in archive.iter_entries(run_ids):
+        # 从已爬取职位索引恢复且没有归档页面的职位，直接使用记录的数据
+        if entry["kind"] == "restored":
+            if entry.get("job"):
+                listings.setdefault(entry["job_id"], entry["job"])
+                restored[entry["job_id"]] = entry["job"]
+            continue
+
+        try:
+            page_source = archive.load(entry["sha256"], entry["codec"])
+        except Exception as e:
+            logger.error(f"读取归档页面{entry.get('sha256')}时出错: {str(e)}")
+            continue
+        pages += 1
+
+        if entry["kind"] == "listing":
+            for job in parse_job_listings(page_source, entry.get("keyword", ""), entry.get("location", "")):
+                job["crawl_time"] = entry["fetched_at"]
+                # 与爬虫去重逻辑一致：保留首次出现的列表项
+                listings.setdefault(job["job_id"], job)
+
+        elif entry["kind"] == "detail":
+            job_details = parse_job_details(page_source)
+            if job_details is None:
+                logger.warning(f"归档详情页中未找到职位描述: {entry.get('job_id')}")
+                continue
+            # 保存详情页对应的列表项，用于列表页未归档的情况
+            if entry.get("job"):
+                listings.setdefault(entry["job_id"], entry["job"])
+            details[entry["job_id"]] = job_details
+
+    jobs = []
+    for job_id, job in listings.items():
+        job_data = job.copy()
+        job_data["job_description"] = ""
+        if job_id not in details and job_id in restored:
+            job_data.update({key: value for key, value in restored[job_id].items()
+                             if key not in job or key == "job_description"})
+        job_data.update(details.get(job_id, {}))
+        jobs.append(job_data)
+
+    restored_count = len(set(restored) - set(details))
+    logger.info(f"回放了{pages}个归档页面，重建{len(jobs)}个职位，其中{len(details)}个包含详情，"
+                f"{restored_count}个使用恢复的职位数据")
+    return jobs
@@ -0,0 +1,183 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+页面解析模块
+
+该模块基于一次性获取的页面源码（driver.page_source）使用lxml离线解析
+职位列表页和详情页，避免对每个字段单独发起WebDriver调用。
+解析函数只依赖HTML文本，可直接在保存的HTML文件上运行。
+"""
+
+import re
+import time
+import random
+import logging
+from datetime import datetime
+from typing import List, Dict, Any, Optional
+
+from lxml import html as lxml_html
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+def _class_xpath(class_name: str) -> str:
+    """
+    构造按class匹配的XPath条件
+
+    Args:
+        class_name: CSS类名
+
+    Returns:
+        str: XPath谓词
+    """
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+# 与WebDriver路径中CSS选择器对应的XPath
+LISTING_ITEMS_XPATH = f"//*[{_class_xpath('jobs-search__results-list')}]//li"
+LISTING_LINK_XPATH = f".//a[{_class_xpath('job-card-container__link')}]"
+LISTING_TITLE_XPATH = f".//h3[{_class_xpath('job-card-container__title')}]"
+LISTING_COMPANY_XPATH = f".//h4[{_class_xpath('job-card-container__company-name')}]"
+LISTING_LOCATION_XPATH = f".//*[{_class_xpath('job-card-container__metadata-item')}]"
+DESCRIPTION_XPATH = f"//*[{_class_xpath('jobs-description__content')}]"
+JOB_INSIGHT_XPATH = f"//*[{_class_xpath('jobs-unified-top-card__job-insight')}]//span"
+CRITERIA_ITEM_XPATH = f"//*[{_class_xpath('jobs-unified-top-card__job-criteria-item')}]"
+CRITERIA_LABEL_XPATH = f".//*[{_class_xpath('jobs-unified-top-card__job-criteria-subheader')}]"
+CRITERIA_VALUE_XPATH = f".//*[{_class_xpath('jobs-unified-top-card__job-criteria-text')}]"
+
+# 渲染时会换行的块级标签
+BLOCK_TAGS = {"p", "div", "li", "ul", "ol", "br", "h1", "h2", "h3", "h4", "h5", "h6",
+              "section", "article", "tr", "table", "blockquote", "pre"}
+
+def _element_text(element) -> str:
+    """
+    提取元素文本，在块级元素处换行并按行合并空白，近似WebDriver的.text结果
+
+    Args:
+        element: lxml元素（会就地插入换行符，调用方不应再使用原始文本）
+
+    Returns:
+        str: 清理后的文本
+    """
+    for child in element.iterdescendants():
+        if isinstance(child.tag, str) and child.tag.lower() in BLOCK_TAGS:
+            child.text = '\n' + (child.text or '')
+            child.tail = '\n' + (child.tail or '')
+    text = element.text_content()
+    lines = [re.sub(r'[ \t\r\f\v]+', ' ', line).strip() for line in text.split('\n')]
+    return '\n'.join(line for line in lines if line)
+
+def _first_text(element, xpath: str) -> Optional[str]:
+    """
+    获取第一个匹配元素的文本
+
+    Args:
+        element: 查找起点
+        xpath: XPath表达式
+
+    Returns:
+        Optional[str]: 文本，未找到时返回None
+    """
+    matches = element.xpath(xpath)
+    return _element_text(matches[0]) if matches else None
+
+def extract_job_id(job_url: str) -> str:
+    """
+    从职位URL中提取职位ID
+
+    Args:
+        job_url: 职位URL
+
+    Returns:
+        str: 职位ID
+    """
+    try:
+        # 尝试从URL中提取ID
+        if "currentJobId=" in job_url:
+            job_id = job_url.split("currentJobId=")[1].split("&")[0]
+        elif "/view/" in job_url:
+            job_id = job_url.split("/view/")[1].split("/")[0]
+        else:
+            # 生成随机ID作为后备
+            job_id = f"unknown_{int(time.time())}_{random.randint(1000, 9999)}"
+
+        return job_id
+
+    except Exception:
+        # 生成随机ID作为后备
+        return f"unknown_{int(time.time())}_{random.randint(1000, 9999)}"
+
+def parse_job_listings(page_source: str, keyword: str, location: str) -> List[Dict[str, Any]]:
+    """
+    从列表页源码解析职位基本信息
+
+    Args:
+        page_source: 列表页HTML
+        keyword: 搜索关键词
+        location: 搜索地区
+
+    Returns:
+        List[Dict[str, Any]]: 职位数据列表
+    """
+    tree = lxml_html.fromstring(page_source)
+    crawl_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    job_listings = []
+
+    for item in tree.xpath(LISTING_ITEMS_XPATH):
+        links = item.xpath(LISTING_LINK_XPATH)
+        title = _first_text(item, LISTING_TITLE_XPATH)
+        company = _first_text(item, LISTING_COMPANY_XPATH)
+        job_location = _first_text(item, LISTING_LOCATION_XPATH)
+
+        # 与WebDriver路径一致：缺少任一字段的列表项跳过
+        if not links or title is None or company is None or job_location is None:
+            logger.warning("提取职位项时出错: 缺少必要字段")
+            continue
+
+        job_link = links[0].get("href")
+        job_listings.append({
+            "job_id": extract_job_id(job_link or ""),
+            "job_title": title,
+            "company": company,
+            "location": job_location,
+            "job_link": job_link,
+            "search_keyword": keyword,
+            "search_location": location,
+            "crawl_time": crawl_time
+        })
+
+    return job_listings
+
+def parse_job_details(page_source: str) -> Optional[Dict[str, Any]]:
+    """
+    从详情页源码解析职位描述和其他详细信息
+
+    Args:
+        page_source: 详情页HTML
+
+    Returns:
+        Optional[Dict[str, Any]]: 包含job_description和其他详细字段的字典，
+            页面中没有职位描述时返回None
+    """
+    tree = lxml_html.fromstring(page_source)
+
+    job_description = _first_text(tree, DESCRIPTION_XPATH)
+    if job_description is None:
+        return None
+
+    job_details = {"job_description": job_description}
+
+    # 工作类型（全职/兼职等）
+    job_type = _first_text(tree, JOB_INSIGHT_XPATH)
+    if job_type is not None:
+        job_details["job_type"] = job_type
+
+    # 经验要求等条目
+    for item in tree.xpath(CRITERIA_ITEM_XPATH):
+        label = _first_text(item, CRITERIA_LABEL_XPATH)
+        value = _first_text(item, CRITERIA_VALUE_XPATH)
+        if label is None or value is None:
+            continue
+        job_details[label.lower().replace(' ', '_')] = value
+
+    return job_details
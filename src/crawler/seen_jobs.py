@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+已爬取职位索引模块
+
+该模块维护一个跨运行共享的持久化职位索引（SQLite），记录每个job_id的
+爬取时间、职位描述哈希和完整职位数据。在新鲜度有效期内且列表页信息
+未变化的职位可以直接从索引中恢复，无需再次访问详情页；重新抓取时通过
+描述哈希判断职位描述是否已更新。
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from ..utils.helpers import md5_hash
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+# 列表页中可见的字段，变化时说明职位已被修改，需要重新抓取详情
+LISTING_FIELDS = ("job_title", "company", "location")
+
+# 默认索引路径
+DEFAULT_INDEX_PATH = Path(os.path.dirname(os.path.dirname(os.path.dirname(__file__)))) / "data" / "seen_jobs.sqlite"
+
+class SeenJobsIndex:
+    """
+    已爬取职位索引类
+    """
+
+    def __init__(self, index_path: Optional[str] = None, ttl_days: float = 7):
+        """
+        初始化职位索引
+
+        Args:
+            index_path: SQLite文件路径，如果为None则使用默认路径
+            ttl_days: 新鲜度有效期（天），超过有效期的职位需要重新抓取；<=0表示永不过期
+        """
+        self.index_path = Path(index_path) if index_path else DEFAULT_INDEX_PATH
+        self.ttl_seconds = ttl_days * 24 * 3600
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(self.index_path.parent, exist_ok=True)
+
+        self._conn = sqlite3.connect(str(self.index_path))
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS seen_jobs (
+                job_id TEXT PRIMARY KEY,
+                crawled_at REAL NOT NULL,
+                description_hash TEXT NOT NULL,
+                job TEXT NOT NULL,
+                archive_ref TEXT
+            )
+        """)
+        # 旧版索引没有archive_ref列
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(seen_jobs)")}
+        if "archive_ref" not in columns:
+            self._conn.execute("ALTER TABLE seen_jobs ADD COLUMN archive_ref TEXT")
+        self._conn.commit()
+
+        logger.info(f"已爬取职位索引初始化完成: {self.index_path}")
+
+    def get_fresh(self, job_id: str, listing: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Any]]:
+        """
+        获取新鲜度有效期内的职位数据
+
+        Args:
+            job_id: 职位ID
+            listing: 本次列表页解析到的职位数据，如果提供则其标题、公司或地点
+                与索引中不一致时视为职位已修改
+
+        Returns:
+            Optional[Dict[str, Any]]: 已保存的职位数据，不存在、已过期或已修改时返回None
+        """
+        row = self._conn.execute(
+            "SELECT crawled_at, job FROM seen_jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+
+        if row is None or (self.ttl_seconds > 0 and time.time() - row[0] > self.ttl_seconds):
+            self.misses += 1
+            return None
+
+        job = json.loads(row[1])
+        if listing is not None and any(
+            field in listing and listing[field] != job.get(field) for field in LISTING_FIELDS
+        ):
+            logger.info(f"职位 {job_id} 的列表页信息已变化，重新抓取详情")
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return job
+
+    def get_archive_ref(self, job_id: str) -> Optional[Dict[str, str]]:
+        """
+        获取职位详情页在页面归档中的位置
+
+        Args:
+            job_id: 职位ID
+
+        Returns:
+            Optional[Dict[str, str]]: 包含sha256和codec的字典，没有归档时返回None
+        """
+        row = self._conn.execute(
+            "SELECT archive_ref FROM seen_jobs WHERE job_id = ?", (job_id,)
+        ).fetchone()
+        if row is None or not row[0]:
+            return None
+        return json.loads(row[0])
+
+    def record(self, job: Dict[str, Any], archive_ref: Optional[Dict[str, str]] = None) -> bool:
+        """
+        记录成功抓取的职位
+
+        Args:
+            job: 包含详情的职位数据
+            archive_ref: 详情页在页面归档中的位置（sha256和codec），未归档时为None
+
+        Returns:
+            bool: 索引中已有该职位且职位描述发生变化时返回True
+        """
+        description = job.get("job_description", "") or ""
+        description_hash = md5_hash(description)
+
+        row = self._conn.execute(
+            "SELECT description_hash FROM seen_jobs WHERE job_id = ?", (job["job_id"],)
+        ).fetchone()
+        changed = row is not None and row[0] != description_hash
+
+        self._conn.execute(
+            "INSERT OR REPLACE INTO seen_jobs (job_id, crawled_at, description_hash, job, archive_ref) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (job["job_id"], time.time(), description_hash, json.dumps(job, ensure_ascii=False, default=str),
+             json.dumps(archive_ref) if archive_ref else None)
+        )
+        self._conn.commit()
+
+        return changed
+
+    def close(self) -> None:
+        """
+        关闭数据库连接
+        """
+        self._conn.close()
@@ -9,13 +9,22 @@ Excel处理模块
 """
 
 import os
+import json
+import math
+import hashlib
 import logging
 import pandas as pd
 from typing import List, Dict, Any, Optional, Union
 
+# storage模块也导入本模块，这里只导入模块本身，在调用时再取JsonlStorage
+from . import storage
+
 # 设置日志
 logger = logging.getLogger(__name__)
 
+# 分组关键词统计的sheet名前缀及对应的数值
+SEGMENT_SHEET_PREFIXES = {'分组词频': 'counts', '分组占比': 'job_share'}
+
 class ExcelHandler:
     """
     Excel文件处理类
@@ -25,12 +34,32 @@ class ExcelHandler:
         """
         初始化Excel处理器
         """
-        pass
+        # job_id索引缓存（job_id到记录指纹的映射），键为索引文件路径
+        self._id_indexes = {}
     
     def save_to_excel(self, data: List[Dict[str, Any]], file_path: str) -> bool:
         """
         将职位数据保存到Excel文件
         
+        覆盖保存时同时删除append_to_excel留下的伴随存储和job_id索引，
+        之后的追加会以新保存的Excel内容为基础。
+        
+        Args:
+            data: 职位数据列表
+            file_path: 保存路径
+        
+        Returns:
+            bool: 是否成功保存
+        """
+        if not self._write_excel(data, file_path):
+            return False
+        self._remove_companions(file_path)
+        return True
+    
+    def _write_excel(self, data: List[Dict[str, Any]], file_path: str) -> bool:
+        """
+        写入Excel文件（不处理伴随存储）
+        
         Args:
             data: 职位数据列表
             file_path: 保存路径
@@ -86,6 +115,10 @@ class ExcelHandler:
             List[Dict[str, Any]]: 职位数据列表
         """
         try:
+            # Excel尚未从伴随存储重新导出时，直接读取伴随存储
+            if self._is_stale(file_path):
+                return self._load_companion(file_path)
+            
             # 检查文件是否存在
             if not os.path.exists(file_path):
                 logger.error(f"文件不存在: {file_path}")
@@ -104,47 +137,202 @@ class ExcelHandler:
             logger.error(f"加载Excel文件时出错: {str(e)}")
             return []
     
-    def append_to_excel(self, data: List[Dict[str, Any]], file_path: str) -> bool:
+    def append_to_excel(self, data: List[Dict[str, Any]], file_path: str, 
+                        export: bool = False) -> bool:
         """
         将新数据追加到现有Excel文件
         
+        新数据追加到Excel文件旁的JSONL伴随存储（<file_path>.jsonl），并通过
+        job_id索引文件（<file_path>.ids）跳过内容未变化的职位，追加开销只与本批数据量相关。
+        已存在但内容有变化的职位同样写入，读取和导出时按job_id去重并保留最后一条（与原先的
+        drop_duplicates(keep='last')一致）。
+        Excel文件在调用export_excel时（或export=True时）才重新生成；
+        在此之前load_from_excel会直接读取伴随存储。
+        
         Args:
             data: 要追加的数据
             file_path: Excel文件路径
+            export: 是否在追加后立即重新导出Excel文件
         
         Returns:
             bool: 是否成功追加
         """
         try:
-            # 检查文件是否存在
-            if os.path.exists(file_path):
-                # 读取现有数据
-                existing_df = pd.read_excel(file_path, engine='openpyxl')
-                
-                # 转换新数据为DataFrame
-                new_df = pd.DataFrame(data)
-                
-                # 合并数据
-                combined_df = pd.concat([existing_df, new_df], ignore_index=True)
-                
-                # 去重（基于job_id）
-                if 'job_id' in combined_df.columns:
-                    combined_df = combined_df.drop_duplicates(subset=['job_id'], keep='last')
-                
-                # 保存合并后的数据
-                combined_df.to_excel(file_path, index=False, engine='openpyxl')
-                
-                logger.info(f"成功追加{len(data)}条数据到: {file_path}，总计{len(combined_df)}条")
-                return True
-                
-            else:
-                # 如果文件不存在，直接保存
-                return self.save_to_excel(data, file_path)
+            jsonl_storage = storage.JsonlStorage()
+            companion_path = self._companion_path(file_path)
+            
+            # 首次追加（或覆盖保存后的首次追加）时，用Excel现有数据初始化伴随存储
+            if not os.path.exists(companion_path) and os.path.exists(file_path):
+                existing_data = [self._normalize_row(row) for row in
+                                 pd.read_excel(file_path, engine='openpyxl').to_dict('records')]
+                if not jsonl_storage.save(existing_data, companion_path):
+                    return False
+                self._write_id_index(file_path, existing_data)
+            
+            # 本批内部重复的职位只保留最后一条，再跳过与索引中内容相同的职位
+            known_ids = self._load_id_index(file_path)
+            new_rows = []
+            for row in self._dedupe_rows([self._normalize_row(row) for row in data]):
+                job_id = row.get('job_id')
+                if job_id is not None and known_ids.get(job_id) == self._row_fingerprint(row):
+                    continue
+                new_rows.append(row)
+            
+            if new_rows:
+                if not jsonl_storage.append(new_rows, companion_path):
+                    return False
+                self._append_id_index(file_path, new_rows)
+            
+            logger.info(f"追加{len(new_rows)}条新数据到: {companion_path}，跳过{len(data) - len(new_rows)}条未变化数据")
+            
+            if export:
+                return self.export_excel(file_path)
+            return True
                 
         except Exception as e:
             logger.error(f"追加数据到Excel文件时出错: {str(e)}")
             return False
     
+    def export_excel(self, file_path: str) -> bool:
+        """
+        从伴随存储重新生成Excel文件
+        
+        Args:
+            file_path: Excel文件路径
+        
+        Returns:
+            bool: 是否成功导出
+        """
+        companion_path = self._companion_path(file_path)
+        if not os.path.exists(companion_path):
+            logger.warning(f"伴随存储不存在，无需导出: {companion_path}")
+            return os.path.exists(file_path)
+        
+        return self._write_excel(self._load_companion(file_path), file_path)
+    
+    def _load_companion(self, file_path: str) -> List[Dict[str, Any]]:
+        """
+        读取伴随存储，同一job_id只保留最后追加的一条
+        """
+        return self._dedupe_rows(storage.JsonlStorage().load(self._companion_path(file_path)))
+    
+    @staticmethod
+    def _dedupe_rows(data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        按job_id去重并保留最后一条，行顺序与drop_duplicates(keep='last')相同
+        
+        Args:
+            data: job_id已统一为字符串的记录列表
+        
+        Returns:
+            List[Dict[str, Any]]: 去重后的记录列表
+        """
+        last_index = {row.get('job_id'): i for i, row in enumerate(data)}
+        return [row for i, row in enumerate(data)
+                if row.get('job_id') is None or last_index[row.get('job_id')] == i]
+    
+    @staticmethod
+    def _row_fingerprint(row: Dict[str, Any]) -> str:
+        """
+        计算记录内容的指纹，用于判断已存在的职位是否有更新
+        """
+        payload = json.dumps(row, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.md5(payload.encode('utf-8')).hexdigest()
+    
+    def _companion_path(self, file_path: str) -> str:
+        """
+        获取Excel文件对应的JSONL伴随存储路径
+        """
+        return f"{file_path}.jsonl"
+    
+    def _id_index_path(self, file_path: str) -> str:
+        """
+        获取Excel文件对应的job_id索引路径
+        """
+        return f"{file_path}.ids"
+    
+    def _remove_companions(self, file_path: str) -> None:
+        """
+        删除Excel文件对应的伴随存储和job_id索引
+        """
+        for path in (self._companion_path(file_path), self._id_index_path(file_path)):
+            if os.path.exists(path):
+                os.remove(path)
+        self._id_indexes.pop(self._id_index_path(file_path), None)
+    
+    @staticmethod
+    def _normalize_job_id(job_id: Any) -> Optional[str]:
+        """
+        统一job_id为字符串（Excel读出的可能是整数或浮点数，JSONL中为字符串）
+        
+        Args:
+            job_id: 原始job_id
+        
+        Returns:
+            Optional[str]: 字符串形式的job_id，缺失时为None
+        """
+        if job_id is None or (isinstance(job_id, float) and math.isnan(job_id)):
+            return None
+        if isinstance(job_id, float) and job_id.is_integer():
+            job_id = int(job_id)
+        job_id = str(job_id).strip()
+        return job_id or None
+    
+    def _normalize_row(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        返回job_id统一为字符串的记录副本
+        """
+        if 'job_id' not in row:
+            return row
+        return {**row, 'job_id': self._normalize_job_id(row['job_id'])}
+    
+    def _is_stale(self, file_path: str) -> bool:
+        """
+        检查Excel文件是否落后于伴随存储
+        """
+        companion_path = self._companion_path(file_path)
+        if not os.path.exists(companion_path):
+            return False
+        if not os.path.exists(file_path):
+            return True
+        return os.path.getmtime(companion_path) > os.path.getmtime(file_path)
+    
+    def _load_id_index(self, file_path: str) -> Dict[str, str]:
+        """
+        加载job_id索引（job_id到最新记录指纹的映射），同一文件只从磁盘读取一次
+        """
+        index_path = self._id_index_path(file_path)
+        if index_path not in self._id_indexes:
+            ids = {}
+            if os.path.exists(index_path):
+                with open(index_path, 'r', encoding='utf-8') as f:
+                    for line in f:
+                        job_id, _, fingerprint = line.rstrip('\n').partition('\t')
+                        if job_id:
+                            ids[job_id] = fingerprint
+            self._id_indexes[index_path] = ids
+        return self._id_indexes[index_path]
+    
+    def _write_id_index(self, file_path: str, data: List[Dict[str, Any]]) -> None:
+        """
+        重建job_id索引文件
+        """
+        self._id_indexes[self._id_index_path(file_path)] = {}
+        open(self._id_index_path(file_path), 'w', encoding='utf-8').close()
+        self._append_id_index(file_path, data)
+    
+    def _append_id_index(self, file_path: str, data: List[Dict[str, Any]]) -> None:
+        """
+        将新的job_id及记录指纹追加到索引文件，同一job_id以最后一行为准
+        """
+        ids = self._load_id_index(file_path)
+        with open(self._id_index_path(file_path), 'a', encoding='utf-8') as f:
+            for row in data:
+                job_id = self._normalize_job_id(row.get('job_id'))
+                if job_id is not None:
+                    ids[job_id] = self._row_fingerprint(row)
+                    f.write(f"{job_id}\t{ids[job_id]}\n")
+    
     def save_keywords_to_excel(self, keyword_data: Dict[str, Any], file_path: str) -> bool:
         """
         保存关键词分析结果到Excel文件
@@ -186,6 +374,14 @@ class ExcelHandler:
                 if 'metadata' in keyword_data:
                     meta_df = pd.DataFrame([keyword_data['metadata']])
                     meta_df.to_excel(writer, sheet_name='元数据', index=False)
+                
+                # 保存分组关键词统计（每个分组字段一个词频sheet和一个职位占比sheet）
+                for field, table in keyword_data.get('segment_keywords', {}).items():
+                    for prefix, value in SEGMENT_SHEET_PREFIXES.items():
+                        segment_df = pd.DataFrame(table[value], columns=table['keywords'])
+                        segment_df.insert(0, 'job_count', table['job_counts'])
+                        segment_df.insert(0, 'segment', table['segments'])
+                        segment_df.to_excel(writer, sheet_name=f'{prefix}_{field}'[:31], index=False)
             
             logger.info(f"成功保存关键词分析结果到: {file_path}")
             return True
@@ -242,6 +438,23 @@ class ExcelHandler:
                 if not meta_df.empty:
                     keyword_data['metadata'] = meta_df.iloc[0].to_dict()
             
+            # 读取分组关键词统计
+            segment_keywords = {}
+            for sheet_name in xls.sheet_names:
+                for prefix, value in SEGMENT_SHEET_PREFIXES.items():
+                    if not sheet_name.startswith(f'{prefix}_'):
+                        continue
+                    field = sheet_name[len(prefix) + 1:]
+                    segment_df = pd.read_excel(xls, sheet_name)
+                    table = segment_keywords.setdefault(field, {})
+                    table['segments'] = segment_df['segment'].astype(str).tolist()
+                    table['job_counts'] = segment_df['job_count'].astype(int).tolist()
+                    keyword_df = segment_df.drop(columns=['segment', 'job_count'])
+                    table['keywords'] = [str(column) for column in keyword_df.columns]
+                    table[value] = keyword_df.values.tolist()
+            if segment_keywords:
+                keyword_data['segment_keywords'] = segment_keywords
+            
             logger.info(f"从{file_path}加载了关键词分析结果")
             return keyword_data
             
@@ -333,7 +546,7 @@ if __name__ == "__main__":
             "crawl_time": "2023-01-01 13:00:00"
         }
     ]
-    handler.append_to_excel(append_data, test_file)
+    handler.append_to_excel(append_data, test_file, export=True)
     
     # 测试关键词数据
     keyword_data = {
@@ -367,7 +580,8 @@ if __name__ == "__main__":
     
     # 清理测试文件
     import os
-    if os.path.exists(test_file):
-        os.remove(test_file)
+    for path in [test_file, f"{test_file}.jsonl", f"{test_file}.ids"]:
+        if os.path.exists(path):
+            os.remove(path)
     if os.path.exists(keyword_file):
         os.remove(keyword_file)
\ No newline at end of file
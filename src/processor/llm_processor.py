@@ -14,7 +14,6 @@ import logging
 import time
 from typing import List, Dict, Any, Optional, Union, Tuple
 
-import google.generativeai as genai
 from tenacity import retry, stop_after_attempt, wait_exponential
 from pydantic import BaseModel, Field, ValidationError
 
@@ -31,6 +30,7 @@ if project_root not in sys.path:
 from config import GEMINI_API_KEY, GEMINI_MODEL, GEMINI_TEMPERATURE, GEMINI_MAX_OUTPUT_TOKENS, \
     GEMINI_TOP_P, GEMINI_TOP_K, GEMINI_MAX_RETRIES, GEMINI_RETRY_MIN_WAIT, GEMINI_RETRY_MAX_WAIT, \
     JOB_SUMMARY_PROMPT_TEMPLATE, SKILL_EXTRACTION_PROMPT_TEMPLATE
+from src.analyzer.llm_backends import BaseLLMBackend, GeminiBackend
 
 # 设置日志
 logger = logging.getLogger(__name__)
@@ -44,12 +44,13 @@ class JobAnalysisResult(BaseModel):
 class LLMProcessor:
     """LLM处理类，用于调用Gemini API进行职位摘要和技能提取"""
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self, api_key: Optional[str] = None, backend: Optional[BaseLLMBackend] = None):
         """
         初始化LLM处理器
         
         Args:
             api_key: Gemini API密钥，如果为None则使用配置文件中的密钥
+            backend: LLM后端（例如本地假后端），如果为None则使用Gemini后端
         """
         self.api_key = api_key or GEMINI_API_KEY
         self.model = GEMINI_MODEL
@@ -58,12 +59,10 @@ class LLMProcessor:
         self.top_p = GEMINI_TOP_P
         self.top_k = GEMINI_TOP_K
         
-        # 初始化Gemini API
-        genai.configure(api_key=self.api_key)
-        
-        # 获取模型
-        self.model_instance = genai.GenerativeModel(
-            model_name=self.model,
+        # 创建LLM后端
+        self.backend = backend or GeminiBackend(
+            self.api_key,
+            self.model,
             generation_config={
                 "temperature": self.temperature,
                 "max_output_tokens": self.max_output_tokens,
@@ -87,8 +86,7 @@ class LLMProcessor:
             str: API返回的文本
         """
         try:
-            response = self.model_instance.generate_content(prompt)
-            return response.text
+            return self.backend.generate(prompt)
         except Exception as e:
             logger.error(f"调用Gemini API时出错: {str(e)}")
             raise
@@ -0,0 +1,170 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+数据预览模块
+
+该模块为界面的数据预览提供服务端分页、列选择、长文本截断和关键字过滤。
+每个文件解析后的DataFrame按文件路径缓存，文件修改时间或大小变化时重新解析，
+缓存按最近使用顺序保留有限个文件。
+"""
+
+import os
+import logging
+import threading
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional, Tuple
+
+import pandas as pd
+
+from .storage import get_storage
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+# 默认隐藏的长文本列
+DEFAULT_HIDDEN_COLUMNS = ["job_description"]
+
+class DataPreview:
+    """
+    数据预览类，缓存已解析的文件并按页返回数据
+    """
+
+    def __init__(self, max_files: int = 8):
+        """
+        初始化预览器
+
+        Args:
+            max_files: 最多缓存的已解析文件数
+        """
+        self.max_files = max(1, int(max_files))
+        # 文件路径 -> ((修改时间, 大小), DataFrame)
+        self._cache: "OrderedDict[str, Tuple[Tuple[int, int], pd.DataFrame]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _parse(file_path: str) -> pd.DataFrame:
+        """
+        解析文件为DataFrame
+
+        Args:
+            file_path: 文件路径
+
+        Returns:
+            pd.DataFrame: 文件内容（Excel文件读取第一个sheet）
+        """
+        if file_path.endswith((".xlsx", ".xls")):
+            return pd.read_excel(file_path)
+        return pd.DataFrame(get_storage(file_path).load(file_path))
+
+    def load(self, file_path: str) -> pd.DataFrame:
+        """
+        获取文件的DataFrame，文件未变化时使用缓存
+
+        Args:
+            file_path: 文件路径
+
+        Returns:
+            pd.DataFrame: 文件内容
+        """
+        stat = os.stat(file_path)
+        state = (stat.st_mtime_ns, stat.st_size)
+
+        with self._lock:
+            cached = self._cache.get(file_path)
+            if cached is not None and cached[0] == state:
+                self._cache.move_to_end(file_path)
+                return cached[1]
+
+        df = self._parse(file_path)
+        logger.info(f"解析预览文件: {file_path}，共{len(df)}行")
+
+        with self._lock:
+            self._cache[file_path] = (state, df)
+            self._cache.move_to_end(file_path)
+            while len(self._cache) > self.max_files:
+                self._cache.popitem(last=False)
+        return df
+
+    def get_columns(self, file_path: str) -> List[str]:
+        """
+        获取文件的列名
+
+        Args:
+            file_path: 文件路径
+
+        Returns:
+            List[str]: 列名列表
+        """
+        return [str(column) for column in self.load(file_path).columns]
+
+    def get_page(self, file_path: str, page: int = 1, page_size: int = 50,
+                 columns: Optional[List[str]] = None, query: str = "",
+                 max_text_length: int = 200) -> Tuple[pd.DataFrame, Dict[str, Any]]:
+        """
+        获取一页预览数据
+
+        Args:
+            file_path: 文件路径
+            page: 页码（从1开始，超出范围时取最近的有效页）
+            page_size: 每页行数
+            columns: 显示的列，如果为None则显示除长文本列外的全部列
+            query: 过滤关键字，保留任一显示列包含该关键字（不区分大小写）的行
+            max_text_length: 文本单元格的最大显示长度，<=0时不截断
+
+        Returns:
+            Tuple[pd.DataFrame, Dict[str, Any]]: 当前页数据和分页信息（page、total_pages、total_rows、matched_rows）
+        """
+        df = self.load(file_path)
+
+        # 列选择
+        if columns is None:
+            columns = [column for column in df.columns if column not in DEFAULT_HIDDEN_COLUMNS] or list(df.columns)
+        else:
+            selected = set(columns)
+            columns = [column for column in df.columns if str(column) in selected]
+        view = df[columns]
+
+        # 关键字过滤（只在显示的列中查找）
+        query = (query or "").strip().lower()
+        if query and len(view.columns):
+            mask = pd.Series(False, index=view.index)
+            for column in view.columns:
+                mask |= view[column].astype(str).str.lower().str.contains(query, regex=False, na=False)
+            view = view[mask]
+
+        # 分页
+        page_size = max(1, int(page_size))
+        total_pages = max(1, -(-len(view) // page_size))
+        page = min(max(1, int(page)), total_pages)
+        page_df = view.iloc[(page - 1) * page_size:page * page_size].copy()
+
+        # 截断长文本（只处理当前页）
+        if max_text_length > 0:
+            for column in page_df.columns:
+                if not pd.api.types.is_numeric_dtype(page_df[column]):
+                    page_df[column] = page_df[column].map(
+                        lambda value: value[:max_text_length] + "…"
+                        if isinstance(value, str) and len(value) > max_text_length else value
+                    )
+
+        info = {
+            "page": page,
+            "total_pages": total_pages,
+            "total_rows": len(df),
+            "matched_rows": len(view),
+        }
+        return page_df, info
+
+    def invalidate(self, file_path: Optional[str] = None) -> None:
+        """
+        清除缓存
+
+        Args:
+            file_path: 要清除的文件路径，如果为None则清除全部
+        """
+        with self._lock:
+            if file_path is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(file_path, None)
@@ -0,0 +1,369 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+数据存储模块
+
+该模块提供可插拔的职位数据存储后端，用于流水线各阶段之间的中间数据交换。
+支持Parquet（基于pyarrow）、只追加的JSONL和Excel三种格式，按文件扩展名或
+指定格式选择后端，并提供按行组/按行的流式读取。
+"""
+
+import os
+import ast
+import json
+import math
+import logging
+from typing import List, Dict, Any, Optional, Iterator
+
+import pandas as pd
+
+# 可选的Parquet支持
+PARQUET_AVAILABLE = False
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_AVAILABLE = True
+except ImportError:
+    pass
+
+# excel_handler模块也导入本模块，这里只导入模块本身
+from . import excel_handler
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+class BaseStorage:
+    """
+    存储后端基类
+    """
+
+    # 后端对应的文件扩展名
+    extensions: tuple = ()
+
+    def save(self, data: List[Dict[str, Any]], file_path: str) -> bool:
+        """
+        保存数据（覆盖已有文件）
+
+        Args:
+            data: 职位数据列表
+            file_path: 保存路径
+
+        Returns:
+            bool: 是否成功保存
+        """
+        raise NotImplementedError
+
+    def load(self, file_path: str) -> List[Dict[str, Any]]:
+        """
+        加载全部数据
+
+        Args:
+            file_path: 文件路径
+
+        Returns:
+            List[Dict[str, Any]]: 职位数据列表
+        """
+        data = []
+        for batch in self.iter_batches(file_path):
+            data.extend(batch)
+        logger.info(f"从{file_path}加载了{len(data)}条数据")
+        return data
+
+    def append(self, data: List[Dict[str, Any]], file_path: str) -> bool:
+        """
+        追加数据到已有文件
+
+        Args:
+            data: 要追加的数据
+            file_path: 文件路径
+
+        Returns:
+            bool: 是否成功追加
+        """
+        raise NotImplementedError
+
+    def iter_batches(self, file_path: str, batch_size: int = 10000) -> Iterator[List[Dict[str, Any]]]:
+        """
+        流式读取数据
+
+        Args:
+            file_path: 文件路径
+            batch_size: 每批记录数
+
+        Yields:
+            List[Dict[str, Any]]: 一批职位数据
+        """
+        raise NotImplementedError
+
+class JsonlStorage(BaseStorage):
+    """
+    JSONL存储后端，每行一条记录，追加只需写入新行
+    """
+
+    extensions = (".jsonl",)
+
+    def save(self, data: List[Dict[str, Any]], file_path: str) -> bool:
+        return self._write(data, file_path, mode="w")
+
+    def append(self, data: List[Dict[str, Any]], file_path: str) -> bool:
+        return self._write(data, file_path, mode="a")
+
+    def _write(self, data: List[Dict[str, Any]], file_path: str, mode: str) -> bool:
+        """
+        写入JSONL文件
+
+        Args:
+            data: 职位数据列表
+            file_path: 文件路径
+            mode: 文件打开模式，"w"为覆盖，"a"为追加
+
+        Returns:
+            bool: 是否成功写入
+        """
+        try:
+            # 确保目录存在
+            os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+
+            with open(file_path, mode, encoding="utf-8") as f:
+                for record in data:
+                    f.write(json.dumps(_clean_record(record), ensure_ascii=False, default=str))
+                    f.write("\n")
+
+            logger.info(f"成功写入{len(data)}条数据到: {file_path}")
+            return True
+
+        except Exception as e:
+            logger.error(f"写入JSONL文件时出错: {str(e)}")
+            return False
+
+    def iter_batches(self, file_path: str, batch_size: int = 10000) -> Iterator[List[Dict[str, Any]]]:
+        if not os.path.exists(file_path):
+            logger.error(f"文件不存在: {file_path}")
+            return
+
+        batch = []
+        with open(file_path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    batch.append(json.loads(line))
+                except json.JSONDecodeError as e:
+                    # 跳过写入中断导致的残缺行
+                    logger.warning(f"跳过{file_path}第{line_no}行无效记录: {str(e)}")
+                    continue
+
+                if len(batch) >= batch_size:
+                    yield batch
+                    batch = []
+
+        if batch:
+            yield batch
+
+class ParquetStorage(BaseStorage):
+    """
+    Parquet存储后端，按行组写入和流式读取
+
+    Parquet文件写入后不可修改，append会读取全部已有数据后整体重写，
+    开销与文件总行数相关；需要频繁小批量追加时使用JSONL后端。
+    """
+
+    extensions = (".parquet",)
+
+    def __init__(self, row_group_size: int = 10000):
+        """
+        初始化Parquet存储后端
+
+        Args:
+            row_group_size: 每个行组的记录数
+        """
+        if not PARQUET_AVAILABLE:
+            raise ImportError("Parquet存储需要安装pyarrow")
+        self.row_group_size = row_group_size
+
+    def save(self, data: List[Dict[str, Any]], file_path: str) -> bool:
+        try:
+            # 确保目录存在
+            os.makedirs(os.path.dirname(file_path) or ".", exist_ok=True)
+
+            # 通过DataFrame推断所有记录的列，避免只按第一条记录推断schema
+            table = pa.Table.from_pandas(_coerce_object_columns(pd.DataFrame(data)), preserve_index=False)
+            pq.write_table(table, file_path, row_group_size=self.row_group_size)
+
+            logger.info(f"成功保存{len(data)}条数据到: {file_path}")
+            return True
+
+        except Exception as e:
+            logger.error(f"保存Parquet文件时出错: {str(e)}")
+            return False
+
+    def append(self, data: List[Dict[str, Any]], file_path: str) -> bool:
+        # Parquet文件不可原地追加，需读取后整体重写（见类说明）
+        if not os.path.exists(file_path):
+            return self.save(data, file_path)
+        return self.save(self.load(file_path) + list(data), file_path)
+
+    def iter_batches(self, file_path: str, batch_size: int = 10000) -> Iterator[List[Dict[str, Any]]]:
+        if not os.path.exists(file_path):
+            logger.error(f"文件不存在: {file_path}")
+            return
+
+        parquet_file = pq.ParquetFile(file_path)
+        for record_batch in parquet_file.iter_batches(batch_size=batch_size):
+            yield record_batch.to_pylist()
+
+class ExcelStorage(BaseStorage):
+    """
+    Excel存储后端，仅建议用于最终导出，读取时需整体加载
+    """
+
+    extensions = (".xlsx", ".xls")
+
+    def __init__(self):
+        self.excel_handler = excel_handler.ExcelHandler()
+
+    def save(self, data: List[Dict[str, Any]], file_path: str) -> bool:
+        return self.excel_handler.save_to_excel(data, file_path)
+
+    def load(self, file_path: str) -> List[Dict[str, Any]]:
+        return self.excel_handler.load_from_excel(file_path)
+
+    def append(self, data: List[Dict[str, Any]], file_path: str) -> bool:
+        return self.excel_handler.append_to_excel(data, file_path)
+
+    def iter_batches(self, file_path: str, batch_size: int = 10000) -> Iterator[List[Dict[str, Any]]]:
+        data = self.load(file_path)
+        for start in range(0, len(data), batch_size):
+            yield data[start:start + batch_size]
+
+# 格式名称到后端的映射
+STORAGE_BACKENDS = {
+    "jsonl": JsonlStorage,
+    "parquet": ParquetStorage,
+    "excel": ExcelStorage
+}
+
+# 所有支持的数据文件扩展名
+DATA_FILE_EXTENSIONS = tuple(ext for backend in STORAGE_BACKENDS.values() for ext in backend.extensions)
+
+def get_default_format() -> str:
+    """
+    获取中间数据的默认存储格式，pyarrow可用时为parquet，否则为jsonl
+
+    Returns:
+        str: 格式名称
+    """
+    return "parquet" if PARQUET_AVAILABLE else "jsonl"
+
+def get_extension(storage_format: Optional[str] = None) -> str:
+    """
+    获取存储格式对应的文件扩展名
+
+    Args:
+        storage_format: 格式名称，如果为None则使用默认格式
+
+    Returns:
+        str: 文件扩展名（含点号）
+    """
+    storage_format = storage_format or get_default_format()
+    if storage_format not in STORAGE_BACKENDS:
+        raise ValueError(f"不支持的存储格式: {storage_format}")
+    return STORAGE_BACKENDS[storage_format].extensions[0]
+
+def get_storage(file_path: Optional[str] = None, storage_format: Optional[str] = None) -> BaseStorage:
+    """
+    获取存储后端，优先使用指定格式，否则按文件扩展名选择
+
+    Args:
+        file_path: 文件路径
+        storage_format: 格式名称（jsonl、parquet或excel）
+
+    Returns:
+        BaseStorage: 存储后端实例
+    """
+    if storage_format:
+        if storage_format not in STORAGE_BACKENDS:
+            raise ValueError(f"不支持的存储格式: {storage_format}")
+        return STORAGE_BACKENDS[storage_format]()
+
+    if file_path:
+        ext = os.path.splitext(file_path)[1].lower()
+        for backend in STORAGE_BACKENDS.values():
+            if ext in backend.extensions:
+                return backend()
+        raise ValueError(f"无法根据扩展名选择存储后端: {file_path}")
+
+    return STORAGE_BACKENDS[get_default_format()]()
+
+def _is_missing(value: Any) -> bool:
+    """
+    判断值是否缺失（None或NaN）
+    """
+    return value is None or (isinstance(value, float) and math.isnan(value))
+
+def _parse_list_string(value: Any) -> Any:
+    """
+    将列表形式的字符串（例如Excel保存列表后读回的"['Python', 'SQL']"）解析为列表
+
+    Args:
+        value: 原始值
+
+    Returns:
+        Any: 解析成功时返回列表，否则返回原值
+    """
+    if not isinstance(value, str) or not value.strip().startswith("["):
+        return value
+    try:
+        parsed = ast.literal_eval(value.strip())
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        return value
+    return parsed if isinstance(parsed, list) else value
+
+def _coerce_object_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    统一object列中的值类型，使其可以转换为Arrow列
+
+    列表形式的字符串（Excel读回的skills等列）先解析为列表；如果列中的值全部可以解析，
+    或同一列中列表与其他值混用，则无法解析的非列表值包装为单元素列表；
+    其他类型混用时（例如job_id同时有整数和字符串），非缺失值统一转换为字符串。
+
+    Args:
+        df: 原始DataFrame
+
+    Returns:
+        pd.DataFrame: 转换后的DataFrame
+    """
+    df = df.copy()
+    for column in df.columns:
+        # 新版pandas中纯字符串列为str类型而不是object
+        if not (pd.api.types.is_object_dtype(df[column]) or pd.api.types.is_string_dtype(df[column])):
+            continue
+        values = [value for value in df[column] if not _is_missing(value)]
+        parsed = [_parse_list_string(value) for value in values]
+        has_lists = any(isinstance(value, (list, tuple)) for value in values)
+        all_lists = bool(parsed) and all(isinstance(value, (list, tuple)) for value in parsed)
+        if has_lists or all_lists:
+            df[column] = df[column].astype(object).map(_parse_list_string).map(
+                lambda value: None if _is_missing(value)
+                else [str(item) for item in value] if isinstance(value, (list, tuple)) else [str(value)]
+            )
+        elif len({type(value) for value in values}) > 1:
+            df[column] = df[column].map(lambda value: None if _is_missing(value) else str(value))
+    return df
+
+def _clean_record(record: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    清理记录中的NaN值，使其可以序列化为标准JSON
+
+    Args:
+        record: 原始记录
+
+    Returns:
+        Dict[str, Any]: 清理后的记录
+    """
+    return {
+        key: None if isinstance(value, float) and math.isnan(value) else value
+        for key, value in record.items()
+    }
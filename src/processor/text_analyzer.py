@@ -8,7 +8,6 @@
 以生成关键词频率表和相关统计数据。
 """
 
-import re
 import logging
 import numpy as np
 from typing import List, Dict, Any, Optional, Union, Tuple, Set
@@ -17,7 +16,6 @@ from collections import Counter
 from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
 import nltk
 from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
 
 # 导入配置
 import sys
@@ -30,6 +28,9 @@ if project_root not in sys.path:
     sys.path.append(project_root)
 
 from config import TEXT_ANALYSIS_CONFIG
+from src.analyzer.tokenizer import DocumentTokenizer, passthrough_analyzer
+from src.analyzer.keyword_matcher import KeywordMatcher
+from src.analyzer.ranking import select_top_keywords
 
 # 设置日志
 logger = logging.getLogger(__name__)
@@ -42,11 +43,6 @@ class TextAnalyzer:
         初始化文本分析器
         """
         # 下载NLTK资源（如果尚未下载）
-        try:
-            nltk.data.find('tokenizers/punkt')
-        except LookupError:
-            nltk.download('punkt')
-            
         try:
             nltk.data.find('corpora/stopwords')
         except LookupError:
@@ -68,17 +64,29 @@ class TextAnalyzer:
             except Exception as e:
                 logger.error(f"加载技术关键词文件时出错: {str(e)}")
         
-        # 初始化向量化器
+        # 将技术关键词母表编译为多模式匹配自动机
+        self.tech_matcher = KeywordMatcher(self.tech_keywords)
+        
+        # 单次扫描分词器（分词、停用词和词长过滤、n-gram生成）
+        self.tokenizer = DocumentTokenizer(
+            stop_words=self.stop_words,
+            min_word_length=TEXT_ANALYSIS_CONFIG['min_word_length'],
+            remove_numbers=TEXT_ANALYSIS_CONFIG['remove_numbers'],
+            ngram_range=(1, 2)  # 支持单词和双词组合
+        )
+        
+        # 分词并行进程数（大规模语料时使用）
+        self.n_jobs = TEXT_ANALYSIS_CONFIG.get('n_jobs', 1)
+        
+        # 初始化向量化器，直接接收分词器生成的n-gram列表
         self.count_vectorizer = CountVectorizer(
-            stop_words=list(self.stop_words),
-            ngram_range=(1, 2),  # 支持单词和双词组合
+            analyzer=passthrough_analyzer,
             min_df=TEXT_ANALYSIS_CONFIG['min_document_frequency'],
             max_df=TEXT_ANALYSIS_CONFIG['max_document_frequency']
         )
         
         self.tfidf_vectorizer = TfidfVectorizer(
-            stop_words=list(self.stop_words),
-            ngram_range=(1, 2),  # 支持单词和双词组合
+            analyzer=passthrough_analyzer,
             min_df=TEXT_ANALYSIS_CONFIG['min_document_frequency'],
             max_df=TEXT_ANALYSIS_CONFIG['max_document_frequency']
         )
@@ -95,30 +103,78 @@ class TextAnalyzer:
         Returns:
             str: 预处理后的文本
         """
-        if not text:
-            return ""
+        return ' '.join(self.tokenizer.tokenize(text))
+    
+    def _build_count_matrix(self, job_descriptions: List[str]) -> Tuple[Any, np.ndarray, np.ndarray]:
+        """
+        构建文档-词语计数矩阵
+        
+        Args:
+            job_descriptions: 职位描述列表
+        
+        Returns:
+            Tuple: (CSR计数矩阵, 特征名称, 总词频)
+        """
+        # 单次扫描分词并生成n-gram
+        analyzed_docs = self.tokenizer.analyze_corpus(job_descriptions, n_jobs=self.n_jobs)
         
-        # 转换为小写
-        text = text.lower()
+        # 使用CountVectorizer提取词频
+        count_matrix = self.count_vectorizer.fit_transform(analyzed_docs)
         
-        # 移除特殊字符，保留字母、数字和空格
-        text = re.sub(r'[^\w\s]', ' ', text)
+        # 获取特征名称（词语）
+        feature_names = self.count_vectorizer.get_feature_names_out()
+        
+        # 计算总词频
+        word_counts = np.asarray(count_matrix.sum(axis=0)).ravel()
+        
+        return count_matrix, feature_names, word_counts
+    
+    def _select_keyword_indices(self, feature_names: np.ndarray, word_counts: np.ndarray,
+                                top_n: int) -> np.ndarray:
+        """
+        选取前N个关键词的特征索引
         
-        # 移除数字（可选，取决于是否需要保留版本号等信息）
-        if TEXT_ANALYSIS_CONFIG['remove_numbers']:
-            text = re.sub(r'\d+', '', text)
+        Args:
+            feature_names: 特征名称
+            word_counts: 总词频
+            top_n: 返回前N个关键词
         
-        # 分词
-        tokens = word_tokenize(text)
+        Returns:
+            np.ndarray: 特征索引数组
+        """
+        # 如果有技术关键词母表，优先保留母表中的词（白名单以特征索引掩码表示）
+        whitelist_mask = None
+        if self.tech_keywords:
+            whitelist_mask = np.fromiter(
+                (word in self.tech_keywords or self.tech_matcher.contains_any(word)
+                 for word in feature_names),
+                dtype=bool, count=len(feature_names)
+            )
         
-        # 移除停用词
-        tokens = [token for token in tokens if token not in self.stop_words]
+        # 直接在词频向量上选取前N个关键词
+        return select_top_keywords(word_counts, top_n, whitelist_mask)
+    
+    def _format_keywords(self, feature_names: np.ndarray, word_counts: np.ndarray,
+                         indices: np.ndarray) -> List[Dict[str, Any]]:
+        """
+        将选中的特征转换为关键词列表
         
-        # 移除过短的词
-        tokens = [token for token in tokens if len(token) >= TEXT_ANALYSIS_CONFIG['min_word_length']]
+        Args:
+            feature_names: 特征名称
+            word_counts: 总词频
+            indices: 选中的特征索引
         
-        # 重新组合为文本
-        return ' '.join(tokens)
+        Returns:
+            List[Dict[str, Any]]: 关键词列表，包含关键词、频率和分数
+        """
+        return [
+            {
+                "keyword": str(feature_names[i]),
+                "frequency": int(word_counts[i]),
+                "score": float(word_counts[i])  # 使用频率作为分数
+            }
+            for i in indices
+        ]
     
     def extract_traditional_keywords(self, job_descriptions: List[str], top_n: int = 50) -> List[Dict[str, Any]]:
         """
@@ -132,56 +188,10 @@ class TextAnalyzer:
             List[Dict[str, Any]]: 关键词列表，包含关键词、频率和分数
         """
         try:
-            # 预处理文本
-            preprocessed_texts = [self.preprocess_text(text) for text in job_descriptions]
-            
-            # 使用CountVectorizer提取词频
-            count_matrix = self.count_vectorizer.fit_transform(preprocessed_texts)
-            
-            # 获取特征名称（词语）
-            feature_names = self.count_vectorizer.get_feature_names_out()
-            
-            # 计算总词频
-            word_counts = count_matrix.sum(axis=0).A1
-            
-            # 创建词频字典
-            word_freq = {feature_names[i]: int(word_counts[i]) for i in range(len(feature_names))}
-            
-            # 如果有技术关键词母表，优先保留母表中的词
-            if self.tech_keywords:
-                # 过滤关键词
-                filtered_word_freq = {}
-                for word, freq in word_freq.items():
-                    # 检查单词或其小写形式是否在技术关键词母表中
-                    word_lower = word.lower()
-                    if word_lower in self.tech_keywords or any(tech_keyword in word_lower for tech_keyword in self.tech_keywords):
-                        filtered_word_freq[word] = freq
-                
-                # 如果过滤后的词太少，则添加一些高频词
-                if len(filtered_word_freq) < top_n:
-                    # 按频率排序
-                    sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-                    # 添加高频词，直到达到top_n或用完所有词
-                    for word, freq in sorted_words:
-                        if word not in filtered_word_freq:
-                            filtered_word_freq[word] = freq
-                            if len(filtered_word_freq) >= top_n:
-                                break
-                
-                word_freq = filtered_word_freq
-            
-            # 按频率排序并取前N个
-            sorted_keywords = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)[:top_n]
+            _, feature_names, word_counts = self._build_count_matrix(job_descriptions)
+            top_indices = self._select_keyword_indices(feature_names, word_counts, top_n)
             
-            # 转换为所需格式
-            result = [
-                {
-                    "keyword": keyword,
-                    "frequency": freq,
-                    "score": float(freq)  # 使用频率作为分数
-                }
-                for keyword, freq in sorted_keywords
-            ]
+            result = self._format_keywords(feature_names, word_counts, top_indices)
             
             logger.info(f"使用传统方法提取了{len(result)}个关键词")
             return result
@@ -140,6 +140,37 @@ def md5_hash(text: str) -> str:
     """
     return hashlib.md5(text.encode('utf-8')).hexdigest()
 
+_TOKEN_ENCODING = None
+
+def count_tokens(text: str) -> int:
+    """
+    使用tiktoken估算文本的token数量，编码不可用时按字符数粗略估算
+    
+    Args:
+        text: 输入文本
+    
+    Returns:
+        int: token数量
+    """
+    global _TOKEN_ENCODING
+    
+    if not text:
+        return 0
+    
+    if _TOKEN_ENCODING is None:
+        try:
+            import tiktoken
+            _TOKEN_ENCODING = tiktoken.get_encoding("cl100k_base")
+        except Exception as e:
+            logger.warning(f"加载tiktoken编码时出错，使用字符数估算: {str(e)}")
+            _TOKEN_ENCODING = False
+    
+    if _TOKEN_ENCODING:
+        return len(_TOKEN_ENCODING.encode(text))
+    
+    # 粗略估算：平均约4个字符一个token
+    return max(1, len(text) // 4)
+
 def retry_function(func, max_retries: int = 3, delay: float = 1.0, backoff: float = 2.0, 
                  exceptions: tuple = (Exception,), logger=None):
     """
@@ -0,0 +1,250 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+后台任务队列模块
+
+该模块将耗时的爬取、分析和可视化操作提交到有界线程池中后台执行，
+提交时立即返回任务ID。任务状态、进度和结果保存在SQLite中，
+页面刷新或重新连接后仍可按任务ID查询。
+"""
+
+import os
+import json
+import time
+import uuid
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Callable, Iterator
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+# 默认任务数据库路径
+DEFAULT_JOB_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+                                   "data", "jobs.sqlite")
+
+# 任务状态
+STATUS_QUEUED = "queued"
+STATUS_RUNNING = "running"
+STATUS_SUCCEEDED = "succeeded"
+STATUS_FAILED = "failed"
+TERMINAL_STATUSES = (STATUS_SUCCEEDED, STATUS_FAILED)
+
+# 任务状态的显示名称
+STATUS_LABELS = {
+    STATUS_QUEUED: "排队中",
+    STATUS_RUNNING: "运行中",
+    STATUS_SUCCEEDED: "已完成",
+    STATUS_FAILED: "失败",
+}
+
+# 进度回调：progress(完成比例0~1, 说明)
+ProgressCallback = Callable[[float, str], None]
+
+class JobQueue:
+    """
+    后台任务队列类，使用有界线程池执行任务，SQLite持久化任务状态
+    """
+
+    def __init__(self, db_path: Optional[str] = None, max_workers: int = 2):
+        """
+        初始化任务队列
+
+        Args:
+            db_path: 任务数据库路径，如果为None则使用默认路径
+            max_workers: 同时执行的最大任务数，超出的任务排队等待
+        """
+        self.db_path = db_path or DEFAULT_JOB_DB_PATH
+        self.max_workers = max(1, int(max_workers))
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+
+        # 工作线程和Gradio请求线程共用同一连接，写操作由锁串行化
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                kind TEXT NOT NULL,
+                status TEXT NOT NULL,
+                progress REAL NOT NULL DEFAULT 0,
+                message TEXT NOT NULL DEFAULT '',
+                params TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                finished_at REAL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_created_at ON jobs (created_at)")
+
+        # 上次进程退出时未完成的任务无法继续执行，标记为失败
+        with self._conn:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE status IN (?, ?)",
+                (STATUS_FAILED, "服务重启，任务被中断", time.time(), STATUS_QUEUED, STATUS_RUNNING)
+            )
+        if cursor.rowcount:
+            logger.warning(f"{cursor.rowcount}个任务因服务重启被中断")
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job")
+        logger.info(f"任务队列初始化完成，最大并发任务数: {self.max_workers}，数据库: {self.db_path}")
+
+    def _update(self, job_id: str, **fields: Any) -> None:
+        """
+        更新任务记录
+
+        Args:
+            job_id: 任务ID
+            **fields: 要更新的字段
+        """
+        columns = ", ".join(f"{name} = ?" for name in fields)
+        with self._lock, self._conn:
+            self._conn.execute(f"UPDATE jobs SET {columns} WHERE job_id = ?", (*fields.values(), job_id))
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        """
+        将数据库记录转换为任务字典
+        """
+        job = dict(row)
+        job["params"] = json.loads(job["params"])
+        job["result"] = json.loads(job["result"]) if job["result"] is not None else None
+        return job
+
+    def submit(self, kind: str, func: Callable[..., Any], *args: Any, **kwargs: Any) -> str:
+        """
+        提交任务
+
+        Args:
+            kind: 任务类型（如crawl、analyze、visualize）
+            func: 任务函数，以进度回调作为第一个参数调用，返回值应可JSON序列化
+            *args: 任务函数的位置参数
+            **kwargs: 任务函数的关键字参数
+
+        Returns:
+            str: 任务ID
+        """
+        job_id = f"{kind}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{uuid.uuid4().hex[:6]}"
+        params = json.dumps({"args": args, "kwargs": kwargs}, ensure_ascii=False, default=str)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO jobs (job_id, kind, status, params, created_at) VALUES (?, ?, ?, ?, ?)",
+                (job_id, kind, STATUS_QUEUED, params, time.time())
+            )
+
+        self._executor.submit(self._run, job_id, func, args, kwargs)
+        logger.info(f"已提交任务 {job_id}")
+        return job_id
+
+    def _run(self, job_id: str, func: Callable[..., Any], args: tuple, kwargs: Dict[str, Any]) -> None:
+        """
+        在工作线程中执行任务并记录结果
+        """
+        self._update(job_id, status=STATUS_RUNNING, started_at=time.time())
+
+        def progress(fraction: float, message: str = "") -> None:
+            self._update(job_id, progress=min(max(float(fraction), 0.0), 1.0), message=message)
+
+        try:
+            result = func(progress, *args, **kwargs)
+            self._update(job_id, status=STATUS_SUCCEEDED, progress=1.0, finished_at=time.time(),
+                         result=json.dumps(result, ensure_ascii=False, default=str))
+            logger.info(f"任务 {job_id} 已完成")
+        except Exception as e:
+            logger.error(f"任务 {job_id} 执行出错: {str(e)}", exc_info=True)
+            self._update(job_id, status=STATUS_FAILED, error=str(e), finished_at=time.time())
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        查询任务
+
+        Args:
+            job_id: 任务ID
+
+        Returns:
+            Optional[Dict[str, Any]]: 任务字典，不存在时返回None
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return self._to_dict(row) if row is not None else None
+
+    def list_jobs(self, limit: int = 50, kind: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        按提交时间倒序列出任务
+
+        Args:
+            limit: 最大返回数量
+            kind: 只列出该类型的任务，如果为None则列出全部
+
+        Returns:
+            List[Dict[str, Any]]: 任务列表
+        """
+        query = "SELECT * FROM jobs"
+        params: List[Any] = []
+        if kind:
+            query += " WHERE kind = ?"
+            params.append(kind)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        return [self._to_dict(row) for row in rows]
+
+    def watch(self, job_id: str, interval: float = 1.0) -> Iterator[Dict[str, Any]]:
+        """
+        轮询任务状态，状态或进度变化时产出任务字典，任务结束后停止
+
+        Args:
+            job_id: 任务ID
+            interval: 轮询间隔（秒）
+
+        Yields:
+            Dict[str, Any]: 任务字典
+        """
+        last_state = None
+        while True:
+            job = self.get(job_id)
+            if job is None:
+                return
+            state = (job["status"], job["progress"], job["message"])
+            if state != last_state:
+                last_state = state
+                yield job
+            if job["status"] in TERMINAL_STATUSES:
+                return
+            time.sleep(interval)
+
+    def shutdown(self, wait: bool = False) -> None:
+        """
+        关闭任务队列
+
+        Args:
+            wait: 是否等待正在执行的任务完成
+        """
+        self._executor.shutdown(wait=wait)
+        if wait:
+            self._conn.close()
+
+def format_job_status(job: Dict[str, Any]) -> str:
+    """
+    生成任务状态的显示文本
+
+    Args:
+        job: 任务字典
+
+    Returns:
+        str: 显示文本
+    """
+    text = f"[{job['job_id']}] {STATUS_LABELS.get(job['status'], job['status'])} {job['progress'] * 100:.0f}%"
+    if job["message"]:
+        text += f" - {job['message']}"
+    if job["error"]:
+        text += f"\n错误: {job['error']}"
+    return text
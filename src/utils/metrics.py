@@ -0,0 +1,363 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+运行指标模块
+
+该模块提供轻量的计时和吞吐量统计：阶段计时区间（上下文管理器或装饰器）、
+计数器和直方图。区间结束时通过日志输出耗时和处理速率，
+每次运行结束后可导出JSON指标报告或Prometheus文本格式。
+"""
+
+import os
+import json
+import time
+import math
+import bisect
+import functools
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple, Iterator, Callable
+
+# 导入配置
+import sys
+
+# 获取项目根目录
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+# 将项目根目录添加到系统路径
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.utils.logger import get_logger
+
+# 设置日志
+logger = get_logger(__name__)
+
+# Prometheus指标名前缀
+METRIC_PREFIX = "linkedin_keywords"
+
+# 直方图默认分桶上界（秒），覆盖单次API调用到小时级的爬取阶段
+DEFAULT_BUCKETS = (0.01, 0.05, 0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 300, 900, 1800, 3600)
+
+# 指标键：(名称, 排序后的标签元组)
+MetricKey = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+def _make_key(name: str, labels: Dict[str, Any]) -> MetricKey:
+    """
+    构建指标键
+    """
+    return name, tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...], extra: Optional[Dict[str, str]] = None) -> str:
+    """
+    生成Prometheus标签文本
+    """
+    pairs = list(labels) + list((extra or {}).items())
+    if not pairs:
+        return ""
+    escaped = [(key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")) for key, value in pairs]
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+class Histogram:
+    """
+    分桶直方图，记录观测次数、总和、最小值和最大值
+    """
+
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        """
+        初始化直方图
+
+        Args:
+            buckets: 分桶上界（升序）
+        """
+        self.buckets = tuple(buckets)
+        self.bucket_counts = [0] * len(self.buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def observe(self, value: float) -> None:
+        """
+        记录一次观测值
+        """
+        index = bisect.bisect_left(self.buckets, value)
+        if index < len(self.buckets):
+            self.bucket_counts[index] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def summary(self) -> Dict[str, Any]:
+        """
+        获取统计摘要
+
+        Returns:
+            Dict[str, Any]: count、sum、min、max、mean和各分桶的累计次数
+        """
+        cumulative, buckets = 0, {}
+        for bound, count in zip(self.buckets, self.bucket_counts):
+            cumulative += count
+            buckets[str(bound)] = cumulative
+        buckets["+Inf"] = self.count
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "mean": self.sum / self.count if self.count else None,
+            "buckets": buckets,
+        }
+
+class Span:
+    """
+    计时区间，可在区间内累加处理的条目数
+    """
+
+    def __init__(self, name: str, unit: str, items: Optional[float] = None):
+        self.name = name
+        self.unit = unit
+        self.items = items
+        self.elapsed = 0.0
+
+    def add(self, count: float = 1) -> None:
+        """
+        累加区间内处理的条目数
+
+        Args:
+            count: 条目数
+        """
+        self.items = (self.items or 0) + count
+
+class MetricsRegistry:
+    """
+    指标注册表，线程安全
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self.counters: Dict[MetricKey, float] = {}
+        self.histograms: Dict[MetricKey, Histogram] = {}
+        # 阶段名 -> 累计耗时、调用次数、处理条目数和单位
+        self.stages: Dict[str, Dict[str, Any]] = {}
+
+    def inc(self, name: str, value: float = 1, **labels: Any) -> None:
+        """
+        增加计数器
+
+        Args:
+            name: 计数器名称
+            value: 增加量
+            **labels: 标签
+        """
+        key = _make_key(name, labels)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def get_counter(self, name: str, **labels: Any) -> float:
+        """
+        获取计数器当前值
+
+        Args:
+            name: 计数器名称
+            **labels: 标签
+
+        Returns:
+            float: 计数器值，不存在时为0
+        """
+        with self._lock:
+            return self.counters.get(_make_key(name, labels), 0)
+
+    def observe(self, name: str, value: float, buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+                **labels: Any) -> None:
+        """
+        记录直方图观测值
+
+        Args:
+            name: 直方图名称
+            value: 观测值
+            buckets: 首次创建该直方图时使用的分桶上界
+            **labels: 标签
+        """
+        key = _make_key(name, labels)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(buckets)
+            histogram.observe(value)
+
+    @contextmanager
+    def span(self, name: str, items: Optional[float] = None, unit: str = "items") -> Iterator[Span]:
+        """
+        阶段计时区间
+
+        区间结束（包括异常退出）时记录stage_seconds直方图和stage_items_total计数器，
+        并输出耗时和处理速率日志。
+
+        Args:
+            name: 阶段名称
+            items: 已知的处理条目数，也可在区间内通过Span.add累加
+            unit: 条目单位（如jobs、pages、tokens）
+
+        Yields:
+            Span: 计时区间
+        """
+        current = Span(name, unit, items)
+        start_time = time.perf_counter()
+        try:
+            yield current
+        finally:
+            current.elapsed = time.perf_counter() - start_time
+            self.observe("stage_seconds", current.elapsed, stage=name)
+            with self._lock:
+                stage = self.stages.setdefault(name, {"seconds": 0.0, "calls": 0, "items": 0, "unit": unit})
+                stage["seconds"] += current.elapsed
+                stage["calls"] += 1
+                if current.items:
+                    stage["items"] += current.items
+            if current.items:
+                self.inc("stage_items_total", current.items, stage=name, unit=unit)
+                rate = current.items / current.elapsed if current.elapsed > 0 else 0.0
+                logger.info(f"阶段 {name} 耗时{current.elapsed:.2f}秒，处理{current.items:g}{unit}"
+                            f"（{rate:.2f}{unit}/秒）")
+            else:
+                logger.info(f"阶段 {name} 耗时{current.elapsed:.2f}秒")
+
+    def timed(self, name: Optional[str] = None, unit: str = "items") -> Callable:
+        """
+        阶段计时装饰器
+
+        Args:
+            name: 阶段名称，如果为None则使用函数的限定名
+            unit: 条目单位
+
+        Returns:
+            Callable: 装饰器
+        """
+        def decorator(func: Callable) -> Callable:
+            stage_name = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(stage_name, unit=unit):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def report(self) -> Dict[str, Any]:
+        """
+        生成指标报告
+
+        Returns:
+            Dict[str, Any]: 包含各阶段耗时和速率、计数器和直方图摘要的报告
+        """
+        with self._lock:
+            stages = {}
+            for name, stage in self.stages.items():
+                stages[name] = dict(stage)
+                if stage["items"] and stage["seconds"] > 0:
+                    stages[name]["rate_per_second"] = stage["items"] / stage["seconds"]
+                    stages[name]["rate_per_minute"] = stage["items"] / stage["seconds"] * 60
+
+            counters = [{"name": name, "labels": dict(labels), "value": value}
+                        for (name, labels), value in sorted(self.counters.items())]
+            histograms = [{"name": name, "labels": dict(labels), **histogram.summary()}
+                          for (name, labels), histogram in sorted(self.histograms.items())]
+
+        return {
+            "started_at": datetime.fromtimestamp(self.started_at).isoformat(),
+            "generated_at": datetime.now().isoformat(),
+            "wall_seconds": time.time() - self.started_at,
+            "stages": stages,
+            "counters": counters,
+            "histograms": histograms,
+        }
+
+    def write_report(self, file_path: str) -> bool:
+        """
+        保存JSON指标报告
+
+        Args:
+            file_path: 报告路径
+
+        Returns:
+            bool: 是否成功保存
+        """
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+            with open(file_path, 'w', encoding='utf-8') as f:
+                json.dump(self.report(), f, ensure_ascii=False, indent=2)
+            logger.info(f"指标报告已保存到: {file_path}")
+            return True
+        except Exception as e:
+            logger.error(f"保存指标报告时出错: {str(e)}")
+            return False
+
+    def to_prometheus(self) -> str:
+        """
+        导出Prometheus文本格式
+
+        Returns:
+            str: Prometheus文本格式的指标
+        """
+        lines: List[str] = []
+        with self._lock:
+            counter_names = sorted({name for name, _ in self.counters})
+            for name in counter_names:
+                metric = f"{METRIC_PREFIX}_{name}"
+                lines.append(f"# TYPE {metric} counter")
+                for (key_name, labels), value in sorted(self.counters.items()):
+                    if key_name == name:
+                        lines.append(f"{metric}{_format_labels(labels)} {value:g}")
+
+            histogram_names = sorted({name for name, _ in self.histograms})
+            for name in histogram_names:
+                metric = f"{METRIC_PREFIX}_{name}"
+                lines.append(f"# TYPE {metric} histogram")
+                for (key_name, labels), histogram in sorted(self.histograms.items()):
+                    if key_name != name:
+                        continue
+                    for bound, count in histogram.summary()["buckets"].items():
+                        lines.append(f"{metric}_bucket{_format_labels(labels, {'le': bound})} {count}")
+                    lines.append(f"{metric}_sum{_format_labels(labels)} {histogram.sum:g}")
+                    lines.append(f"{metric}_count{_format_labels(labels)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_prometheus(self, file_path: str) -> bool:
+        """
+        保存Prometheus文本格式的指标（可供node_exporter的textfile收集器读取）
+
+        Args:
+            file_path: 输出路径
+
+        Returns:
+            bool: 是否成功保存
+        """
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+            # 先写临时文件再替换，避免收集器读到不完整的内容
+            tmp_path = f"{file_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus())
+            os.replace(tmp_path, file_path)
+            logger.info(f"Prometheus指标已保存到: {file_path}")
+            return True
+        except Exception as e:
+            logger.error(f"保存Prometheus指标时出错: {str(e)}")
+            return False
+
+    def reset(self) -> None:
+        """
+        清空所有指标
+        """
+        with self._lock:
+            self.started_at = time.time()
+            self.counters.clear()
+            self.histograms.clear()
+            self.stages.clear()
+
+# 进程内共享的指标注册表
+metrics = MetricsRegistry()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+限流模块
+
+该模块提供基于令牌桶算法的限流器，用于同时控制每分钟请求数和
+每分钟token数，替代固定的sleep延迟。
+"""
+
+import time
+import threading
+from typing import Optional
+
+# 导入日志模块
+from src.utils.logger import get_logger
+
+# 设置日志
+logger = get_logger(__name__)
+
+class _TokenBucket:
+    """单个令牌桶，按固定速率补充容量"""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        """
+        初始化令牌桶
+
+        Args:
+            capacity: 桶容量
+            refill_per_second: 每秒补充的令牌数
+        """
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.available = capacity
+        self.last_refill = time.monotonic()
+
+    def refill(self, now: float) -> None:
+        """
+        根据经过的时间补充令牌
+
+        Args:
+            now: 当前单调时钟时间
+        """
+        elapsed = now - self.last_refill
+        if elapsed > 0:
+            self.available = min(self.capacity, self.available + elapsed * self.refill_per_second)
+            self.last_refill = now
+
+    def wait_time(self, amount: float) -> float:
+        """
+        计算获得指定数量令牌所需的等待时间
+
+        Args:
+            amount: 需要的令牌数
+
+        Returns:
+            float: 等待秒数，0表示可立即获取
+        """
+        if self.available >= amount:
+            return 0.0
+        return (amount - self.available) / self.refill_per_second
+
+class TokenBucketRateLimiter:
+    """
+    令牌桶限流器，支持每分钟请求数和每分钟token数两个维度，线程安全
+    """
+
+    def __init__(self, requests_per_minute: Optional[float] = None,
+                 tokens_per_minute: Optional[float] = None):
+        """
+        初始化限流器
+
+        Args:
+            requests_per_minute: 每分钟最大请求数，为None或<=0时不限制
+            tokens_per_minute: 每分钟最大token数，为None或<=0时不限制
+        """
+        self._lock = threading.Lock()
+        self._request_bucket = None
+        self._token_bucket = None
+
+        if requests_per_minute and requests_per_minute > 0:
+            self._request_bucket = _TokenBucket(requests_per_minute, requests_per_minute / 60.0)
+        if tokens_per_minute and tokens_per_minute > 0:
+            self._token_bucket = _TokenBucket(tokens_per_minute, tokens_per_minute / 60.0)
+
+    def acquire(self, tokens: int = 0) -> float:
+        """
+        阻塞直到可以发送一个请求（消耗一个请求令牌和指定数量的token）
+
+        Args:
+            tokens: 本次请求预计消耗的token数
+
+        Returns:
+            float: 实际等待的秒数
+        """
+        waited = 0.0
+
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                wait = 0.0
+
+                if self._request_bucket:
+                    self._request_bucket.refill(now)
+                    wait = max(wait, self._request_bucket.wait_time(1))
+
+                # 单次请求超过桶容量时按容量计算，避免永久等待
+                token_amount = 0
+                if self._token_bucket:
+                    token_amount = min(tokens, self._token_bucket.capacity)
+                    self._token_bucket.refill(now)
+                    wait = max(wait, self._token_bucket.wait_time(token_amount))
+
+                if wait <= 0:
+                    if self._request_bucket:
+                        self._request_bucket.available -= 1
+                    if self._token_bucket:
+                        self._token_bucket.available -= token_amount
+                    return waited
+
+            # 在锁外等待，允许其他线程继续补充和检查
+            time.sleep(wait)
+            waited += wait
@@ -0,0 +1,239 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+运行目录模块
+
+该模块用SQLite记录流水线各阶段输出的文件及其元数据（阶段、行数、搜索关键词和地区、
+运行参数、时间），各阶段写文件后登记，界面的文件下拉框直接查询目录，
+无需反复扫描输出目录或打开工作簿。
+"""
+
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Tuple
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+# 默认目录数据库路径
+DEFAULT_CATALOG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))),
+                                    "data", "catalog.sqlite")
+
+# 流水线阶段
+STAGE_RAW = "raw"
+STAGE_PROCESSED = "processed"
+STAGE_KEYWORDS = "keywords"
+STAGE_VISUALIZATION = "visualization"
+
+class RunCatalog:
+    """
+    运行目录类，记录各阶段输出文件的元数据
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        """
+        初始化运行目录
+
+        Args:
+            db_path: 数据库路径，如果为None则使用默认路径
+        """
+        self.db_path = db_path or DEFAULT_CATALOG_PATH
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+
+        # Gradio请求线程和后台任务线程共用同一连接
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS files (
+                path TEXT PRIMARY KEY,
+                stage TEXT NOT NULL,
+                run_id TEXT,
+                row_count INTEGER,
+                keywords TEXT NOT NULL DEFAULT '[]',
+                locations TEXT NOT NULL DEFAULT '[]',
+                params TEXT NOT NULL DEFAULT '{}',
+                source_path TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_files_stage_updated ON files (stage, updated_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def _to_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        """
+        将数据库记录转换为字典
+        """
+        entry = dict(row)
+        entry["keywords"] = json.loads(entry["keywords"])
+        entry["locations"] = json.loads(entry["locations"])
+        entry["params"] = json.loads(entry["params"])
+        return entry
+
+    def record(self, file_path: str, stage: str, row_count: Optional[int] = None,
+               keywords: Optional[List[str]] = None, locations: Optional[List[str]] = None,
+               params: Optional[Dict[str, Any]] = None, run_id: Optional[str] = None,
+               source_path: Optional[str] = None) -> None:
+        """
+        登记输出文件（同一路径重复登记时更新元数据，保留创建时间）
+
+        Args:
+            file_path: 输出文件路径
+            stage: 流水线阶段（raw、processed、keywords、visualization）
+            row_count: 行数（职位数或关键词数）
+            keywords: 搜索关键词，如果为None则沿用来源文件的记录
+            locations: 搜索地区，如果为None则沿用来源文件的记录
+            params: 运行参数
+            run_id: 运行ID（输出文件前缀）
+            source_path: 来源文件路径（上一阶段的输出）
+        """
+        try:
+            # 下游阶段沿用来源文件的搜索条件
+            if source_path and (keywords is None or locations is None):
+                source = self.get(source_path)
+                if source is not None:
+                    keywords = source["keywords"] if keywords is None else keywords
+                    locations = source["locations"] if locations is None else locations
+
+            path = os.path.abspath(file_path)
+            now = time.time()
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT INTO files (path, stage, run_id, row_count, keywords, locations, params, "
+                    "source_path, created_at, updated_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(path) DO UPDATE SET stage = excluded.stage, run_id = excluded.run_id, "
+                    "row_count = excluded.row_count, keywords = excluded.keywords, "
+                    "locations = excluded.locations, params = excluded.params, "
+                    "source_path = excluded.source_path, updated_at = excluded.updated_at",
+                    (path, stage, run_id, row_count,
+                     json.dumps([k.strip() for k in keywords or []], ensure_ascii=False),
+                     json.dumps([l.strip() for l in locations or []], ensure_ascii=False),
+                     json.dumps(params or {}, ensure_ascii=False, default=str),
+                     os.path.abspath(source_path) if source_path else None, now, now)
+                )
+        except Exception as e:
+            logger.error(f"登记输出文件{file_path}时出错: {str(e)}")
+
+    def get(self, file_path: str) -> Optional[Dict[str, Any]]:
+        """
+        查询文件的登记信息
+
+        Args:
+            file_path: 文件路径
+
+        Returns:
+            Optional[Dict[str, Any]]: 登记信息，未登记时返回None
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM files WHERE path = ?",
+                                     (os.path.abspath(file_path),)).fetchone()
+        return self._to_dict(row) if row is not None else None
+
+    def list_files(self, stage: Optional[str] = None, directory: Optional[str] = None,
+                   limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        按更新时间倒序列出登记的文件，并移除已被删除的文件的记录
+
+        Args:
+            stage: 只列出该阶段的文件，如果为None则列出全部
+            directory: 只列出该目录下的文件，如果为None则不限目录
+            limit: 最大返回数量
+
+        Returns:
+            List[Dict[str, Any]]: 登记信息列表
+        """
+        query = "SELECT * FROM files WHERE 1 = 1"
+        params: List[Any] = []
+        if stage:
+            query += " AND stage = ?"
+            params.append(stage)
+        if directory:
+            prefix = os.path.join(os.path.abspath(directory), "")
+            query += " AND substr(path, 1, ?) = ?"
+            params.extend([len(prefix), prefix])
+        query += " ORDER BY updated_at DESC"
+
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+
+        entries, missing = [], []
+        for row in rows:
+            if os.path.exists(row["path"]):
+                entries.append(self._to_dict(row))
+            else:
+                missing.append((row["path"],))
+            if limit and len(entries) >= limit:
+                break
+
+        if missing:
+            with self._lock, self._conn:
+                self._conn.executemany("DELETE FROM files WHERE path = ?", missing)
+            logger.info(f"从运行目录中移除了{len(missing)}个已删除的文件")
+        return entries
+
+    def register_existing(self, directory: str, stage: str, extensions: Tuple[str, ...]) -> int:
+        """
+        登记目录中尚未登记的已有文件（只登记路径和修改时间，不读取文件内容）
+
+        Args:
+            directory: 目录
+            stage: 流水线阶段
+            extensions: 文件扩展名
+
+        Returns:
+            int: 新登记的文件数
+        """
+        if not os.path.isdir(directory):
+            return 0
+
+        with self._lock:
+            known = {row[0] for row in self._conn.execute("SELECT path FROM files")}
+
+        rows = []
+        for file in os.listdir(directory):
+            path = os.path.abspath(os.path.join(directory, file))
+            if path in known or not file.endswith(extensions) or not os.path.isfile(path):
+                continue
+            mtime = os.path.getmtime(path)
+            rows.append((path, stage, mtime, mtime))
+
+        if rows:
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "INSERT OR IGNORE INTO files (path, stage, created_at, updated_at) VALUES (?, ?, ?, ?)", rows
+                )
+            logger.info(f"运行目录登记了{directory}中的{len(rows)}个已有文件")
+        return len(rows)
+
+    def close(self) -> None:
+        """
+        关闭数据库连接
+        """
+        self._conn.close()
+
+def format_catalog_label(entry: Dict[str, Any]) -> str:
+    """
+    生成文件下拉框中显示的标签
+
+    Args:
+        entry: 登记信息
+
+    Returns:
+        str: 标签，包含文件名、行数、搜索条件和更新时间
+    """
+    parts = [os.path.basename(entry["path"])]
+    if entry["row_count"] is not None:
+        parts.append(f"{entry['row_count']}行")
+    if entry["keywords"] or entry["locations"]:
+        parts.append(f"{', '.join(entry['keywords']) or '-'} @ {', '.join(entry['locations']) or '-'}")
+    parts.append(datetime.fromtimestamp(entry["updated_at"]).strftime("%Y-%m-%d %H:%M"))
+    return " | ".join(parts)
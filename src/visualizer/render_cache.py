@@ -0,0 +1,244 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+图表渲染缓存模块
+
+该模块以图表输入数据和渲染参数的哈希作为键，把渲染出的图表文件复制一份
+保存到输出目录下的私有缓存目录（.render_cache）。相同输入再次渲染时，
+将缓存的副本复制为本次请求的文件名；缓存按最近访问时间淘汰，
+总大小超过上限时只删除缓存目录中的副本，不会删除输出目录中的图表。
+"""
+
+import os
+import json
+import time
+import shutil
+import sqlite3
+import logging
+from typing import Dict, Any, List, Optional
+
+# 导入配置
+import sys
+
+# 获取项目根目录
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "../.."))
+# 将项目根目录添加到系统路径
+if project_root not in sys.path:
+    sys.path.append(project_root)
+
+from src.utils.helpers import md5_hash
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+# 图表可能输出的文件扩展名（同名的HTML和PNG属于同一个图表）
+OUTPUT_EXTENSIONS = [".html", ".png"]
+
+class RenderCache:
+    """图表渲染缓存类，支持命中统计和按大小LRU淘汰"""
+
+    def __init__(self, output_dir: str, max_size_mb: float = 200):
+        """
+        初始化缓存
+
+        Args:
+            output_dir: 可视化输出目录，缓存目录和索引文件保存在该目录下的.render_cache中
+            max_size_mb: 缓存图表副本的最大总容量（MB），超过后按最近访问时间淘汰
+        """
+        self.output_dir = output_dir
+        self.cache_dir = os.path.join(output_dir, ".render_cache")
+        self.cache_path = os.path.join(self.cache_dir, "index.sqlite")
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+        # 渲染进程池中的多个进程可能同时写入索引
+        self._conn = sqlite3.connect(self.cache_path, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS renders (
+                cache_key TEXT PRIMARY KEY,
+                output_path TEXT NOT NULL,
+                files TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_renders_accessed_at ON renders (accessed_at)")
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(method: str, args: tuple, kwargs: Dict[str, Any], settings: Dict[str, Any]) -> str:
+        """
+        构建缓存键
+
+        Args:
+            method: 渲染方法名
+            args: 位置参数（图表输入数据）
+            kwargs: 关键字参数（不应包含输出文件名）
+            settings: 影响渲染结果的可视化器设置
+
+        Returns:
+            str: 缓存键
+        """
+        payload = json.dumps(
+            {"method": method, "args": args, "kwargs": kwargs, "settings": settings},
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        return md5_hash(payload)
+
+    @staticmethod
+    def _file_state(path: str) -> Optional[List[int]]:
+        """
+        获取文件的修改时间和大小，文件不存在时返回None
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    @staticmethod
+    def _copy_file(source: str, target: str) -> None:
+        """
+        复制文件，先写入临时文件再替换，避免并行渲染进程读到不完整的文件
+        """
+        temp_path = f"{target}.{os.getpid()}.tmp"
+        shutil.copyfile(source, temp_path)
+        os.replace(temp_path, target)
+
+    def _remove_files(self, files: Dict[str, Any]) -> None:
+        """
+        删除缓存目录中的图表副本（不在缓存目录中的路径不删除）
+        """
+        for path in files:
+            if os.path.dirname(os.path.abspath(path)) != os.path.abspath(self.cache_dir):
+                continue
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def get(self, cache_key: str, filename: str) -> Optional[str]:
+        """
+        获取已渲染的图表，并复制为请求的文件名
+
+        Args:
+            cache_key: 缓存键
+            filename: 本次请求的输出文件名（不含扩展名），与原图表保存在同一目录
+
+        Returns:
+            Optional[str]: 图表路径，未命中、缓存副本已损坏或复制失败时返回None
+        """
+        row = self._conn.execute(
+            "SELECT output_path, files FROM renders WHERE cache_key = ?", (cache_key,)
+        ).fetchone()
+
+        if row is not None:
+            files = json.loads(row[1])
+            if all(self._file_state(path) == state for path, state in files.items()):
+                target_stem = os.path.join(os.path.dirname(row[0]), filename)
+                try:
+                    for path in files:
+                        self._copy_file(path, target_stem + os.path.splitext(path)[1])
+                except OSError as e:
+                    logger.warning(f"复制缓存的图表时出错: {str(e)}")
+                else:
+                    with self._conn:
+                        self._conn.execute("UPDATE renders SET accessed_at = ? WHERE cache_key = ?",
+                                           (time.time(), cache_key))
+                    self.hits += 1
+                    return target_stem + os.path.splitext(row[0])[1]
+            else:
+                # 缓存副本已被删除或修改，移除记录和剩余副本
+                with self._conn:
+                    self._conn.execute("DELETE FROM renders WHERE cache_key = ?", (cache_key,))
+                self._remove_files(files)
+
+        self.misses += 1
+        return None
+
+    def set(self, cache_key: str, output_path: str) -> None:
+        """
+        记录渲染结果，将图表文件（同名的HTML和PNG）复制到缓存目录
+
+        Args:
+            cache_key: 缓存键
+            output_path: 渲染方法返回的图表路径
+        """
+        stem = os.path.splitext(output_path)[0]
+        files = {}
+        try:
+            for extension in OUTPUT_EXTENSIONS:
+                if not os.path.exists(stem + extension):
+                    continue
+                cached_path = os.path.join(self.cache_dir, cache_key + extension)
+                self._copy_file(stem + extension, cached_path)
+                files[cached_path] = self._file_state(cached_path)
+        except OSError as e:
+            logger.warning(f"缓存图表时出错: {str(e)}")
+            self._remove_files(files)
+            return
+        if not files:
+            return
+
+        size = sum(state[1] for state in files.values())
+        now = time.time()
+        with self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO renders (cache_key, output_path, files, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (cache_key, output_path, json.dumps(files), size, now, now)
+            )
+        self._evict()
+
+    def _evict(self) -> None:
+        """
+        总大小超过上限时，按最近访问时间删除最久未使用的缓存副本
+        """
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM renders").fetchone()[0]
+        if total <= self.max_size_bytes:
+            return
+
+        evicted = 0
+        rows = self._conn.execute("SELECT cache_key, files, size FROM renders ORDER BY accessed_at").fetchall()
+        with self._conn:
+            for cache_key, files, size in rows:
+                if total <= self.max_size_bytes:
+                    break
+                self._remove_files(json.loads(files))
+                self._conn.execute("DELETE FROM renders WHERE cache_key = ?", (cache_key,))
+                total -= size
+                evicted += 1
+
+        logger.info(f"渲染缓存超出容量，淘汰了{evicted}个图表")
+
+    def clear(self) -> None:
+        """
+        清空缓存记录和缓存目录中的图表副本（不删除输出目录中的图表）
+        """
+        rows = self._conn.execute("SELECT files FROM renders").fetchall()
+        with self._conn:
+            self._conn.execute("DELETE FROM renders")
+        for (files,) in rows:
+            self._remove_files(json.loads(files))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        获取缓存统计
+
+        Returns:
+            Dict[str, Any]: 条目数、总大小和命中统计
+        """
+        entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM renders").fetchone()
+        return {"entries": entries, "size_bytes": size, "hits": self.hits, "misses": self.misses}
+
+    def close(self) -> None:
+        """
+        关闭数据库连接
+        """
+        self._conn.close()
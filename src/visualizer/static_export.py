@@ -0,0 +1,125 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+静态图片导出模块
+
+Plotly的fig.write_image默认每次调用都单独启动一次Kaleido导出进程（Chrome），
+批量生成图表时大部分时间花在启动上。该模块维护一个进程内常驻的Kaleido
+导出服务，可视化器在多个图表和多次Gradio请求之间复用，并提供批量导出接口。
+"""
+
+import atexit
+import logging
+import threading
+from typing import List, Any
+
+import plotly.io as pio
+
+# Kaleido 1.x提供常驻的同步导出服务；旧版本由plotly自行维护导出子进程
+KALEIDO_SERVER_AVAILABLE = False
+try:
+    import kaleido
+    KALEIDO_SERVER_AVAILABLE = hasattr(kaleido, "start_sync_server")
+except ImportError:
+    pass
+
+# 设置日志
+logger = logging.getLogger(__name__)
+
+class StaticExporter:
+    """
+    Plotly静态图片导出器
+    """
+
+    def __init__(self, persistent: bool = True):
+        """
+        初始化导出器
+
+        Args:
+            persistent: 是否使用常驻导出服务，False时每次导出单独启动Kaleido
+        """
+        self.persistent = persistent and KALEIDO_SERVER_AVAILABLE
+        self.exports = 0
+        self._started = False
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        """
+        启动常驻导出服务（重复调用无副作用）
+        """
+        if not self.persistent or self._started:
+            return
+
+        with self._lock:
+            if self._started:
+                return
+            try:
+                kaleido.start_sync_server(silence_warnings=True)
+                atexit.register(self.stop)
+                logger.info("Kaleido常驻导出服务已启动")
+            except Exception as e:
+                # 启动失败时退回到每次导出单独启动
+                logger.warning(f"启动Kaleido常驻导出服务失败，改为逐次导出: {str(e)}")
+                self.persistent = False
+            self._started = True
+
+    def write_image(self, fig: Any, path: str, **kwargs: Any) -> None:
+        """
+        导出单个图表
+
+        Args:
+            fig: Plotly图表
+            path: 输出路径，格式由扩展名决定
+            **kwargs: 传递给write_image的其他参数（如width、height、scale）
+        """
+        self.start()
+        fig.write_image(path, **kwargs)
+        self.exports += 1
+
+    def write_images(self, figs: List[Any], paths: List[str]) -> None:
+        """
+        批量导出图表
+
+        Args:
+            figs: Plotly图表列表
+            paths: 与图表对应的输出路径列表
+        """
+        self.start()
+        if hasattr(pio, "write_images"):
+            pio.write_images(figs, paths)
+        else:
+            for fig, path in zip(figs, paths):
+                fig.write_image(path)
+        self.exports += len(figs)
+
+    def stop(self) -> None:
+        """
+        关闭常驻导出服务
+        """
+        with self._lock:
+            if not self._started:
+                return
+            if self.persistent:
+                try:
+                    kaleido.stop_sync_server(silence_warnings=True)
+                except Exception as e:
+                    logger.warning(f"关闭Kaleido常驻导出服务时出错: {str(e)}")
+            self._started = False
+
+# 进程内共享的导出器
+_shared_exporter = None
+_shared_lock = threading.Lock()
+
+def get_exporter() -> StaticExporter:
+    """
+    获取进程内共享的常驻导出器
+
+    Returns:
+        StaticExporter: 导出器
+    """
+    global _shared_exporter
+    with _shared_lock:
+        if _shared_exporter is None:
+            _shared_exporter = StaticExporter(persistent=True)
+        return _shared_exporter
@@ -9,10 +9,14 @@
 """
 
 import os
+import time
+import inspect
 import logging
+import functools
 import numpy as np
 import pandas as pd
 from typing import List, Dict, Any, Optional, Union, Tuple
+from concurrent.futures import ProcessPoolExecutor
 
 # 可视化库
 import matplotlib.pyplot as plt
@@ -32,6 +36,10 @@ if project_root not in sys.path:
     sys.path.append(project_root)
 
 from config import VISUALIZATION_CONFIG
+from src.analyzer.keyword_matcher import KeywordMatcher
+from src.visualizer.render_cache import RenderCache
+from src.visualizer.static_export import StaticExporter, get_exporter
+from src.utils.metrics import metrics
 
 # 设置日志
 logger = logging.getLogger(__name__)
@@ -43,15 +51,44 @@ try:
 except Exception as e:
     logger.warning(f"设置Matplotlib中文字体时出错: {str(e)}")
 
+def cached_render(method):
+    """
+    渲染缓存装饰器：以图表输入数据、渲染参数和可视化器设置的哈希为键，
+    命中时将缓存的图表复制为本次请求的文件名并返回其路径（输出文件名不参与哈希）
+    """
+    default_filename = inspect.signature(method).parameters["filename"].default
+    
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self.render_cache is None:
+            return method(self, *args, **kwargs)
+        
+        key_kwargs = {name: value for name, value in kwargs.items() if name != "filename"}
+        cache_key = RenderCache.make_key(method.__name__, args, key_kwargs, self._render_settings())
+        cached_path = self.render_cache.get(cache_key, kwargs.get("filename", default_filename))
+        if cached_path:
+            logger.info(f"使用缓存的图表: {cached_path}")
+            return cached_path
+        
+        output_path = method(self, *args, **kwargs)
+        if output_path:
+            self.render_cache.set(cache_key, output_path)
+        return output_path
+    
+    return wrapper
+
 class Visualizer:
     """可视化类，用于生成各种可视化图表"""
     
-    def __init__(self, output_dir: str = None):
+    def __init__(self, output_dir: str = None, use_cache: Optional[bool] = None,
+                 persistent_export: Optional[bool] = None):
         """
         初始化可视化器
         
         Args:
             output_dir: 输出目录，如果为None则使用当前目录
+            use_cache: 是否启用渲染缓存，如果为None则使用配置（默认启用）
+            persistent_export: 是否使用常驻的Kaleido导出服务，如果为None则使用配置（默认启用）
         """
         self.output_dir = output_dir or os.path.join(project_root, 'output', 'visualizations')
         os.makedirs(self.output_dir, exist_ok=True)
@@ -66,8 +103,59 @@ class Visualizer:
         # 设置DPI
         self.dpi = VISUALIZATION_CONFIG['dpi']
         
+        # 最近一次generate_all_visualizations的各图表渲染耗时（秒）
+        self.render_timings: Dict[str, float] = {}
+        
+        # Plotly静态图片导出器：默认复用进程内常驻的Kaleido导出服务
+        if persistent_export is None:
+            persistent_export = VISUALIZATION_CONFIG.get('persistent_export', True)
+        self.persistent_export = persistent_export
+        if persistent_export:
+            self.exporter = get_exporter()
+        else:
+            self.exporter = StaticExporter(persistent=False)
+        
+        # 渲染缓存：相同输入的图表直接返回已有文件
+        cache_config = VISUALIZATION_CONFIG.get('render_cache', {})
+        if use_cache is None:
+            use_cache = cache_config.get('enabled', True)
+        self.render_cache = None
+        if use_cache:
+            self.render_cache = RenderCache(self.output_dir, cache_config.get('max_size_mb', 200))
+        
         logger.info(f"可视化器初始化完成，输出目录: {self.output_dir}")
     
+    def _render_settings(self) -> Dict[str, Any]:
+        """
+        获取影响渲染结果的设置，作为渲染缓存键的一部分
+        
+        Returns:
+            Dict[str, Any]: 设置字典
+        """
+        return {
+            "output_dir": self.output_dir,
+            "color_palette": self.color_palette,
+            "figure_width": self.figure_width,
+            "figure_height": self.figure_height,
+            "dpi": self.dpi,
+        }
+    
+    def _worker_settings(self) -> Dict[str, Any]:
+        """
+        获取渲染进程中创建可视化器所需的设置，使子进程与当前实例的缓存、导出和图表设置一致
+        
+        Returns:
+            Dict[str, Any]: 设置字典
+        """
+        settings = self._render_settings()
+        settings.update({
+            "use_cache": self.render_cache is not None,
+            "cache_max_size_bytes": self.render_cache.max_size_bytes if self.render_cache else None,
+            "persistent_export": self.persistent_export,
+        })
+        return settings
+    
+    @cached_render
     def generate_wordcloud(self, keywords: List[Dict[str, Any]], 
                           title: str = "关键词词云", 
                           filename: str = "wordcloud",
@@ -124,6 +212,7 @@ class Visualizer:
             logger.error(f"生成词云图时出错: {str(e)}")
             return ""
     
+    @cached_render
     def generate_bar_chart(self, keywords: List[Dict[str, Any]], 
                           title: str = "关键词频率", 
                           filename: str = "bar_chart",
@@ -183,7 +272,7 @@ class Visualizer:
                 
                 # 同时保存为图片
                 img_path = os.path.join(self.output_dir, f"{filename}.png")
-                fig.write_image(img_path)
+                self.exporter.write_image(fig, img_path)
                 
             else:
                 # 使用Matplotlib创建静态条形图
@@ -206,13 +295,15 @@ class Visualizer:
             logger.error(f"生成条形图时出错: {str(e)}")
             return ""
     
+    @cached_render
     def generate_heatmap(self, jobs: List[Dict[str, Any]], 
                         keywords: List[Dict[str, Any]],
                         title: str = "职位-关键词热力图", 
                         filename: str = "heatmap",
                         top_n_jobs: int = 20,
                         top_n_keywords: int = 20,
-                        use_plotly: bool = True) -> str:
+                        use_plotly: bool = True,
+                        row_order: Optional[str] = None) -> str:
         """
         生成热力图
         
@@ -224,6 +315,7 @@ class Visualizer:
             top_n_jobs: 显示前N个职位
             top_n_keywords: 显示前N个关键词
             use_plotly: 是否使用Plotly生成交互式图表
+            row_order: 行排序方式，None保持原顺序，score按匹配程度降序，cluster按层次聚类排列
         
         Returns:
             str: 保存的文件路径
@@ -237,25 +329,17 @@ class Visualizer:
             top_jobs = jobs[:top_n_jobs]
             
             # 创建矩阵
-            matrix = np.zeros((len(top_jobs), len(top_keywords)))
-            
-            # 填充矩阵
-            for i, job in enumerate(top_jobs):
-                job_skills = [skill.lower() for skill in job.get("skills", [])]
-                job_desc = job.get("job_description", "").lower()
-                
-                for j, keyword in enumerate(top_keywords):
-                    keyword_lower = keyword.lower()
-                    # 检查关键词是否在技能列表中
-                    if keyword_lower in job_skills:
-                        matrix[i, j] = 1
-                    # 检查关键词是否在职位描述中
-                    elif keyword_lower in job_desc:
-                        matrix[i, j] = 0.5
+            matrix = self.build_job_keyword_matrix(top_jobs, top_keywords)
             
             # 提取职位标题
             job_titles = [f"{job.get('job_title', '')} ({job.get('company', '')})" for job in top_jobs]
             
+            # 按需调整行顺序
+            if row_order and len(top_jobs) > 1:
+                order = self._order_rows(matrix, row_order)
+                matrix = matrix[order]
+                job_titles = [job_titles[i] for i in order]
+            
             if use_plotly:
                 # 使用Plotly创建交互式热力图
                 fig = go.Figure(data=go.Heatmap(
@@ -282,7 +366,7 @@ class Visualizer:
                 
                 # 同时保存为图片
                 img_path = os.path.join(self.output_dir, f"{filename}.png")
-                fig.write_image(img_path)
+                self.exporter.write_image(fig, img_path)
                 
             else:
                 # 使用Seaborn创建静态热力图
@@ -311,6 +395,147 @@ class Visualizer:
             logger.error(f"生成热力图时出错: {str(e)}")
             return ""
     
+    def build_job_keyword_matrix(self, jobs: List[Dict[str, Any]], keywords: List[str]) -> np.ndarray:
+        """
+        构建职位×关键词矩阵：关键词在技能列表中为1，仅在职位描述中出现为0.5
+        
+        每个职位描述只用多模式匹配自动机扫描一次，技能使用集合判断。
+        
+        Args:
+            jobs: 职位列表
+            keywords: 关键词列表
+        
+        Returns:
+            np.ndarray: 职位×关键词矩阵
+        """
+        matrix = np.zeros((len(jobs), len(keywords)))
+        if not jobs or not keywords:
+            return matrix
+        
+        # 同一关键词（忽略大小写）可能对应多列
+        columns: Dict[str, List[int]] = {}
+        for j, keyword in enumerate(keywords):
+            columns.setdefault(keyword.lower(), []).append(j)
+        matcher = KeywordMatcher(columns.keys())
+        
+        desc_rows, desc_cols, skill_rows, skill_cols = [], [], [], []
+        for i, job in enumerate(jobs):
+            for keyword in matcher.find_all(job.get("job_description", "").lower()):
+                desc_cols.extend(columns[keyword])
+                desc_rows.extend([i] * len(columns[keyword]))
+            
+            job_skills = {skill.lower() for skill in job.get("skills", [])}
+            for keyword in job_skills.intersection(columns):
+                skill_cols.extend(columns[keyword])
+                skill_rows.extend([i] * len(columns[keyword]))
+        
+        # 技能列表优先于职位描述
+        matrix[desc_rows, desc_cols] = 0.5
+        matrix[skill_rows, skill_cols] = 1
+        return matrix
+    
+    def _order_rows(self, matrix: np.ndarray, row_order: str) -> np.ndarray:
+        """
+        计算热力图的行顺序
+        
+        Args:
+            matrix: 职位×关键词矩阵
+            row_order: 排序方式，score或cluster
+        
+        Returns:
+            np.ndarray: 行索引顺序
+        """
+        if row_order == "cluster":
+            from scipy.cluster.hierarchy import linkage, leaves_list
+            return leaves_list(linkage(matrix, method="average", metric="euclidean"))
+        if row_order == "score":
+            return np.argsort(-matrix.sum(axis=1), kind="stable")
+        logger.warning(f"不支持的行排序方式: {row_order}，保持原顺序")
+        return np.arange(matrix.shape[0])
+    
+    @cached_render
+    def generate_segment_heatmap(self, segment_table: Dict[str, Any],
+                                 title: str = "分组-关键词热力图",
+                                 filename: str = "segment_heatmap",
+                                 value: str = "job_share",
+                                 top_n_segments: int = 20,
+                                 top_n_keywords: int = 20,
+                                 use_plotly: bool = True) -> str:
+        """
+        根据分组关键词统计表生成热力图
+        
+        Args:
+            segment_table: 分组×关键词统计表（HybridAnalyzer.extract_segment_keywords的结果之一）
+            title: 图表标题
+            filename: 输出文件名（不含扩展名）
+            value: 显示的数值，job_share（分组内提及比例）或counts（词频）
+            top_n_segments: 显示前N个分组（统计表已按职位数降序排列）
+            top_n_keywords: 显示前N个关键词
+            use_plotly: 是否使用Plotly生成交互式图表
+        
+        Returns:
+            str: 保存的文件路径
+        """
+        try:
+            matrix = np.asarray(segment_table[value], dtype=float)[:top_n_segments, :top_n_keywords]
+            keywords = segment_table["keywords"][:top_n_keywords]
+            segments = [f"{segment} ({count})" for segment, count in
+                        zip(segment_table["segments"][:top_n_segments], segment_table["job_counts"])]
+            
+            if use_plotly:
+                fig = go.Figure(data=go.Heatmap(
+                    z=matrix,
+                    x=keywords,
+                    y=segments,
+                    colorscale=self.color_palette,
+                    showscale=True
+                ))
+                
+                fig.update_layout(
+                    title=title,
+                    xaxis_title="关键词",
+                    yaxis_title="分组",
+                    height=max(500, len(segments) * 25),  # 动态调整高度
+                    width=max(700, len(keywords) * 40),  # 动态调整宽度
+                    xaxis=dict(tickangle=-45),
+                    template="plotly_white"
+                )
+                
+                # 保存为HTML
+                output_path = os.path.join(self.output_dir, f"{filename}.html")
+                fig.write_html(output_path)
+                
+                # 同时保存为图片
+                img_path = os.path.join(self.output_dir, f"{filename}.png")
+                self.exporter.write_image(fig, img_path)
+                
+            else:
+                plt.figure(figsize=(max(self.figure_width, len(keywords) * 0.4), 
+                                   max(self.figure_height, len(segments) * 0.3)), 
+                          dpi=self.dpi)
+                
+                sns.heatmap(matrix, annot=False, cmap=self.color_palette,
+                          xticklabels=keywords, yticklabels=segments)
+                
+                plt.title(title)
+                plt.xlabel("关键词")
+                plt.ylabel("分组")
+                plt.xticks(rotation=45, ha="right")
+                plt.tight_layout()
+                
+                # 保存图表
+                output_path = os.path.join(self.output_dir, f"{filename}.png")
+                plt.savefig(output_path, dpi=self.dpi)
+                plt.close()
+            
+            logger.info(f"成功生成分组热力图: {output_path}")
+            return output_path
+            
+        except Exception as e:
+            logger.error(f"生成分组热力图时出错: {str(e)}")
+            return ""
+    
+    @cached_render
     def generate_pie_chart(self, keywords: List[Dict[str, Any]], 
                          title: str = "关键词占比", 
                          filename: str = "pie_chart",
@@ -361,7 +586,7 @@ class Visualizer:
                 
                 # 同时保存为图片
                 img_path = os.path.join(self.output_dir, f"{filename}.png")
-                fig.write_image(img_path)
+                self.exporter.write_image(fig, img_path)
                 
             else:
                 # 使用Matplotlib创建静态饼图
@@ -384,89 +609,111 @@ class Visualizer:
             logger.error(f"生成饼图时出错: {str(e)}")
             return ""
     
+    def _build_chart_tasks(self, jobs: List[Dict[str, Any]],
+                           keyword_data: Dict[str, Any],
+                           prefix: str = "") -> List[Tuple[str, str, tuple, Dict[str, Any]]]:
+        """
+        生成所有图表的渲染任务列表，各任务相互独立
+        
+        Args:
+            jobs: 职位列表
+            keyword_data: 关键词数据
+            prefix: 文件名前缀（已包含下划线）
+        
+        Returns:
+            List[Tuple]: (图表名, 方法名, 位置参数, 关键字参数)列表
+        """
+        tasks = []
+        
+        # 各类关键词的词云和条形图
+        for source, label in [("hybrid", "混合关键词"), ("llm", "LLM提取关键词"), ("traditional", "传统方法关键词")]:
+            source_keywords = keyword_data.get(f"{source}_keywords")
+            if not source_keywords:
+                continue
+            tasks.append((f"{source}_wordcloud", "generate_wordcloud", (source_keywords,),
+                          {"title": f"{label}词云", "filename": f"{prefix}{source}_wordcloud"}))
+            tasks.append((f"{source}_bar", "generate_bar_chart", (source_keywords,),
+                          {"title": f"{label}频率", "filename": f"{prefix}{source}_bar", "use_plotly": True}))
+        
+        # 生成热力图
+        if keyword_data.get("hybrid_keywords") and jobs:
+            tasks.append(("heatmap", "generate_heatmap", (jobs, keyword_data["hybrid_keywords"]),
+                          {"title": "职位-关键词热力图", "filename": f"{prefix}heatmap", "use_plotly": True}))
+        
+        # 生成饼图
+        if keyword_data.get("hybrid_keywords"):
+            tasks.append(("pie_chart", "generate_pie_chart", (keyword_data["hybrid_keywords"],),
+                          {"title": "关键词占比", "filename": f"{prefix}pie_chart", "use_plotly": True}))
+        
+        # 生成分组热力图
+        for field, table in keyword_data.get("segment_keywords", {}).items():
+            tasks.append((f"segment_heatmap_{field}", "generate_segment_heatmap", (table,),
+                          {"title": f"{field}-关键词热力图", "filename": f"{prefix}segment_heatmap_{field}",
+                           "use_plotly": True}))
+        
+        return tasks
+    
     def generate_all_visualizations(self, jobs: List[Dict[str, Any]], 
                                   keyword_data: Dict[str, Any],
-                                  prefix: str = "") -> Dict[str, str]:
+                                  prefix: str = "",
+                                  max_workers: Optional[int] = None,
+                                  chart_types: Optional[List[str]] = None,
+                                  use_plotly: Optional[bool] = None) -> Dict[str, str]:
         """
-        生成所有可视化图表
+        生成所有可视化图表（配置中的render_workers只对该方法生效）
         
         Args:
             jobs: 职位列表
             keyword_data: 关键词数据，包含traditional_keywords、llm_keywords和hybrid_keywords
             prefix: 文件名前缀
+            max_workers: 并行渲染的进程数，如果为None则使用配置中的render_workers；<=1时依次渲染
+            chart_types: 要生成的图表类型（wordcloud、bar_chart、heatmap、pie_chart、segment_heatmap），
+                如果为None则生成全部
+            use_plotly: 是否使用Plotly渲染支持两种方式的图表，如果为None则使用各图表的默认设置
         
         Returns:
             Dict[str, str]: 图表路径字典
         """
         try:
-            result = {}
-            
             # 添加前缀
             prefix = f"{prefix}_" if prefix else ""
             
-            # 生成混合关键词词云
-            if "hybrid_keywords" in keyword_data and keyword_data["hybrid_keywords"]:
-                result["hybrid_wordcloud"] = self.generate_wordcloud(
-                    keyword_data["hybrid_keywords"],
-                    title="混合关键词词云",
-                    filename=f"{prefix}hybrid_wordcloud"
-                )
-                
-                result["hybrid_bar"] = self.generate_bar_chart(
-                    keyword_data["hybrid_keywords"],
-                    title="混合关键词频率",
-                    filename=f"{prefix}hybrid_bar",
-                    use_plotly=True
-                )
+            tasks = self._build_chart_tasks(jobs, keyword_data, prefix)
+            if chart_types is not None:
+                tasks = [task for task in tasks if task[1][len("generate_"):] in chart_types]
+            if use_plotly is not None:
+                for _, _, _, kwargs in tasks:
+                    if "use_plotly" in kwargs:
+                        kwargs["use_plotly"] = use_plotly
+            if not tasks:
+                return {}
             
-            # 生成LLM关键词词云
-            if "llm_keywords" in keyword_data and keyword_data["llm_keywords"]:
-                result["llm_wordcloud"] = self.generate_wordcloud(
-                    keyword_data["llm_keywords"],
-                    title="LLM提取关键词词云",
-                    filename=f"{prefix}llm_wordcloud"
-                )
-                
-                result["llm_bar"] = self.generate_bar_chart(
-                    keyword_data["llm_keywords"],
-                    title="LLM提取关键词频率",
-                    filename=f"{prefix}llm_bar",
-                    use_plotly=True
-                )
+            if max_workers is None:
+                max_workers = VISUALIZATION_CONFIG.get('render_workers', 1)
+            max_workers = min(max_workers, len(tasks))
             
-            # 生成传统关键词词云
-            if "traditional_keywords" in keyword_data and keyword_data["traditional_keywords"]:
-                result["traditional_wordcloud"] = self.generate_wordcloud(
-                    keyword_data["traditional_keywords"],
-                    title="传统方法关键词词云",
-                    filename=f"{prefix}traditional_wordcloud"
-                )
-                
-                result["traditional_bar"] = self.generate_bar_chart(
-                    keyword_data["traditional_keywords"],
-                    title="传统方法关键词频率",
-                    filename=f"{prefix}traditional_bar",
-                    use_plotly=True
-                )
+            start_time = time.perf_counter()
+            result = {}
+            self.render_timings = {}
             
-            # 生成热力图
-            if "hybrid_keywords" in keyword_data and keyword_data["hybrid_keywords"] and jobs:
-                result["heatmap"] = self.generate_heatmap(
-                    jobs,
-                    keyword_data["hybrid_keywords"],
-                    title="职位-关键词热力图",
-                    filename=f"{prefix}heatmap",
-                    use_plotly=True
-                )
+            if max_workers <= 1:
+                for name, method, args, kwargs in tasks:
+                    _, result[name], self.render_timings[name] = _render_chart(self, name, method, args, kwargs)
+            else:
+                # 各图表相互独立，分发到进程池并行渲染
+                with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_render_worker,
+                                         initargs=(self._worker_settings(),)) as executor:
+                    futures = [executor.submit(_render_chart, None, name, method, args, kwargs)
+                               for name, method, args, kwargs in tasks]
+                    for future in futures:
+                        name, path, elapsed = future.result()
+                        result[name] = path
+                        self.render_timings[name] = elapsed
             
-            # 生成饼图
-            if "hybrid_keywords" in keyword_data and keyword_data["hybrid_keywords"]:
-                result["pie_chart"] = self.generate_pie_chart(
-                    keyword_data["hybrid_keywords"],
-                    title="关键词占比",
-                    filename=f"{prefix}pie_chart",
-                    use_plotly=True
-                )
+            total_time = time.perf_counter() - start_time
+            self._log_render_timings(total_time, max_workers)
+            for name, elapsed in self.render_timings.items():
+                metrics.observe("chart_render_seconds", elapsed, chart=name)
             
             logger.info(f"成功生成所有可视化图表，共{len(result)}个")
             return result
@@ -474,6 +721,61 @@ class Visualizer:
         except Exception as e:
             logger.error(f"生成所有可视化图表时出错: {str(e)}")
             return {}
+    
+    def _log_render_timings(self, total_time: float, max_workers: int) -> None:
+        """
+        输出每个图表的渲染耗时报告
+        
+        Args:
+            total_time: 总耗时（秒）
+            max_workers: 渲染进程数
+        """
+        lines = [f"图表渲染耗时（{max(max_workers, 1)}个进程，总计{total_time:.2f}秒）:"]
+        for name, elapsed in sorted(self.render_timings.items(), key=lambda x: x[1], reverse=True):
+            lines.append(f"  {name:<32} {elapsed:8.2f}s")
+        lines.append(f"  {'各图表耗时之和':<32} {sum(self.render_timings.values()):8.2f}s")
+        logger.info("\n".join(lines))
+
+# 渲染进程中的可视化器
+_worker_visualizer = None
+
+def _init_render_worker(settings: Dict[str, Any]) -> None:
+    """
+    渲染进程初始化函数：使用非交互式后端，并在每个进程中只创建一次可视化器
+    
+    Args:
+        settings: 父进程可视化器的设置（Visualizer._worker_settings的结果）
+    """
+    global _worker_visualizer
+    import matplotlib
+    matplotlib.use("Agg")
+    plt.switch_backend("Agg")
+    _worker_visualizer = Visualizer(settings["output_dir"], use_cache=settings["use_cache"],
+                                    persistent_export=settings["persistent_export"])
+    for name in ("color_palette", "figure_width", "figure_height", "dpi"):
+        setattr(_worker_visualizer, name, settings[name])
+    if _worker_visualizer.render_cache is not None:
+        _worker_visualizer.render_cache.max_size_bytes = settings["cache_max_size_bytes"]
+
+def _render_chart(visualizer: Optional[Visualizer], name: str, method: str,
+                  args: tuple, kwargs: Dict[str, Any]) -> Tuple[str, str, float]:
+    """
+    渲染单个图表并计时
+    
+    Args:
+        visualizer: 可视化器，为None时使用渲染进程中的可视化器
+        name: 图表名
+        method: Visualizer的方法名
+        args: 位置参数
+        kwargs: 关键字参数
+    
+    Returns:
+        Tuple[str, str, float]: (图表名, 文件路径, 耗时秒数)
+    """
+    visualizer = visualizer or _worker_visualizer
+    start_time = time.perf_counter()
+    path = getattr(visualizer, method)(*args, **kwargs)
+    return name, path, time.perf_counter() - start_time
 
 # 测试代码
 if __name__ == "__main__":
@@ -0,0 +1,296 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+分析模块测试
+
+LLM相关的测试使用本地假后端StubBackend，不需要网络或API密钥。
+"""
+
+import os
+import sys
+import time
+
+import pytest
+from tenacity import wait_none
+
+# 将项目根目录添加到系统路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.analyzer.llm_backends import (StubBackend, StubServer, HTTPBackend, LLMBackendError,
+                                       RateLimitError, parse_retry_after)
+from src.analyzer.llm_cache import LLMResultCache
+from src.analyzer.llm_extractor import GeminiExtractor
+from src.analyzer.freq_analyzer import FrequencyAnalyzer
+from src.analyzer.hybrid_analyzer import HybridAnalyzer
+from src.processor.excel_handler import ExcelHandler
+from src.utils.rate_limiter import TokenBucketRateLimiter
+
+class FailingBackend(StubBackend):
+    """
+    对包含指定标记的提示词始终返回错误的假后端
+    """
+
+    def __init__(self, marker: str, **kwargs):
+        super().__init__(**kwargs)
+        self.marker = marker
+
+    def generate(self, prompt: str) -> str:
+        if self.marker in prompt:
+            raise LLMBackendError("模拟的持续错误")
+        return super().generate(prompt)
+
+@pytest.fixture(autouse=True)
+def no_retry_wait(monkeypatch):
+    """
+    测试中重试不等待（服务端Retry-After除外）
+    """
+    monkeypatch.setattr(GeminiExtractor._call_gemini_api.retry.wait, "fallback", wait_none())
+
+class RateLimitOnceBackend(StubBackend):
+    """
+    每个提示词第一次调用时返回带retry_after的限流的假后端
+    """
+
+    def __init__(self, retry_after: float, **kwargs):
+        super().__init__(**kwargs)
+        self.retry_after = retry_after
+        self.seen_prompts = set()
+
+    def generate(self, prompt: str) -> str:
+        if prompt not in self.seen_prompts:
+            self.seen_prompts.add(prompt)
+            raise RateLimitError("模拟限流", retry_after=self.retry_after)
+        return super().generate(prompt)
+
+def make_jobs(n):
+    """
+    生成职位，每个职位的描述包含唯一的技能词
+    """
+    return [{"job_id": str(i), "job_description": f"We need skillterm{i:03d} for this role."} for i in range(n)]
+
+def make_extractor(backend, max_workers=1):
+    extractor = GeminiExtractor(api_key="fake", backend=backend, use_cache=False)
+    extractor.rate_limiter = TokenBucketRateLimiter()
+    extractor.max_workers = max_workers
+    return extractor
+
+def test_batch_analyze_jobs_preserves_order_with_concurrency():
+    jobs = make_jobs(20)
+    vocabulary = [f"skillterm{i:03d}" for i in range(20)]
+    # 随机延迟使并发请求乱序完成
+    backend = StubBackend(latency=0.001, jitter=0.02, vocabulary=vocabulary)
+    results = make_extractor(backend).batch_analyze_jobs(jobs, max_workers=8, batch_mode=False)
+
+    assert [job["job_id"] for job in results] == [str(i) for i in range(20)]
+    for i, job in enumerate(results):
+        assert job["skills"] == [f"skillterm{i:03d}"]
+
+def test_batch_analyze_jobs_isolates_job_errors():
+    jobs = make_jobs(6)
+    jobs[2]["job_description"] += " FAIL-MARKER"
+    vocabulary = [f"skillterm{i:03d}" for i in range(6)]
+    backend = FailingBackend("FAIL-MARKER", vocabulary=vocabulary)
+    results = make_extractor(backend).batch_analyze_jobs(jobs, max_workers=4, batch_mode=False)
+
+    assert results[2]["summary"] == "" and results[2]["skills"] == []
+    for i in (0, 1, 3, 4, 5):
+        assert results[i]["skills"] == [f"skillterm{i:03d}"]
+
+def test_batch_analyze_jobs_retries_rate_limited_calls():
+    jobs = make_jobs(10)
+    vocabulary = [f"skillterm{i:03d}" for i in range(10)]
+    backend = StubBackend(rate_limit_rate=0.3, seed=7, vocabulary=vocabulary)
+    results = make_extractor(backend).batch_analyze_jobs(jobs, max_workers=4, batch_mode=False)
+
+    assert backend.stats["rate_limited"] > 0
+    assert backend.stats["ok"] == sum(1 for job in results if job["skills"])
+
+def test_http_backend_honours_retry_after():
+    server = StubServer(backend=RateLimitOnceBackend(0.3, vocabulary=["skillterm000"])).start()
+    try:
+        extractor = make_extractor(HTTPBackend(server.url))
+        start = time.monotonic()
+        result = extractor.analyze_job(make_jobs(1)[0]["job_description"])
+        elapsed = time.monotonic() - start
+    finally:
+        server.stop()
+
+    assert result.skills == ["skillterm000"]
+    # 重试前按服务端Retry-After等待
+    assert elapsed >= 0.3
+
+def test_parse_retry_after_accepts_seconds_and_http_dates():
+    from datetime import datetime, timedelta, timezone
+    from email.utils import format_datetime
+
+    assert parse_retry_after("2") == 2.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    assert 25 < parse_retry_after(format_datetime(retry_at, usegmt=True)) <= 30
+    # 已经过去的时间不需要等待
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+def test_llm_cache_rerun_makes_no_calls(tmp_path):
+    vocabulary = [f"skillterm{i:03d}" for i in range(5)]
+    backend = StubBackend(vocabulary=vocabulary)
+    extractor = make_extractor(backend)
+    extractor.cache = LLMResultCache(cache_path=str(tmp_path / "cache.sqlite"))
+
+    extractor.batch_analyze_jobs(make_jobs(5), batch_mode=False)
+    assert backend.stats["calls"] == 5
+    results = extractor.batch_analyze_jobs(make_jobs(5), batch_mode=False)
+    assert backend.stats["calls"] == 5
+    assert [job["skills"] for job in results] == [[term] for term in vocabulary]
+
+def test_llm_cache_shared_between_batch_and_single_prompts(tmp_path):
+    vocabulary = [f"skillterm{i:03d}" for i in range(6)]
+    backend = StubBackend(vocabulary=vocabulary)
+    extractor = make_extractor(backend)
+    extractor.cache = LLMResultCache(cache_path=str(tmp_path / "cache.sqlite"))
+
+    extractor.batch_analyze_jobs(make_jobs(6), batch_mode=True)
+    calls = backend.stats["calls"]
+    assert calls < 6
+    results = extractor.batch_analyze_jobs(make_jobs(6), batch_mode=False)
+    assert backend.stats["calls"] == calls
+    assert [job["skills"] for job in results] == [[term] for term in vocabulary]
+
+def test_llm_cache_invalidated_by_prompt_version(tmp_path):
+    vocabulary = [f"skillterm{i:03d}" for i in range(3)]
+    backend = StubBackend(vocabulary=vocabulary)
+    extractor = make_extractor(backend)
+    extractor.cache = LLMResultCache(cache_path=str(tmp_path / "cache.sqlite"))
+
+    extractor.batch_analyze_jobs(make_jobs(3), batch_mode=False)
+    # 模拟修改提示词模板
+    extractor.prompt_version = "edited"
+    extractor.batch_analyze_jobs(make_jobs(3), batch_mode=False)
+    assert backend.stats["calls"] == 6
+
+def test_llm_cache_keeps_valid_empty_results(tmp_path):
+    # 没有词表项出现在描述中，响应的技能列表为空，但仍是有效回答
+    backend = StubBackend(vocabulary=["nomatch"])
+    extractor = make_extractor(backend)
+    extractor.cache = LLMResultCache(cache_path=str(tmp_path / "cache.sqlite"))
+
+    extractor.batch_analyze_jobs(make_jobs(3), batch_mode=False)
+    extractor.batch_analyze_jobs(make_jobs(3), batch_mode=False)
+    assert backend.stats["calls"] == 3
+
+def test_llm_cache_skips_failed_calls(tmp_path):
+    vocabulary = [f"skillterm{i:03d}" for i in range(3)]
+    backend = FailingBackend("skillterm001", vocabulary=vocabulary)
+    extractor = make_extractor(backend)
+    extractor.cache = LLMResultCache(cache_path=str(tmp_path / "cache.sqlite"))
+
+    extractor.batch_analyze_jobs(make_jobs(3), batch_mode=False)
+    assert extractor.cache.stats()["entries"] == 2
+
+    # 只有失败的职位未命中缓存，重新调用API
+    jobs = extractor.batch_analyze_jobs(make_jobs(3), batch_mode=False)
+    assert (extractor.cache.hits, backend.stats["calls"]) == (2, 2)
+    assert jobs[1]["skills"] == [] and jobs[0]["skills"] == ["skillterm000"]
+
+def test_rate_limiter_without_limits_does_not_wait():
+    limiter = TokenBucketRateLimiter()
+    assert all(limiter.acquire(1000) == 0 for _ in range(100))
+
+def test_rate_limiter_request_bucket_allows_burst_then_waits():
+    # 每分钟120个请求：容量120，每秒补充2个
+    limiter = TokenBucketRateLimiter(requests_per_minute=120)
+    assert sum(limiter.acquire() for _ in range(120)) == 0
+
+    start = time.monotonic()
+    waited = limiter.acquire()
+    assert 0.3 < waited < 0.8
+    assert time.monotonic() - start >= waited - 0.05
+
+def test_rate_limiter_token_bucket_waits_for_refill():
+    # 每分钟6000个token：每秒补充100个
+    limiter = TokenBucketRateLimiter(tokens_per_minute=6000)
+    assert limiter.acquire(6000) == 0
+    waited = limiter.acquire(50)
+    assert 0.3 < waited < 0.8
+
+def test_hybrid_ranks_stable_across_scoring_methods():
+    terms = ["python", "sql", "docker", "kubernetes", "airflow", "spark"]
+    # 排序相同但量纲不同的传统分数：tfidf约为0-18，bm25约为0-350，log_odds可以为负
+    base = [1.0, 0.8, 0.55, 0.4, 0.2, 0.0]
+    scales = {
+        "count": lambda x: 40 + 360 * x,
+        "tfidf": lambda x: 18 * x,
+        "bm25": lambda x: 5 + 345 * x,
+        "log_odds": lambda x: -2.5 + 7.5 * x,
+    }
+    llm_keywords = [
+        {"keyword": "docker", "frequency": 400, "score": 400.0},
+        {"keyword": "aws", "frequency": 380, "score": 380.0},
+        {"keyword": "python", "frequency": 150, "score": 150.0},
+        {"keyword": "git", "frequency": 20, "score": 20.0},
+    ]
+
+    analyzer = HybridAnalyzer()
+    rankings = {}
+    for method, scale in scales.items():
+        traditional_keywords = [
+            {"keyword": term, "frequency": 10, "score": scale(x)} for term, x in zip(terms, base)
+        ]
+        result = analyzer.combine_keywords(traditional_keywords, llm_keywords,
+                                           llm_weight=1.5, traditional_weight=1.0, top_n=20)
+        rankings[method] = [item["keyword"] for item in result]
+        assert all(0 <= item["score"] <= 2.5 for item in result)
+
+    assert len({tuple(ranking) for ranking in rankings.values()}) == 1
+    ranking = rankings["count"]
+    # 两个来源都有的关键词排在前面，LLM的大计数不会压过传统方法的高分词
+    assert ranking[:2] == ["docker", "python"]
+    assert ranking.index("sql") < ranking.index("git")
+
+def test_hybrid_analyze_jobs_builds_segment_tables(tmp_path):
+    jobs = [
+        {"job_id": "1", "search_keyword": "python", "company": "Acme",
+         "job_description": "Python and Django services. Python tests.", "skills": ["Python", "CI/CD"], "summary": "后端"},
+        {"job_id": "2", "search_keyword": "python", "company": "Globex",
+         "job_description": "Python with Flask.", "skills": ["Python", "Flask"], "summary": "后端"},
+        {"job_id": "3", "search_keyword": "data", "company": "Acme",
+         "job_description": "Spark pipelines.", "skills": ["Spark", "CI/CD"]},
+        {"job_id": "4", "search_keyword": "data", "company": "Acme", "job_description": ""},
+    ]
+    freq_analyzer = FrequencyAnalyzer()
+    traditional_keywords = freq_analyzer.analyze_jobs(jobs, top_n=20)
+
+    # 分组统计复用频率分析的计数矩阵，不再分词
+    tokenized = []
+    analyze_corpus = freq_analyzer.tokenizer.analyze_corpus
+
+    def counting_analyze_corpus(docs, **kwargs):
+        tokenized.append(docs)
+        return analyze_corpus(docs, **kwargs)
+
+    freq_analyzer.tokenizer.analyze_corpus = counting_analyze_corpus
+    result = HybridAnalyzer(freq_analyzer).analyze_jobs(jobs, traditional_keywords, top_n=20,
+                                                        segment_fields=["search_keyword", "company"])
+    assert tokenized == []
+    # 与重新分词的结果一致
+    rebuilt = HybridAnalyzer().analyze_jobs(jobs, traditional_keywords, top_n=20,
+                                            segment_fields=["search_keyword", "company"])
+    assert rebuilt["segment_keywords"] == result["segment_keywords"]
+
+    assert result["metadata"]["analyzed_jobs"] == 3
+    table = result["segment_keywords"]["search_keyword"]
+    assert table["segments"] == ["python", "data"] and table["job_counts"] == [2, 1]
+    row = dict(zip(table["keywords"], table["counts"][0]))
+    # 描述中的出现次数按分词统计，只在LLM技能中出现的关键词至少计为1次
+    assert row["python"] == 3
+    assert row["ci/cd"] == 1
+    assert dict(zip(table["keywords"], table["job_share"][1]))["ci/cd"] == 1.0
+
+    file_path = str(tmp_path / "keywords.xlsx")
+    assert ExcelHandler().save_keywords_to_excel(result, file_path)
+    loaded = ExcelHandler().load_keywords_from_excel(file_path)
+    assert set(loaded["segment_keywords"]) == {"search_keyword", "company"}
+    assert loaded["segment_keywords"]["company"]["segments"] == ["Acme", "Globex"]
@@ -0,0 +1,302 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+爬虫模块测试
+
+检查点测试不需要浏览器；爬虫断点续爬测试用本地HTTP服务提供保存的HTML页面，
+并用只实现所需接口的假WebDriver代替Chrome（需要安装selenium等爬虫依赖）。
+"""
+
+import os
+import sys
+import json
+import threading
+import urllib.request
+from functools import partial
+from http.server import HTTPServer, SimpleHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+
+# 将项目根目录添加到系统路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.crawler.checkpoint import CrawlCheckpoint
+from src.crawler.seen_jobs import SeenJobsIndex
+from src.crawler.page_parser import parse_job_listings, parse_job_details, extract_job_id
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures")
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), "r", encoding="utf-8") as f:
+        return f.read()
+
+def make_job(job_id, **extra):
+    job = {"job_id": job_id, "job_title": "Engineer", "company": "Acme", "job_link": f"/jobs/view/{job_id}/"}
+    job.update(extra)
+    return job
+
+def test_checkpoint_resume_restores_recorded_pages(tmp_path):
+    checkpoint = CrawlCheckpoint(run_id="run1", checkpoint_dir=str(tmp_path))
+    checkpoint.record_listing_page("python", "Berlin", 1, [make_job("1"), make_job("2")])
+    checkpoint.record_job_detail(make_job("1", job_description="描述"))
+
+    resumed = CrawlCheckpoint(run_id="run1", checkpoint_dir=str(tmp_path), resume=True)
+
+    assert [job["job_id"] for job in resumed.get_listing_page("python", "Berlin", 1)] == ["1", "2"]
+    assert resumed.get_job_detail("1")["job_description"] == "描述"
+    # 未完成的列表页和详情页需要重新抓取
+    assert resumed.get_listing_page("python", "Berlin", 2) is None
+    assert resumed.get_listing_page("python", "Munich", 1) is None
+    assert resumed.get_job_detail("2") is None
+
+def test_checkpoint_resume_appends_to_existing_journal(tmp_path):
+    CrawlCheckpoint(run_id="run1", checkpoint_dir=str(tmp_path)).record_listing_page("python", "Berlin", 1, [])
+    resumed = CrawlCheckpoint(run_id="run1", checkpoint_dir=str(tmp_path), resume=True)
+    resumed.record_listing_page("python", "Berlin", 2, [make_job("3")])
+
+    again = CrawlCheckpoint(run_id="run1", checkpoint_dir=str(tmp_path), resume=True)
+    # 空列表页也算已完成
+    assert again.get_listing_page("python", "Berlin", 1) == []
+    assert again.get_listing_page("python", "Berlin", 2) == [make_job("3")]
+
+def test_checkpoint_resume_requires_existing_journal(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        CrawlCheckpoint(run_id="missing", checkpoint_dir=str(tmp_path), resume=True)
+
+def test_checkpoint_new_run_refuses_existing_journal(tmp_path):
+    CrawlCheckpoint(run_id="run1", checkpoint_dir=str(tmp_path)).record_job_detail(make_job("1"))
+    with pytest.raises(FileExistsError):
+        CrawlCheckpoint(run_id="run1", checkpoint_dir=str(tmp_path))
+
+def test_checkpoint_skips_truncated_last_line(tmp_path):
+    checkpoint = CrawlCheckpoint(run_id="run1", checkpoint_dir=str(tmp_path))
+    checkpoint.record_job_detail(make_job("1"))
+    # 模拟写入第二条记录时崩溃
+    with open(checkpoint.journal_path, "a", encoding="utf-8") as f:
+        f.write(json.dumps({"type": "job_detail", "job": make_job("2")})[:20])
+
+    resumed = CrawlCheckpoint(run_id="run1", checkpoint_dir=str(tmp_path), resume=True)
+    assert resumed.get_job_detail("1") == make_job("1")
+    assert resumed.get_job_detail("2") is None
+
+def test_seen_jobs_index_detects_changed_postings(tmp_path):
+    index = SeenJobsIndex(index_path=str(tmp_path / "seen.sqlite"))
+    assert index.record(make_job("1", job_description="旧描述")) is False
+
+    assert index.get_fresh("1", listing=make_job("1"))["job_description"] == "旧描述"
+    # 列表页标题变化时重新抓取
+    assert index.get_fresh("1", listing=make_job("1", job_title="Senior Engineer")) is None
+
+    assert index.record(make_job("1", job_description="旧描述")) is False
+    assert index.record(make_job("1", job_description="新描述")) is True
+    assert index.get_fresh("1")["job_description"] == "新描述"
+    assert (index.hits, index.misses) == (2, 1)
+
+def test_seen_jobs_index_expires_entries(tmp_path):
+    index = SeenJobsIndex(index_path=str(tmp_path / "seen.sqlite"), ttl_days=1)
+    index.record(make_job("1"))
+    assert index.get_fresh("1") is not None
+
+    # 模拟两天前抓取
+    index._conn.execute("UPDATE seen_jobs SET crawled_at = crawled_at - 2 * 86400")
+    assert index.get_fresh("1") is None
+    assert index.get_fresh("2") is None
+
+def test_parse_job_listings_from_saved_page():
+    jobs = parse_job_listings(read_fixture("listing_page.html"), "python", "Berlin")
+
+    # 缺少公司名称的第三个列表项被跳过
+    assert [job["job_id"] for job in jobs] == ["3900000001", "3900000002"]
+    first = jobs[0]
+    assert first["job_title"] == "Senior Python Developer"
+    assert first["company"] == "Acme Corp"
+    assert first["location"] == "Berlin, Germany"
+    assert first["job_link"] == "https://www.linkedin.com/jobs/view/3900000001/?refId=abc"
+    assert first["search_keyword"] == "python" and first["search_location"] == "Berlin"
+    assert first["crawl_time"]
+
+def test_parse_job_listings_without_results_list():
+    assert parse_job_listings(read_fixture("detail_page.html"), "python", "Berlin") == []
+
+def test_parse_job_details_from_saved_page():
+    details = parse_job_details(read_fixture("detail_page.html"))
+
+    # 块级元素换行，行内空白合并
+    assert details["job_description"] == (
+        "About the job\n"
+        "We are looking for a Senior Python Developer to join our team.\n"
+        "5+ years of Python\n"
+        "Experience with Django and PostgreSQL\n"
+        "Nice to have: Docker,\n"
+        "Kubernetes"
+    )
+    assert details["job_type"] == "Full-time"
+    assert details["seniority_level"] == "Mid-Senior level"
+    assert details["employment_type"] == "Full-time"
+    # 没有取值的条目不输出
+    assert "industries" not in details
+
+def test_parse_job_details_without_description():
+    assert parse_job_details(read_fixture("listing_page.html")) is None
+
+def test_extract_job_id():
+    assert extract_job_id("https://www.linkedin.com/jobs/view/3900000001/?refId=abc") == "3900000001"
+    assert extract_job_id("https://www.linkedin.com/jobs/search/?currentJobId=42&keywords=x") == "42"
+    assert extract_job_id("https://example.com/").startswith("unknown_")
+
+class FixtureServer:
+    """
+    在后台线程中提供fixtures目录下HTML页面的本地HTTP服务
+
+    /jobs/search/?start=0 返回列表页第1页，start=25 返回第2页，/jobs/view/<id>/ 返回详情页。
+    """
+
+    ROUTES = {"listing_0": "listing_page.html", "listing_25": "listing_page_2.html", "detail": "detail_page.html"}
+
+    def __init__(self):
+        self.requests = []
+        server = self
+
+        class Handler(SimpleHTTPRequestHandler):
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                server.requests.append(self.path)
+                if parsed.path.startswith("/jobs/view/"):
+                    self.path = "/" + server.ROUTES["detail"]
+                elif parsed.path.startswith("/jobs/search/"):
+                    start = parse_qs(parsed.query).get("start", ["0"])[0]
+                    self.path = "/" + server.ROUTES.get(f"listing_{start}", "missing.html")
+                super().do_GET()
+
+            def log_message(self, format, *args):
+                pass
+
+        self.httpd = HTTPServer(("127.0.0.1", 0), partial(Handler, directory=FIXTURES_DIR))
+        self.url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+class FixtureDriver:
+    """
+    假WebDriver：把URL的路径和查询转发到本地服务，按class查找元素
+
+    fail_on_get为第几次get调用时抛出WebDriverException，用于模拟爬取中途失败。
+    """
+
+    def __init__(self, server_url, fail_on_get=None):
+        from selenium.common.exceptions import WebDriverException
+        self.server_url = server_url
+        self.fail_on_get = fail_on_get
+        self.gets = 0
+        self.page_source = ""
+        self._error = WebDriverException
+
+    def get(self, url):
+        self.gets += 1
+        if self.fail_on_get is not None and self.gets >= self.fail_on_get:
+            raise self._error("模拟的浏览器崩溃")
+        parsed = urlparse(url)
+        with urllib.request.urlopen(f"{self.server_url}{parsed.path}?{parsed.query}") as response:
+            self.page_source = response.read().decode("utf-8")
+
+    def find_element(self, by, value):
+        from lxml import html as lxml_html
+        from selenium.common.exceptions import NoSuchElementException
+        from src.crawler.page_parser import _class_xpath, _element_text
+
+        matches = lxml_html.fromstring(self.page_source).xpath(f"//*[{_class_xpath(value.lstrip('.'))}]")
+        if not matches:
+            raise NoSuchElementException(value)
+        element = type("FixtureElement", (), {})()
+        element.text = _element_text(matches[0])
+        return element
+
+    def find_elements(self, by, value):
+        return []
+
+    def execute_script(self, script, *args):
+        return None
+
+def make_crawler(tmp_path, server, resume=False, fail_on_get=None, run_id="fixture_run", **crawler_config):
+    crawler_module = pytest.importorskip("src.crawler.linkedin_crawler")
+    from selenium.webdriver.support.ui import WebDriverWait
+
+    config = {
+        "search": {"base_url": f"{server.url}/jobs/search/"},
+        "crawler": {"checkpoint_dir": str(tmp_path), "use_seen_jobs_index": False, "save_screenshots": False},
+    }
+    config["crawler"].update(crawler_config)
+    crawler = crawler_module.LinkedInCrawler(config, run_id=run_id, resume=resume)
+    crawler.driver = FixtureDriver(server.url, fail_on_get=fail_on_get)
+    crawler.wait = WebDriverWait(crawler.driver, 1)
+    crawler.random_delay = lambda *args, **kwargs: None
+    crawler.scroll_page = lambda *args, **kwargs: None
+    return crawler
+
+def test_crawler_resume_skips_checkpointed_pages(tmp_path):
+    with FixtureServer() as server:
+        # 第一次运行：第1页完成后浏览器在第2页崩溃，只抓取了第一个职位的详情
+        crawler = make_crawler(tmp_path, server, fail_on_get=2)
+        listings = crawler.scrape_job_listings("python", "Berlin", pages=2)
+        assert [job["job_id"] for job in listings] == ["3900000001", "3900000002"]
+        crawler.driver.fail_on_get = None
+        crawler.scrape_job_details(listings[:1])
+        assert len(server.requests) == 2
+
+        # 恢复运行：只请求第2页列表和未完成的详情页
+        server.requests.clear()
+        resumed = make_crawler(tmp_path, server, resume=True)
+        listings = resumed.scrape_job_listings("python", "Berlin", pages=2)
+        assert [job["job_id"] for job in listings] == ["3900000001", "3900000002", "3900000003"]
+        assert len(server.requests) == 1
+        assert "start=25" in server.requests[0]
+
+        detailed = resumed.scrape_job_details(listings)
+        assert [request.split("?")[0] for request in server.requests[1:]] == [
+            "/jobs/view/3900000002/", "/jobs/view/3900000003/"
+        ]
+        assert all(job["job_description"].startswith("About the job") for job in detailed)
+
+        # 全部完成后再次恢复不发起任何请求，跳过的页面同样报告进度
+        server.requests.clear()
+        finished = make_crawler(tmp_path, server, resume=True)
+        reports = []
+        finished.progress = lambda kind, done, total: reports.append((kind, done, total))
+        finished.pages_total["listing"] = 2
+        finished.scrape_job_details(finished.scrape_job_listings("python", "Berlin", pages=2))
+        assert server.requests == []
+        assert reports == [("listing", 1, 2), ("listing", 2, 2),
+                           ("detail", 1, 3), ("detail", 2, 3), ("detail", 3, 3)]
+
+@pytest.mark.parametrize("archive_first_run", [True, False])
+def test_replay_includes_jobs_restored_from_seen_index(tmp_path, archive_first_run):
+    from src.crawler.page_archive import replay_archive
+
+    archive_dir = str(tmp_path / "archive")
+    options = {"use_seen_jobs_index": True, "seen_jobs_index_path": str(tmp_path / "seen.sqlite"),
+               "archive_dir": archive_dir}
+    with FixtureServer() as server:
+        first = make_crawler(tmp_path, server, run_id="run1", archive_pages=archive_first_run, **options)
+        first.scrape_job_details(first.scrape_job_listings("python", "Berlin", pages=1))
+
+        # 第二次运行的详情全部从索引恢复，不访问详情页
+        server.requests.clear()
+        second = make_crawler(tmp_path, server, run_id="run2", archive_pages=True, **options)
+        second.scrape_job_details(second.scrape_job_listings("python", "Berlin", pages=1))
+        assert not any(request.startswith("/jobs/view/") for request in server.requests)
+
+    jobs = replay_archive(archive_dir, ["run2"])
+    assert [job["job_id"] for job in jobs] == ["3900000001", "3900000002"]
+    assert all(job["job_description"].startswith("About the job") for job in jobs)
+    assert all(job["seniority_level"] == "Mid-Senior level" for job in jobs)
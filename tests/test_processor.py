@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+数据处理模块测试
+"""
+
+import os
+import sys
+
+import pytest
+
+# 将项目根目录添加到系统路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.processor.excel_handler import ExcelHandler
+from src.processor.storage import ParquetStorage, JsonlStorage
+
+def make_job(job_id, title="Engineer"):
+    return {"job_id": job_id, "job_title": title, "company": "Acme", "job_description": f"{title} {job_id}"}
+
+def test_append_then_save_then_append_keeps_saved_rows(tmp_path):
+    file_path = str(tmp_path / "jobs.xlsx")
+
+    ExcelHandler().append_to_excel([make_job("1", "Old"), make_job("2")], file_path)
+    # 覆盖保存：job 1内容更新，新增job 9，job 2被移除
+    assert ExcelHandler().save_to_excel([make_job("1", "New"), make_job("9")], file_path)
+    assert not os.path.exists(f"{file_path}.jsonl")
+    assert not os.path.exists(f"{file_path}.ids")
+
+    # 新的处理器继续追加
+    assert ExcelHandler().append_to_excel([make_job("3")], file_path)
+    data = ExcelHandler().load_from_excel(file_path)
+
+    assert sorted(str(row["job_id"]) for row in data) == ["1", "3", "9"]
+    assert {str(row["job_id"]): row["job_title"] for row in data}["1"] == "New"
+
+def test_append_dedupes_ids_read_from_excel_as_numbers(tmp_path):
+    file_path = str(tmp_path / "jobs.xlsx")
+    # Excel中的数字job_id读回为整数
+    ExcelHandler().save_to_excel([make_job(101), make_job(102)], file_path)
+
+    handler = ExcelHandler()
+    assert handler.append_to_excel([make_job("101"), make_job(102.0), make_job("103")], file_path)
+    data = handler.load_from_excel(file_path)
+
+    assert sorted(row["job_id"] for row in data) == ["101", "102", "103"]
+
+def test_append_updated_posting_replaces_old_row(tmp_path):
+    file_path = str(tmp_path / "jobs.xlsx")
+    handler = ExcelHandler()
+    handler.save_to_excel([make_job("1", "Old"), make_job("2")], file_path)
+
+    assert handler.append_to_excel([make_job("1", "New"), make_job("3")], file_path)
+    # 内容未变化的职位不重复写入伴随存储
+    assert handler.append_to_excel([make_job("3")], file_path)
+    with open(f"{file_path}.jsonl", "r", encoding="utf-8") as f:
+        assert len(f.readlines()) == 4
+
+    data = ExcelHandler().load_from_excel(file_path)
+    assert [row["job_id"] for row in data] == ["2", "1", "3"]
+    assert data[1]["job_title"] == "New"
+
+    assert handler.export_excel(file_path)
+    data = ExcelHandler().load_from_excel(file_path)
+    assert {str(row["job_id"]): row["job_title"] for row in data} == {"1": "New", "2": "Engineer", "3": "Engineer"}
+
+def test_export_keeps_appended_rows(tmp_path):
+    file_path = str(tmp_path / "jobs.xlsx")
+    handler = ExcelHandler()
+    handler.save_to_excel([make_job("1")], file_path)
+    handler.append_to_excel([make_job("2")], file_path, export=True)
+
+    data = ExcelHandler().load_from_excel(file_path)
+    assert sorted(str(row["job_id"]) for row in data) == ["1", "2"]
+
+def test_parquet_save_coerces_mixed_object_columns(tmp_path):
+    pytest.importorskip("pyarrow")
+    file_path = str(tmp_path / "jobs.parquet")
+    data = [
+        {"job_id": 1, "skills": ["python", "sql"]},
+        {"job_id": "2", "skills": "docker"},
+        {"job_id": None, "skills": None},
+    ]
+    assert ParquetStorage().save(data, file_path)
+    assert ParquetStorage().load(file_path) == [
+        {"job_id": "1", "skills": ["python", "sql"]},
+        {"job_id": "2", "skills": ["docker"]},
+        {"job_id": None, "skills": None},
+    ]
+
+def test_parquet_save_parses_list_strings_from_excel(tmp_path):
+    pytest.importorskip("pyarrow")
+    excel_path = str(tmp_path / "jobs.xlsx")
+    file_path = str(tmp_path / "jobs.parquet")
+    data = [
+        {"job_id": "1", "skills": ["Python", "SQL"], "job_description": "[remote] Python"},
+        {"job_id": "2", "skills": [], "job_description": "SQL"},
+        {"job_id": "3", "skills": None, "job_description": "Docker"},
+    ]
+    assert ExcelHandler().save_to_excel(data, excel_path)
+    loaded = ExcelHandler().load_from_excel(excel_path)
+    # Excel中的列表读回后是字符串
+    assert loaded[0]["skills"] == "['Python', 'SQL']"
+
+    assert ParquetStorage().save(loaded, file_path)
+    rows = ParquetStorage().load(file_path)
+    assert [row["skills"] for row in rows] == [["Python", "SQL"], [], None]
+    # 不能整列解析为列表的字符串列保持原样
+    assert rows[0]["job_description"] == "[remote] Python"
+
+def test_jsonl_append_keeps_existing_rows(tmp_path):
+    file_path = str(tmp_path / "jobs.jsonl")
+    storage = JsonlStorage()
+    assert storage.save([make_job("1")], file_path)
+    assert storage.append([make_job("2")], file_path)
+    assert [row["job_id"] for row in storage.load(file_path)] == ["1", "2"]
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+可视化模块测试
+"""
+
+import os
+import sys
+
+# 将项目根目录添加到系统路径
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from src.visualizer.render_cache import RenderCache
+from src.visualizer import visualizer as visualizer_module
+from src.visualizer.visualizer import Visualizer
+
+KEYWORDS = [
+    {"keyword": "python", "frequency": 15, "score": 22.5},
+    {"keyword": "sql", "frequency": 10, "score": 15.0},
+    {"keyword": "docker", "frequency": 6, "score": 9.0},
+]
+
+def test_render_cache_hit_writes_requested_filename(tmp_path):
+    visualizer = Visualizer(str(tmp_path), use_cache=True)
+
+    first = visualizer.generate_wordcloud(KEYWORDS, filename="run1_wordcloud")
+    second = visualizer.generate_wordcloud(KEYWORDS, filename="run2_wordcloud")
+
+    assert visualizer.render_cache.hits == 1
+    assert first == str(tmp_path / "run1_wordcloud.png")
+    assert second == str(tmp_path / "run2_wordcloud.png")
+    with open(first, "rb") as f1, open(second, "rb") as f2:
+        assert f1.read() == f2.read()
+
+    # 删除前一次运行的输出不影响之后的命中
+    os.remove(first)
+    third = visualizer.generate_wordcloud(KEYWORDS, filename="run3_wordcloud")
+    assert visualizer.render_cache.hits == 2
+    assert os.path.exists(third)
+
+def test_render_cache_eviction_keeps_output_files(tmp_path):
+    visualizer = Visualizer(str(tmp_path), use_cache=True)
+    # 容量只够保存一个图表副本
+    visualizer.render_cache.max_size_bytes = 1
+
+    outputs = [
+        visualizer.generate_wordcloud(KEYWORDS[:n], filename=f"wordcloud_{n}") for n in (1, 2, 3)
+    ]
+
+    assert all(os.path.exists(path) for path in outputs)
+    assert visualizer.render_cache.stats()["entries"] <= 1
+    cached_files = [name for name in os.listdir(visualizer.render_cache.cache_dir) if name.endswith(".png")]
+    assert len(cached_files) <= 1
+
+def test_render_cache_drops_modified_copies(tmp_path):
+    cache = RenderCache(str(tmp_path))
+    output_path = tmp_path / "chart.png"
+    output_path.write_bytes(b"png")
+    cache.set("key", str(output_path))
+
+    with open(os.path.join(cache.cache_dir, "key.png"), "ab") as f:
+        f.write(b"changed")
+
+    assert cache.get("key", "other") is None
+    assert not (tmp_path / "other.png").exists()
+    assert output_path.read_bytes() == b"png"
+    assert cache.stats()["entries"] == 0
+
+def test_render_worker_inherits_parent_settings(tmp_path):
+    parent = Visualizer(str(tmp_path), use_cache=False, persistent_export=False)
+    parent.dpi = 72
+
+    visualizer_module._init_render_worker(parent._worker_settings())
+    worker = visualizer_module._worker_visualizer
+
+    assert worker.output_dir == parent.output_dir
+    assert worker.render_cache is None
+    assert worker.persistent_export is False and worker.exporter.persistent is False
+    assert worker._render_settings() == parent._render_settings()
+
+def test_parallel_render_respects_disabled_cache(tmp_path):
+    visualizer = Visualizer(str(tmp_path), use_cache=False)
+    keyword_data = {"traditional_keywords": KEYWORDS, "llm_keywords": KEYWORDS, "hybrid_keywords": KEYWORDS}
+
+    result = visualizer.generate_all_visualizations([], keyword_data, "run", max_workers=2,
+                                                    chart_types=["wordcloud", "bar_chart"], use_plotly=False)
+
+    assert result and all(os.path.exists(path) for path in result.values())
+    assert not os.path.exists(tmp_path / ".render_cache")